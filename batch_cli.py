@@ -0,0 +1,202 @@
+# batch_cli.py
+"""
+Chế độ chạy hàng loạt không cần giao diện (không import tkinter).
+
+    python main.py batch <thư mục | glob | file>... -o out.xlsx
+
+Mỗi file in ra một dòng JSON {"event": "file", ...} trên stdout, cuối cùng là
+một dòng {"event": "summary", ...}. Mã thoát:
+    0  thành công
+    1  lỗi khi ghi Excel
+    2  tham số sai hoặc không tìm thấy file đầu vào
+    3  đã xuất Excel nhưng có file đầu vào bị lỗi
+    4  mọi file đầu vào đều lỗi, không xuất gì
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+EXIT_OK = 0
+EXIT_EXPORT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_PARTIAL = 3
+EXIT_ALL_FAILED = 4
+
+SUPPORTED_EXTENSIONS = ('.txt', '.docx', '.pdf')
+
+def _is_app_output(path):
+    """
+    File do chính ứng dụng ghi ra (log, summary, báo cáo metrics) không phải đầu vào.
+    File của ExtractionCache (.qec) và fingerprint store đã bị loại theo phần mở rộng.
+    """
+    from core.logger import DEFAULT_LOG_FILE
+    from core.metrics import METRICS_FILE_PREFIX
+    from excel_handler import SUMMARY_FILE
+
+    name = os.path.basename(path)
+    return name in (DEFAULT_LOG_FILE, SUMMARY_FILE) or name.startswith(METRICS_FILE_PREFIX)
+
+def resolve_inputs(patterns):
+    """
+    Danh sách file đầu vào (đã sắp xếp, không trùng) từ thư mục, glob hoặc đường dẫn file.
+    Bỏ qua các file do ứng dụng ghi ra (vd. export_log.txt trong thư mục hiện tại).
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [os.path.join(pattern, name) for name in sorted(os.listdir(pattern))]
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+        paths.extend(path for path in matches
+                     if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS)
+                     and not _is_app_output(path))
+    return list(dict.fromkeys(paths))
+
+def extract_file(path, cache_dir=None):
+    """
+    Worker: trích xuất câu hỏi từ một file, trả về (QuestionBatch, lỗi, số giây, dùng cache không).
+    cache_dir: thư mục ExtractionCache; file có nội dung đã trích xuất trước đó không cần trích xuất lại.
+    """
+    from text_processor import EXTRACTOR_VERSION, TextProcessor
+    from document_reader import iter_docx_text, read_pdf_text
+    from core.question import QuestionBatch
+
+    started = time.perf_counter()
+    try:
+        cache = key = None
+        if cache_dir:
+            from core.extraction_cache import ExtractionCache
+            cache = ExtractionCache(cache_dir, version=EXTRACTOR_VERSION)
+            key = cache.key_for_file(path)
+            questions = cache.get(key)
+            if questions is not None:
+                return questions, None, time.perf_counter() - started, True
+
+        processor = TextProcessor()
+        lowered = path.lower()
+        if lowered.endswith('.pdf'):
+            questions = processor.extract_batch(read_pdf_text(path, workers=1))
+        elif lowered.endswith('.docx'):
+            questions = QuestionBatch.from_questions(processor.iter_questions(iter_docx_text(path)))
+        else:
+            questions = QuestionBatch.from_questions(processor.iter_questions(path))
+        if cache is not None:
+            cache.put(key, questions)
+        return questions, None, time.perf_counter() - started, False
+    except Exception as e:
+        return QuestionBatch(), f"{type(e).__name__}: {e}", time.perf_counter() - started, False
+
+def emit(event, **fields):
+    print(json.dumps(dict(event=event, **fields), ensure_ascii=False), flush=True)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py batch", description="Trích xuất câu hỏi hàng loạt")
+    parser.add_argument('inputs', nargs='+', help="Thư mục, glob hoặc file (.txt, .docx, .pdf)")
+    parser.add_argument('-o', '--output', required=True, help="File Excel đích")
+    parser.add_argument('--policy', choices=['skip', 'append', 'allow'], default='allow',
+                        help="Chính sách xử lý trùng lặp")
+    parser.add_argument('--workers', type=int, default=None, help="Số process trích xuất song song")
+    parser.add_argument('--no-store', action='store_true',
+                        help="Không dùng fingerprint store cạnh file Excel")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Luôn trích xuất lại, không dùng cache kết quả trích xuất")
+    parser.add_argument('--metrics', action='store_true',
+                        help="Ghi báo cáo thời gian từng giai đoạn (JSON) cạnh file Excel")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_USAGE if e.code else EXIT_OK
+
+    paths = resolve_inputs(args.inputs)
+    if not paths:
+        emit('summary', status='error', error="Không tìm thấy file đầu vào", files=0)
+        return EXIT_USAGE
+
+    from core.deduplicator import Deduplicator
+    from core.extraction_cache import ExtractionCache
+    from core.fingerprint_store import FingerprintStore
+    from core.logger import Logger
+    from core.metrics import Metrics
+    from core.question import QuestionBatch
+    from excel_handler import ExcelHandler
+    from text_processor import EXTRACTOR_VERSION
+
+    metrics = Metrics(enabled=True) if args.metrics else Metrics.from_env()
+    logger = Logger.shared()
+    store = None if args.no_store else FingerprintStore.for_workbook(args.output)
+    deduplicator = Deduplicator(policy=args.policy, logger=logger, store=store)
+    with metrics.stage('bootstrap'):
+        deduplicator.bootstrap_from_workbook(args.output)
+    cache = None if args.no_cache else ExtractionCache.from_env(EXTRACTOR_VERSION)
+
+    started = time.perf_counter()
+    processed_questions = QuestionBatch()
+    totals = {'files': len(paths), 'failed': 0, 'extracted': 0, 'written': 0, 'skipped': 0}
+
+    workers = min(args.workers or os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        extract = partial(extract_file, cache_dir=cache.directory if cache else None)
+        for path, (questions, error, seconds, cached) in zip(paths, executor.map(extract, paths)):
+            with metrics.stage('dedup'):
+                kept = deduplicator.add_batch(questions)
+            processed_questions.extend(kept)
+            written = len(kept)
+            skipped = len(questions) - written
+            # Trích xuất chạy trong worker: cộng dồn thời gian do worker tự đo
+            metrics.add_time('extract', seconds)
+            if metrics.enabled:
+                metrics.count('input_bytes', os.path.getsize(path))
+            metrics.count('cache_hits' if cached else 'cache_misses')
+            metrics.count('questions_extracted', len(questions))
+            metrics.count('questions_written', written)
+            metrics.count('questions_skipped', skipped)
+
+            totals['failed'] += 1 if error else 0
+            totals['extracted'] += len(questions)
+            totals['written'] += written
+            totals['skipped'] += skipped
+            emit('file', path=path, status='error' if error else 'ok', error=error,
+                 extracted=len(questions), written=written, skipped=skipped, cached=cached,
+                 seconds=round(seconds, 3))
+
+    try:
+        handler = ExcelHandler(template_path=args.output, metrics=metrics)
+        if processed_questions:
+            with metrics.stage('export'):
+                if os.path.exists(args.output):
+                    handler.append_questions(processed_questions, args.output)
+                else:
+                    handler.write_questions_streaming(processed_questions, args.output)
+        with metrics.stage('store_flush'):
+            deduplicator.flush(args.output)
+    except Exception as e:
+        deduplicator.discard_pending()
+        emit('summary', status='error', error=f"{type(e).__name__}: {e}", output=args.output,
+             seconds=round(time.perf_counter() - started, 3), **totals)
+        return EXIT_EXPORT_FAILED
+
+    logger.log_export_stats({'written': totals['written'], 'skipped': totals['skipped'], 'merged': 0})
+    metrics_path = metrics.write_report(os.path.dirname(os.path.abspath(args.output)))
+    if metrics_path:
+        totals['metrics'] = metrics_path
+    if totals['failed'] == totals['files']:
+        status, code = 'failed', EXIT_ALL_FAILED
+    elif totals['failed']:
+        status, code = 'partial', EXIT_PARTIAL
+    else:
+        status, code = 'ok', EXIT_OK
+    emit('summary', status=status, output=args.output,
+         seconds=round(time.perf_counter() - started, 3), **totals)
+    return code
+
+if __name__ == "__main__":
+    sys.exit(main())
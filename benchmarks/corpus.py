@@ -0,0 +1,116 @@
+# benchmarks/corpus.py
+"""
+Sinh ngân hàng câu hỏi tiếng Việt tổng hợp, tái lập được theo seed.
+Gồm đánh số "Câu N." và "N.", đáp án A–D, các biến thể dấu ba chấm, câu trùng lặp
+và đánh số hỏng (nhảy số, lặp số, đánh lại từ đầu).
+Chạy: python -m benchmarks.corpus --count 1000 --seed 1 -o corpus.txt
+"""
+import argparse
+import random
+import sys
+
+SUBJECTS = (
+    "phong trào Cần Vương", "cải cách Minh Trị", "chiến dịch Điện Biên Phủ",
+    "Cách mạng tháng Tám", "Hiệp định Giơ-ne-vơ", "công cuộc Đổi mới",
+    "quá trình quang hợp", "định luật Ôm", "phản ứng oxi hóa - khử", "hàm số bậc hai",
+    "thì hiện tại hoàn thành", "câu bị động", "nền kinh tế thị trường", "vùng Đồng bằng sông Cửu Long",
+)
+TEMPLATES = (
+    "Ý nào sau đây phản ánh đúng {ellipsis} về {subject}?",
+    "Điểm khác biệt {ellipsis} của {subject} so với giai đoạn trước là gì?",
+    "Nguyên nhân chủ yếu dẫn đến {subject} là",
+    "Đâu không phải là đặc điểm của {subject}?",
+    "Ý nghĩa lịch sử quan trọng nhất của {subject} là {ellipsis}",
+    "Khi nói về {subject}, phát biểu nào sau đây là đúng?",
+)
+PHRASES = (
+    "tăng cường tiềm lực quốc phòng", "mở rộng quan hệ đối ngoại", "phát triển kinh tế tư bản chủ nghĩa",
+    "giữ vững độc lập chủ quyền", "thúc đẩy sản xuất nông nghiệp", "nâng cao dân trí",
+    "thay đổi cơ cấu xã hội", "giải phóng năng lượng", "tạo ra chất hữu cơ", "xác định cực trị",
+)
+SHARED_OPTIONS = ("Tất cả các ý trên", "Cả A và B đều đúng", "Không có đáp án đúng")
+ELLIPSES = ("...", ". . .", "…", "..", "__________")
+QUESTION_NUMBERING = ("Câu {n}.", "Câu {n}:", "Câu {n})", "{n}.", "{n})")
+OPTION_MARKERS = ("{letter}.", "{letter})", "{letter}:")
+LETTERS = "ABCD"
+
+def _question(rng, serial):
+    """Một câu hỏi mới (nội dung, 4 đáp án); serial đảm bảo các câu khác nhau"""
+    text = rng.choice(TEMPLATES).format(subject=rng.choice(SUBJECTS), ellipsis=rng.choice(ELLIPSES))
+    text = f"({serial}) {text}" if rng.random() < 0.5 else f"{text} [{serial}]"
+    options = [f"{rng.choice(PHRASES).capitalize()} {serial}-{i}" for i in range(3)]
+    options.append(rng.choice(SHARED_OPTIONS) if rng.random() < 0.3 else f"{rng.choice(PHRASES)}.")
+    rng.shuffle(options)
+    return text, options
+
+def _variant(rng, text, options):
+    """Bản trùng lặp của một câu đã có, khác khoảng trắng/hoa thường/dấu câu"""
+    roll = rng.random()
+    if roll < 0.4:
+        return text, options
+    if roll < 0.7:
+        return "  ".join(text.split(" ")), [option.upper() for option in options]
+    return text.rstrip("?") + " ?", [option.rstrip(".") for option in options]
+
+def _render(rng, number, text, options):
+    """Khối văn bản của một câu hỏi"""
+    head = rng.choice(QUESTION_NUMBERING).format(n=number)
+    marker = rng.choice(OPTION_MARKERS)
+    rendered = [marker.format(letter=letter) + " " + option for letter, option in zip(LETTERS, options)]
+    if rng.random() < 0.15:
+        # Đáp án trên cùng một dòng
+        return f"{head} {text}\n" + "   ".join(rendered) + "\n"
+    return f"{head} {text}\n" + "\n".join(rendered) + "\n"
+
+def iter_corpus(count, seed=0, duplicate_rate=0.1, broken_rate=0.02):
+    """
+    Sinh lần lượt các khối văn bản của count câu hỏi.
+    Cùng (count, seed, duplicate_rate, broken_rate) luôn cho ra cùng một văn bản.
+    """
+    rng = random.Random(seed)
+    pool = []
+    number = 0
+    for serial in range(count):
+        if pool and rng.random() < duplicate_rate:
+            text, options = _variant(rng, *rng.choice(pool))
+        else:
+            text, options = _question(rng, serial)
+            if len(pool) < 4096:
+                pool.append((text, options))
+            else:
+                pool[rng.randrange(len(pool))] = (text, options)
+
+        roll = rng.random()
+        if roll < broken_rate / 3:
+            number += rng.randint(2, 5)  # Nhảy số
+        elif roll < broken_rate * 2 / 3:
+            pass  # Lặp lại số trước
+        elif roll < broken_rate:
+            number = 1  # Đánh số lại từ đầu (ghép nhiều đề)
+        else:
+            number += 1
+        yield _render(rng, max(number, 1), text, options)
+
+def generate_corpus(count, seed=0, duplicate_rate=0.1, broken_rate=0.02):
+    """Toàn bộ văn bản của ngân hàng count câu hỏi"""
+    return "\n".join(iter_corpus(count, seed, duplicate_rate, broken_rate))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--duplicate-rate', type=float, default=0.1)
+    parser.add_argument('--broken-rate', type=float, default=0.02)
+    parser.add_argument('-o', '--output', help="Ghi ra file (mặc định: stdout)")
+    args = parser.parse_args()
+
+    blocks = iter_corpus(args.count, args.seed, args.duplicate_rate, args.broken_rate)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write("\n".join(blocks))
+    else:
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stdout.write("\n".join(blocks))
+
+if __name__ == "__main__":
+    main()
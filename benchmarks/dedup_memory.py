@@ -0,0 +1,43 @@
+# benchmarks/dedup_memory.py
+"""
+So sánh bộ nhớ của Deduplicator ở chế độ thường và compact.
+Chạy: python -m benchmarks.dedup_memory --count 1000000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from core.deduplicator import Deduplicator
+from core.logger import Logger
+
+def _questions(count):
+    for i in range(count):
+        yield (f"Câu hỏi số {i}: nội dung nào dưới đây phản ánh đúng chính sách cải cách?",
+               [f"Đáp án A {i}", f"Đáp án B {i}", "Tất cả đều đúng", "Tất cả đều sai"])
+
+def measure(count, compact):
+    """Số byte bộ nhớ còn giữ lại trên mỗi câu hỏi sau khi thêm count câu"""
+    gc.collect()
+    tracemalloc.start()
+    deduplicator = Deduplicator(policy='skip', logger=Logger(), compact=compact)
+    base = tracemalloc.get_traced_memory()[0]
+    
+    for text, options in _questions(count):
+        deduplicator.add_question(text, options)
+    
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return retained / count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=1_000_000)
+    args = parser.parse_args()
+    
+    for compact in (False, True):
+        mode = "compact (blake2b-16 + row ref)" if compact else "default (md5 hex + text)"
+        print(f"{mode:32s} {measure(args.count, compact):8.1f} bytes/question")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# benchmarks/normalizer_speed.py
+"""
+Đo thời gian mỗi lần gọi các hàm của TextNormalizer.
+Chạy: python -m benchmarks.normalizer_speed --repeat 200000
+"""
+import argparse
+import timeit
+
+from core.normalizer import TextNormalizer
+
+SAMPLES = {
+    'question': "Câu 23. Điểm khác biệt . . . về việc thực hiện chủ trương phát triển đất nước "
+                "của Xiêm so với Việt Nam cuối thể kỉ XIX là gì?",
+    'option': "Tiến hành cải cách theo khuôn mẫu các nước phương Tây.",
+    'short_option': "Tất cả đều đúng",
+}
+
+def bench(label, func, arg, repeat):
+    seconds = min(timeit.repeat(lambda: func(arg), number=repeat, repeat=3))
+    print(f"{label:40s} {seconds / repeat * 1e6:7.2f} us/call")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200_000)
+    args = parser.parse_args()
+    
+    bench("normalize_text(question)", TextNormalizer.normalize_text, SAMPLES['question'], args.repeat)
+    uncached = getattr(TextNormalizer.normalize_text, '__wrapped__', None)
+    if uncached is not None:
+        bench("normalize_text(question) uncached", uncached, SAMPLES['question'], args.repeat)
+    bench("normalize_text(short_option)", TextNormalizer.normalize_text, SAMPLES['short_option'], args.repeat)
+    bench("normalize_dots(question)", TextNormalizer.normalize_dots, SAMPLES['question'], args.repeat)
+    bench("clean_question_text(question)", TextNormalizer.clean_question_text, SAMPLES['question'], args.repeat)
+    bench("clean_option_text(option)", TextNormalizer.clean_option_text, SAMPLES['option'], args.repeat)
+    
+    if hasattr(TextNormalizer, 'normalize_many'):
+        batch = [SAMPLES['short_option'], SAMPLES['option']] * 50
+        seconds = min(timeit.repeat(lambda: TextNormalizer.normalize_many(batch),
+                                    number=args.repeat // 100, repeat=3))
+        print(f"{'normalize_many(100 options) per item':40s} "
+              f"{seconds / (args.repeat // 100) / len(batch) * 1e6:7.2f} us/call")
+
+if __name__ == "__main__":
+    main()
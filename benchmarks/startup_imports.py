@@ -0,0 +1,126 @@
+# benchmarks/startup_imports.py
+"""
+Kiểm tra hồi quy thời gian khởi động bằng python -X importtime.
+Đo thời gian import mọi thứ cần có trước khi cửa sổ hiện lên (main và gui) và
+báo lỗi (exit code 1) nếu vượt ngưỡng hoặc nếu thư viện nặng bị import sớm.
+Chạy: python -m benchmarks.startup_imports --max-ms 200
+(tests/test_startup_imports.py cũng kiểm tra ngưỡng này, có thể nới bằng QE_STARTUP_MAX_MS)
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MAX_MS = 200.0
+MAX_MS_ENV = "QE_STARTUP_MAX_MS"  # Ngưỡng (ms) cho máy chậm, vd. trên CI
+
+# Chỉ được nạp khi dùng tới (xuất Excel, mở .docx/.pdf, dedup theo lô)
+HEAVY_MODULES = ('openpyxl', 'pandas', 'numpy', 'docx', 'PyPDF2', 'lxml')
+
+def _module_path(name):
+    """File nguồn của module trong repo, None nếu là thư viện ngoài"""
+    base = os.path.join(REPO_ROOT, *name.split('.'))
+    for path in (base + '.py', os.path.join(base, '__init__.py')):
+        if os.path.isfile(path):
+            return path
+    return None
+
+def _top_level_imports(path):
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            yield node.module
+
+def app_modules(entry='gui'):
+    """
+    Các module của ứng dụng mà entry import ở cấp module, đọc thẳng từ mã nguồn nên
+    không bị lệch khi gui thêm import. Module cần tkinter được thay bằng các module
+    của ứng dụng mà nó import (dùng khi môi trường không có tkinter).
+    """
+    modules = []
+    for name in _top_level_imports(_module_path(entry)):
+        path = _module_path(name)
+        if path is None or name in modules:
+            continue
+        if any(imported.split('.')[0] == 'tkinter' for imported in _top_level_imports(path)):
+            modules.extend(m for m in app_modules(name) if m not in modules)
+        else:
+            modules.append(name)
+    return modules
+
+def import_statement():
+    """Câu lệnh import lúc khởi động: main rồi gui (hoặc các module của gui nếu thiếu tkinter)"""
+    probe = subprocess.run([sys.executable, '-c', 'import tkinter'], capture_output=True)
+    if probe.returncode == 0:
+        return 'import main, gui'
+    return 'import main, ' + ', '.join(app_modules())
+
+def max_ms():
+    """Ngưỡng thời gian import: QE_STARTUP_MAX_MS nếu có, ngược lại DEFAULT_MAX_MS"""
+    return float(os.environ.get(MAX_MS_ENV) or DEFAULT_MAX_MS)
+
+def measure(statement):
+    """Trả về (tổng thời gian import ms, tập module đã import)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        try:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            cumulative = int(cumulative)
+        except ValueError:
+            continue  # Dòng tiêu đề
+        modules.add(name.strip())
+        if not name.startswith('  '):
+            total_us += cumulative
+    return total_us / 1000, modules
+
+def measure_median(statement, runs):
+    """Trả về (thời gian import trung vị ms qua runs lần chạy, tập module đã import)"""
+    timings = []
+    modules = set()
+    for _ in range(runs):
+        elapsed, modules = measure(statement)
+        timings.append(elapsed)
+    return statistics.median(timings), modules
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--max-ms', type=float, default=max_ms())
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    statement = import_statement()
+    median, modules = measure_median(statement, args.runs)
+
+    heavy = sorted(m for m in modules if m.split('.')[0] in HEAVY_MODULES)
+    print(f"{statement}: median {median:.1f} ms over {args.runs} runs (limit {args.max_ms:.0f} ms)")
+
+    failed = False
+    if heavy:
+        print("FAIL: heavy modules imported at startup: " + ", ".join(heavy))
+        failed = True
+    if median > args.max_ms:
+        print("FAIL: startup import time over limit")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+# benchmarks/suite.py
+"""
+Bộ benchmark tái lập được cho trích xuất, khử trùng lặp và xuất Excel.
+Mỗi (giai đoạn, kích thước) chạy trong một process riêng để đo peak RSS độc lập.
+
+    python -m benchmarks.suite run --sizes 1000 10000 100000 -o results.json
+    python -m benchmarks.suite run --baseline baseline.json -o results.json
+    python -m benchmarks.suite run --stages extract_parallel --workers 1 2 4 8
+    python -m benchmarks.suite compare baseline.json results.json --tolerance 0.15
+
+compare (và run --baseline) trả mã thoát 1 nếu có giai đoạn chậm hơn hoặc tốn
+bộ nhớ hơn baseline quá ngưỡng cho phép.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from core.metrics import peak_rss_mb
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STAGES = ('extract', 'extract_parallel', 'dedup', 'dedup_batch', 'write')
+WORKER_STAGES = ('extract_parallel',)  # Các giai đoạn được chạy lại với từng số process của --workers
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+def default_worker_counts():
+    """1, 2, 4, ... đến số lõi CPU (luôn có số lõi CPU)"""
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+def run_stage(stage, size, seed, policy, workers=1):
+    """Chạy một giai đoạn trong process hiện tại, chỉ tính thời gian của giai đoạn đó"""
+    from benchmarks.corpus import generate_corpus
+    from text_processor import TextProcessor
+
+    text = generate_corpus(size, seed=seed)
+    processor = TextProcessor()
+
+    if stage == 'extract':
+        rss_before = peak_rss_mb()
+        started = time.perf_counter()
+        items = len(processor.extract_questions_from_text(text))
+        seconds = time.perf_counter() - started
+        return items, seconds, rss_before
+
+    if stage == 'extract_parallel':
+        rss_before = peak_rss_mb()
+        started = time.perf_counter()
+        items = len(processor.extract_parallel(text, workers=workers))
+        seconds = time.perf_counter() - started
+        return items, seconds, rss_before
+
+    questions = processor.extract_questions_from_text(text)
+    del text
+
+    if stage == 'dedup':
+        from core.deduplicator import Deduplicator
+        from core.logger import Logger
+
+        deduplicator = Deduplicator(policy=policy, logger=Logger(os.devnull))
+        rss_before = peak_rss_mb()
+        started = time.perf_counter()
+        for question in questions:
+            deduplicator.add_question(question['question_text'], question['options'])
+        seconds = time.perf_counter() - started
+        return len(questions), seconds, rss_before
+
+    if stage == 'write':
+        from excel_handler import ExcelHandler
+
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = ExcelHandler(template_path=os.path.join(tmp, "bench.xlsx"))
+            handler.create_template_if_not_exists()
+            rss_before = peak_rss_mb()
+            started = time.perf_counter()
+            handler.write_questions(questions)
+            seconds = time.perf_counter() - started
+        return len(questions), seconds, rss_before
+
+    if stage == 'dedup_batch':
+        from core.deduplicator import Deduplicator
+        from core.logger import Logger
+        from core.question import QuestionBatch
+
+        deduplicator = Deduplicator(policy=policy, logger=Logger(os.devnull))
+        rss_before = peak_rss_mb()
+        started = time.perf_counter()
+        # Dựng QuestionBatch cũng được tính giờ: giai đoạn dedup nhận thẳng danh sách câu hỏi
+        batch = QuestionBatch.from_questions(questions)
+        deduplicator.dedup_batch(batch)
+        seconds = time.perf_counter() - started
+        return len(batch), seconds, rss_before
+
+    raise ValueError(f"Unknown stage: {stage}")
+
+def _spawn_stage(stage, size, seed, policy, workers=1):
+    result = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.suite', '_stage', stage, str(size),
+         '--seed', str(seed), '--policy', policy, '--workers', str(workers)],
+        cwd=REPO_ROOT, capture_output=True, text=True, encoding='utf-8'
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{stage}/{size}: {result.stderr.strip()}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def run_suite(stages, sizes, seed=0, repeat=1, policy='skip', workers=(1,), progress=print):
+    """
+    Chạy các giai đoạn, lấy thời gian tốt nhất và peak RSS lớn nhất qua repeat lần.
+    Giai đoạn trong WORKER_STAGES được chạy với từng số process trong workers.
+    """
+    results = []
+    for size in sizes:
+        for stage, stage_workers in _stage_runs(stages, workers):
+            runs = [_spawn_stage(stage, size, seed, policy, stage_workers or 1) for _ in range(repeat)]
+            best = min(runs, key=lambda run: run['seconds'])
+            peaks = [run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None]
+            record = {
+                'stage': stage,
+                'size': size,
+                'workers': stage_workers,
+                'items': best['items'],
+                'seconds': round(best['seconds'], 4),
+                'throughput': round(best['items'] / best['seconds'], 1) if best['seconds'] else None,
+                'rss_before_mb': best['rss_before_mb'],
+                'peak_rss_mb': max(peaks) if peaks else None,
+            }
+            results.append(record)
+            if progress:
+                progress(format_record(record))
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'policy': policy,
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+
+def _stage_runs(stages, workers):
+    """Các cặp (giai đoạn, số process); None với giai đoạn không dùng process pool"""
+    for stage in stages:
+        if stage in WORKER_STAGES:
+            yield from ((stage, count) for count in workers)
+        else:
+            yield stage, None
+
+def _label(record):
+    workers = record.get('workers')
+    return f"{record['stage']}[{workers}]" if workers else record['stage']
+
+def format_record(record):
+    rss = record['peak_rss_mb']
+    rss_text = f"{rss:8.1f} MB" if rss is not None else "       n/a"
+    return (f"{_label(record):20s} {record['size']:>9,d} q  {record['seconds']:9.3f} s  "
+            f"{record['throughput'] or 0:>12,.0f} q/s  peak {rss_text}")
+
+def compare(baseline, current, tolerance=0.15, memory_tolerance=0.25):
+    """
+    Danh sách (dòng mô tả, có hồi quy hay không) cho mỗi (giai đoạn, kích thước) có trong cả hai.
+    Hồi quy: throughput giảm quá tolerance hoặc peak RSS tăng quá memory_tolerance.
+    """
+    base_index = {(r['stage'], r['size'], r.get('workers')): r for r in baseline['results']}
+    lines = []
+    for record in current['results']:
+        base = base_index.get((record['stage'], record['size'], record.get('workers')))
+        if base is None or not base['throughput'] or not record['throughput']:
+            continue
+        speed = record['throughput'] / base['throughput'] - 1
+        regressed = speed < -tolerance
+        text = f"{_label(record):20s} {record['size']:>9,d} q  throughput {speed:+7.1%}"
+
+        if base['peak_rss_mb'] and record['peak_rss_mb']:
+            memory = record['peak_rss_mb'] / base['peak_rss_mb'] - 1
+            regressed = regressed or memory > memory_tolerance
+            text += f"  peak RSS {memory:+7.1%}"
+        lines.append((text, regressed))
+    return lines
+
+def _report_comparison(baseline, current, tolerance, memory_tolerance):
+    lines = compare(baseline, current, tolerance, memory_tolerance)
+    for text, regressed in lines:
+        print(("REGRESSION " if regressed else "ok         ") + text)
+    if not lines:
+        print("Không có kết quả chung để so sánh")
+    return 1 if any(regressed for _, regressed in lines) else 0
+
+def _load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="Chạy benchmark và ghi kết quả JSON")
+    run.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    run.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES))
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--repeat', type=int, default=1)
+    run.add_argument('--policy', choices=['skip', 'append', 'allow'], default='skip')
+    run.add_argument('--workers', nargs='+', type=int, default=default_worker_counts(),
+                     help="Số process cho extract_parallel (mặc định 1, 2, 4... đến số lõi CPU)")
+    run.add_argument('-o', '--output', help="File JSON kết quả")
+    run.add_argument('--baseline', help="So sánh với file kết quả baseline sau khi chạy")
+    run.add_argument('--tolerance', type=float, default=0.15)
+    run.add_argument('--memory-tolerance', type=float, default=0.25)
+
+    cmp = commands.add_parser('compare', help="So sánh hai file kết quả")
+    cmp.add_argument('baseline')
+    cmp.add_argument('current')
+    cmp.add_argument('--tolerance', type=float, default=0.15)
+    cmp.add_argument('--memory-tolerance', type=float, default=0.25)
+
+    stage = commands.add_parser('_stage')  # Dùng nội bộ: một giai đoạn trong process con
+    stage.add_argument('stage', choices=STAGES)
+    stage.add_argument('size', type=int)
+    stage.add_argument('--seed', type=int, default=0)
+    stage.add_argument('--policy', default='skip')
+    stage.add_argument('--workers', type=int, default=1)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == '_stage':
+        items, seconds, rss_before = run_stage(args.stage, args.size, args.seed, args.policy, args.workers)
+        print(json.dumps({'items': items, 'seconds': seconds,
+                          'rss_before_mb': rss_before, 'peak_rss_mb': peak_rss_mb()}))
+        return 0
+
+    if args.command == 'compare':
+        return _report_comparison(_load(args.baseline), _load(args.current),
+                                  args.tolerance, args.memory_tolerance)
+
+    report = run_suite(args.stages, args.sizes, seed=args.seed, repeat=args.repeat, policy=args.policy,
+                       workers=args.workers)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        return _report_comparison(_load(args.baseline), report, args.tolerance, args.memory_tolerance)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
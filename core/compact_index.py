@@ -0,0 +1,106 @@
+# core/compact_index.py
+from array import array
+from bisect import bisect_left
+
+class _DigestView:
+    """Cho phép bisect trực tiếp trên buffer các digest độ dài cố định"""
+
+    def __init__(self, buf, width):
+        self.buf = buf
+        self.width = width
+
+    def __len__(self):
+        return len(self.buf) // self.width
+
+    def __getitem__(self, i):
+        start = i * self.width
+        return self.buf[start:start + self.width]
+
+
+class CompactFingerprintIndex:
+    """
+    Bảng fingerprint -> số thứ tự dòng, tiết kiệm bộ nhớ.
+    Digest nhị phân độ dài cố định được xếp liền nhau trong một bytes đã sắp xếp,
+    số thứ tự dòng nằm trong array song song (khoảng 24 byte/câu hỏi).
+    Các digest mới nằm tạm trong dict nhỏ và được gộp vào mảng theo lô.
+    """
+
+    def __init__(self, digest_size=16, merge_threshold=4096):
+        self.digest_size = digest_size
+        self.merge_threshold = merge_threshold
+        self._keys = b""
+        self._refs = array('Q')
+        self._recent = {}
+
+    def __len__(self):
+        return len(self._refs) + len(self._recent)
+
+    def __contains__(self, digest):
+        return self.get(digest) is not None
+
+    def get(self, digest, default=None):
+        ref = self._recent.get(digest)
+        if ref is not None:
+            return ref
+        i = bisect_left(_DigestView(self._keys, self.digest_size), digest)
+        if i < len(self._refs) and self._digest_at(i) == digest:
+            return self._refs[i]
+        return default
+
+    def __getitem__(self, digest):
+        ref = self.get(digest)
+        if ref is None:
+            raise KeyError(digest)
+        return ref
+
+    def __setitem__(self, digest, ref):
+        if len(digest) != self.digest_size:
+            raise ValueError(f"Digest phải dài {self.digest_size} byte")
+        i = bisect_left(_DigestView(self._keys, self.digest_size), digest)
+        if i < len(self._refs) and self._digest_at(i) == digest:
+            self._refs[i] = ref
+            return
+        self._recent[digest] = ref
+        if len(self._recent) >= max(self.merge_threshold, len(self._refs) >> 6):
+            self._merge()
+
+    def _digest_at(self, i):
+        start = i * self.digest_size
+        return self._keys[start:start + self.digest_size]
+
+    def _merge(self):
+        """Gộp các digest mới vào mảng đã sắp xếp (chỉ sao chép theo đoạn)"""
+        if not self._recent:
+            return
+        view = _DigestView(self._keys, self.digest_size)
+        width = self.digest_size
+
+        key_parts = []
+        refs = array('Q')
+        prev = 0
+        for digest in sorted(self._recent):
+            pos = bisect_left(view, digest, prev)
+            key_parts.append(self._keys[prev * width:pos * width])
+            key_parts.append(digest)
+            refs.extend(self._refs[prev:pos])
+            refs.append(self._recent[digest])
+            prev = pos
+        key_parts.append(self._keys[prev * width:])
+        refs.extend(self._refs[prev:])
+
+        self._keys = b"".join(key_parts)
+        self._refs = refs
+        self._recent = {}
+
+    def discard_from(self, first_ref):
+        """Bỏ mọi digest có số thứ tự dòng >= first_ref"""
+        self._recent = {digest: ref for digest, ref in self._recent.items() if ref < first_ref}
+        keep = [i for i, ref in enumerate(self._refs) if ref < first_ref]
+        if len(keep) == len(self._refs):
+            return
+        self._keys = b"".join(self._digest_at(i) for i in keep)
+        self._refs = array('Q', (self._refs[i] for i in keep))
+
+    def nbytes(self):
+        """Ước lượng bộ nhớ dữ liệu (không tính phần dict tạm)"""
+        return len(self._keys) + self._refs.itemsize * len(self._refs)
@@ -2,14 +2,168 @@
 
 from .normalizer import TextNormalizer
 from .logger import Logger
+from .compact_index import CompactFingerprintIndex
+from .question import QuestionBatch, iter_rows
 import hashlib
+import os
+import random
+import zlib
+
+_MERSENNE_PRIME = (1 << 61) - 1
+WORKBOOK_STATE_KEY = 'workbook_state'  # Meta của store: kích thước/mtime workbook lúc flush gần nhất
+DEDUP_CHUNK_ROWS = 100_000  # dedup_batch xử lý theo từng đoạn để giới hạn bộ nhớ trung gian
+
+def _workbook_state(path):
+    """Kích thước và mtime của workbook ("" nếu chưa có) để nhận ra workbook bị xóa hoặc bị thay"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+class MinHashLSH:
+    """
+    Phát hiện câu hỏi gần trùng bằng MinHash + LSH banding.
+    Mỗi câu hỏi được chia thành shingle ký tự, tạo chữ ký MinHash num_perm giá trị
+    và chia thành các band; chỉ các câu rơi vào cùng bucket mới được so sánh,
+    nên chi phí mỗi lần thêm không phụ thuộc số câu đã có trong chỉ mục.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, shingle_size=5, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = self._optimal_bands(threshold, num_perm)
+        
+        rng = random.Random(seed)
+        self._hash_a = rng.randrange(1, _MERSENNE_PRIME)
+        self._hash_b = rng.randrange(0, _MERSENNE_PRIME)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = {}
+
+    @staticmethod
+    def _optimal_bands(threshold, num_perm):
+        """Chọn (bands, rows) sao cho ngưỡng LSH (1/b)^(1/r) gần threshold nhất"""
+        best = None
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+        return best[1], best[2]
+
+    def shingles(self, text, options):
+        """Tập hash của các shingle; đáp án được sắp xếp để không phụ thuộc thứ tự"""
+        norm_opts = sorted(TextNormalizer.normalize_many([opt for opt in options if opt]))
+        content = " ".join([TextNormalizer.normalize_text(text)] + norm_opts)
+        k = self.shingle_size
+        if len(content) <= k:
+            return {zlib.crc32(content.encode('utf-8'))}
+        return {zlib.crc32(content[i:i + k].encode('utf-8')) for i in range(len(content) - k + 1)}
+
+    def signature(self, text, options):
+        """
+        Chữ ký MinHash một hoán vị (one-permutation hashing): mỗi shingle chỉ băm
+        một lần rồi rơi vào một trong num_perm ngăn, mỗi ngăn giữ giá trị nhỏ nhất.
+        Ngăn rỗng mượn giá trị của ngăn kế tiếp bên phải (densification).
+        """
+        num_perm = self.num_perm
+        a, b = self._hash_a, self._hash_b
+        signature = [None] * num_perm
+        for h in self.shingles(text, options):
+            x = (a * h + b) % _MERSENNE_PRIME
+            slot = x % num_perm
+            value = x // num_perm
+            current = signature[slot]
+            if current is None or value < current:
+                signature[slot] = value
+        
+        for slot in range(num_perm):
+            if signature[slot] is None:
+                for distance in range(1, num_perm):
+                    borrowed = signature[(slot + distance) % num_perm]
+                    if borrowed is not None and borrowed >= 0:
+                        # Giá trị mượn kèm khoảng cách để tránh trùng ngẫu nhiên giữa các ngăn
+                        signature[slot] = -(borrowed * num_perm + distance) - 1
+                        break
+        return tuple(signature)
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows]
+
+    def query(self, signature):
+        """Trả về (ref, độ tương đồng ước lượng) của câu giống nhất vượt ngưỡng, hoặc None"""
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+        
+        best = None
+        for ref in candidates:
+            other = self._signatures[ref]
+            similarity = sum(1 for x, y in zip(signature, other) if x == y) / self.num_perm
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (ref, similarity)
+        return best
+
+    def insert(self, ref, signature):
+        self._signatures[ref] = signature
+        for band, key in self._band_keys(signature):
+            self._buckets[band].setdefault(key, []).append(ref)
+
+    def discard_from(self, first_ref):
+        """Bỏ các câu có ref >= first_ref (hoàn tác một lần chạy bị hủy)"""
+        for ref in [ref for ref in self._signatures if ref >= first_ref]:
+            for band, key in self._band_keys(self._signatures.pop(ref)):
+                bucket = self._buckets[band][key]
+                bucket.remove(ref)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    def __len__(self):
+        return len(self._signatures)
+
 
 class Deduplicator:
-    def __init__(self, policy='allow', logger=None):
+    def __init__(self, policy='allow', logger=None, store=None, compact=False,
+                 near_threshold=None):
         self.policy = policy 
-        self.fingerprint_map = {}
+        # compact=True: digest blake2b 16 byte, chỉ lưu số thứ tự dòng thay cho nội dung câu hỏi
+        self.compact = compact
+        self.fingerprint_map = CompactFingerprintIndex() if compact else {}
         self.conflicts = []
-        self.logger = logger or Logger()
+        self.logger = logger or Logger.shared()
+        self.store = store  # FingerprintStore: fingerprint của các lần chạy trước
+        self._known = set()  # Fingerprint tra được từ store trong lần chạy này
+        # Policy 'append': hậu tố nhỏ nhất còn trống của mỗi fingerprint.
+        # Tập fingerprint đã biết chỉ tăng nên hậu tố này không bao giờ giảm.
+        self._next_suffix = {}
+        # Số câu trong fingerprint_map tại lần flush gần nhất; các câu sau mốc này
+        # (ref >= _committed, theo thứ tự thêm) bị hoàn tác khi discard_pending
+        self._committed = 0
+        # near_threshold (0-1): bật phát hiện gần trùng bằng MinHash/LSH. Câu gần trùng bị bỏ
+        # với 'skip', được giữ nguyên (không thêm hậu tố) với 'append'/'allow'
+        self.near_index = MinHashLSH(threshold=near_threshold) if near_threshold else None
+        
+        if store is not None:
+            kind = 'blake2b-16' if compact else 'md5-hex'
+            stored_kind = store.get_meta('fingerprint_kind')
+            if stored_kind is None:
+                store.set_meta('fingerprint_kind', kind)
+            elif stored_kind != kind:
+                raise ValueError(f"Fingerprint store uses {stored_kind}, expected {kind}")
+    
+    def _is_known(self, fingerprint):
+        """Fingerprint đã xuất hiện trong phiên này hoặc trong store"""
+        if fingerprint in self.fingerprint_map or fingerprint in self._known:
+            return True
+        if self.store is not None and fingerprint in self.store:
+            self._known.add(fingerprint)
+            return True
+        return False
     
     def get_fingerprint(self, text, options):
         """
@@ -19,31 +173,27 @@ class Deduplicator:
 
         norm_text = TextNormalizer.normalize_text(text)
         
-        valid_opts = [TextNormalizer.normalize_text(opt) for opt in options if opt]
+        valid_opts = TextNormalizer.normalize_many([opt for opt in options if opt])
         opts_str = "".join(valid_opts)
         
         raw_id = f"{norm_text}|{opts_str}"
         
+        return self._digest(raw_id)
+
+    def _digest(self, raw_id):
+        if self.compact:
+            return hashlib.blake2b(raw_id.encode('utf-8'), digest_size=16).digest()
         return hashlib.md5(raw_id.encode('utf-8')).hexdigest()
 
-    def process_duplicate(self, question_text, options, existing_data):
+    def process_duplicate(self, question_text, options, existing_data, fingerprint=None):
         """Xử lý câu hỏi trùng lặp hoàn toàn (cả câu hỏi lẫn đáp án)"""
-        existing_question, existing_options = existing_data
-        
         if self.policy == 'skip':
             return None  # Bỏ qua
         
         elif self.policy == 'append':
-            suffix = 1
-            base_text = question_text
-            while True:
-                new_text = f"{base_text} ({suffix})"
-
-                new_fingerprint = self.get_fingerprint(new_text, options)
-                
-                if new_fingerprint not in self.fingerprint_map:
-                    return (new_text, options)
-                suffix += 1
+            if fingerprint is None:
+                fingerprint = self.get_fingerprint(question_text, options)
+            return (self._append_suffix(question_text, options, fingerprint, self._is_known), options)
         
         elif self.policy == 'allow':
 
@@ -51,23 +201,301 @@ class Deduplicator:
         
         return None
 
+    def _append_suffix(self, question_text, options, fingerprint, is_known):
+        """Nội dung mới "question_text (n)" với n nhỏ nhất mà fingerprint chưa được biết"""
+        suffix = self._next_suffix.get(fingerprint, 1)
+        base_text = question_text
+        while True:
+            new_text = f"{base_text} ({suffix})"
+
+            new_fingerprint = self.get_fingerprint(new_text, options)
+            
+            if not is_known(new_fingerprint):
+                self._next_suffix[fingerprint] = suffix
+                return new_text
+            suffix += 1
+
     def add_question(self, question_text, options):
         """Thêm câu hỏi vào hệ thống, xử lý trùng lặp"""
 
         fingerprint = self.get_fingerprint(question_text, options)
         
-        if fingerprint in self.fingerprint_map:
+        if self._is_known(fingerprint):
 
             result = self.process_duplicate(question_text, options, 
-                                            self.fingerprint_map[fingerprint])
+                                            self.fingerprint_map.get(fingerprint),
+                                            fingerprint=fingerprint)
             if result:
 
                 return result
             return None
-        else:
+        
+        signature = None
+        if self.near_index is not None:
+            signature = self.near_index.signature(question_text, options)
+            match = self.near_index.query(signature)
+            if match:
+                ref, similarity = match
+                self.conflicts.append({
+                    'question_text': question_text,
+                    'matched_ref': ref,
+                    'similarity': similarity
+                })
+                self.logger.warning(f"Near-duplicate ({similarity:.2f}) of #{ref}: {question_text[:80]}")
+                if self.policy not in ('append', 'allow'):
+                    return None
+                # 'append'/'allow': câu gần trùng không phải bản sao nên giữ nguyên nội dung
+                # (hậu tố chỉ dành cho câu trùng hoàn toàn) và được ghi nhận như câu mới
 
+        ref = len(self.fingerprint_map)
+        if self.compact:
+            self.fingerprint_map[fingerprint] = ref
+        else:
             self.fingerprint_map[fingerprint] = (question_text, options)
-            return (question_text, options)
+        if self.store is not None:
+            self.store.add(fingerprint)
+        if signature is not None:
+            self.near_index.insert(ref, signature)
+        return (question_text, options)
+
+    def add_questions(self, questions):
+        """
+        Thêm nhiều câu hỏi (list các tuple (question_text, options)).
+        Tra cứu store một lần cho cả lô thay vì từng câu; kết quả giống add_question.
+        """
+        questions = list(questions)
+        if self.store is not None:
+            fingerprints = [self.get_fingerprint(text, options) for text, options in questions]
+            self._known.update(self.store.contains_many(fingerprints))
+        return [self.add_question(text, options) for text, options in questions]
+
+    def add_batch(self, questions):
+        """
+        Như add_questions nhưng nhận QuestionBatch (hoặc list Question/dict) và trả về
+        QuestionBatch các câu được giữ lại; đọc thẳng các cột, không tạo đối tượng cho từng câu.
+        """
+        if not isinstance(questions, (QuestionBatch, list, tuple)):
+            questions = list(questions)
+        if self.store is not None:
+            self._known.update(self.store.contains_many(
+                self.get_fingerprint(text, options) for text, options in iter_rows(questions)
+            ))
+        kept = QuestionBatch()
+        for text, options in iter_rows(questions):
+            result = self.add_question(text, options)
+            if result:
+                kept.append(result[0], result[1])
+        return kept
+
+    def dedup_batch(self, questions):
+        """
+        Khử trùng lặp một lô lớn (vd. gộp nguyên ngân hàng câu hỏi) theo kiểu vector hóa:
+        chuẩn hóa cả cột bằng TextNormalizer.normalize_column, gom các câu cùng khóa
+        (group-by theo code của khóa chuẩn hóa), mỗi nhóm chỉ băm một lần và tra store
+        một lần cho cả lô. Kết quả và trạng thái (fingerprint_map, store, hậu tố của
+        'append') giống hệt add_batch với cùng đầu vào. Khi bật phát hiện gần trùng
+        hoặc không có pandas thì dùng add_batch. Chỉ nhanh hơn add_batch với lô cỡ
+        100k câu trở lên và tốn gấp đôi bộ nhớ (giai đoạn dedup_batch của benchmarks.suite).
+        """
+        if self.near_index is not None:
+            return self.add_batch(questions)
+        try:
+            import pandas  # noqa: F401
+        except ImportError:
+            return self.add_batch(questions)
+
+        batch = QuestionBatch.from_questions(questions)
+        if len(batch) <= DEDUP_CHUNK_ROWS:
+            return self._dedup_chunk(batch)
+        kept = QuestionBatch()
+        option_ends = batch.option_ends
+        for start in range(0, len(batch), DEDUP_CHUNK_ROWS):
+            stop = min(start + DEDUP_CHUNK_ROWS, len(batch))
+            first = option_ends[start - 1] if start else 0
+            kept.extend(self._dedup_chunk(QuestionBatch.from_columns(
+                batch.texts[start:stop],
+                batch.option_values[first:option_ends[stop - 1]],
+                [end - first for end in option_ends[start:stop]],
+                batch.numbers[start:stop],
+            )))
+        return kept
+
+    def _dedup_chunk(self, batch):
+        import numpy as np
+        import pandas as pd
+        from .normalizer import factorize_strings
+
+        count = len(batch)
+        if not count:
+            return QuestionBatch()
+
+        option_ends = np.frombuffer(batch.option_ends, dtype=np.uint32).astype(np.intp)
+        option_counts = np.diff(option_ends, prepend=0)
+        option_owners = np.repeat(np.arange(count), option_counts)
+
+        # Khóa giống raw_id của get_fingerprint ("nội dung|lựa chọn 1lựa chọn 2..."): xếp nội dung
+        # và lựa chọn đã chuẩn hóa xen kẽ theo từng câu, nối một lần rồi tách theo "\n"
+        norm_texts = TextNormalizer.normalize_column(batch.texts) + "|"
+        norm_texts[1:] = "\n" + norm_texts[1:]
+        parts = np.empty(count + len(batch.option_values), dtype=object)
+        parts[np.arange(count) + option_ends - option_counts] = norm_texts
+        parts[np.arange(len(batch.option_values)) + option_owners + 1] = \
+            TextNormalizer.normalize_column(batch.option_values)
+        codes, unique_keys = factorize_strings("".join(parts.tolist()).split("\n"))
+        digest = self._digest
+        fingerprints = [digest(key) for key in unique_keys]
+
+        # Nhóm đã biết từ trước lô này (phiên hiện tại hoặc store)
+        known = np.fromiter((fp in self.fingerprint_map or fp in self._known for fp in fingerprints),
+                            dtype=bool, count=len(fingerprints))
+        if self.store is not None:
+            found = self.store.contains_many(fp for fp, seen in zip(fingerprints, known) if not seen)
+            if found:
+                self._known.update(found)
+                known |= np.fromiter((fp in found for fp in fingerprints),
+                                     dtype=bool, count=len(fingerprints))
+
+        # Câu mới: lần xuất hiện đầu tiên của một nhóm chưa biết; mọi câu còn lại là trùng lặp
+        is_new = ~known[codes] & ~pd.Series(codes).duplicated().to_numpy()
+        new_rows = np.flatnonzero(is_new)
+        new_fingerprints = [fingerprints[code] for code in codes[new_rows].tolist()]
+
+        texts = batch.texts
+        if self.policy == 'allow':
+            keep = np.ones(count, dtype=bool)
+        elif self.policy == 'append':
+            keep = np.ones(count, dtype=bool)
+            texts = list(texts)
+            # Như add_question: câu mới trong lô chỉ được biết kể từ dòng của nó
+            first_row = dict(zip(new_fingerprints, new_rows.tolist()))
+            current = 0
+
+            def is_known(fingerprint):
+                row = first_row.get(fingerprint)
+                if row is not None:
+                    return row < current
+                return self._is_known(fingerprint)
+
+            for current in np.flatnonzero(~is_new).tolist():
+                texts[current] = self._append_suffix(batch.texts[current], batch.options_at(current),
+                                                     fingerprints[codes[current]], is_known)
+        else:
+            keep = is_new
+
+        if self.compact:
+            for fingerprint in new_fingerprints:
+                self.fingerprint_map[fingerprint] = len(self.fingerprint_map)
+        else:
+            self.fingerprint_map.update(
+                (fingerprint, (batch.texts[row], batch.options_at(row)))
+                for fingerprint, row in zip(new_fingerprints, new_rows.tolist())
+            )
+        if self.store is not None:
+            self.store.add_many(new_fingerprints)
+
+        kept_rows = np.flatnonzero(keep)
+        option_values = np.empty(len(batch.option_values), dtype=object)
+        option_values[:] = batch.option_values
+        return QuestionBatch.from_columns(
+            [texts[row] for row in kept_rows.tolist()],
+            option_values[keep[option_owners]].tolist(),
+            np.cumsum(option_counts[kept_rows]).tolist(),
+        )
+
+    def flush(self, workbook_path=None):
+        """
+        Ghi các fingerprint mới xuống store (gọi sau khi xuất Excel thành công).
+        workbook_path: workbook vừa ghi; kích thước/mtime của nó được lưu để lần
+        bootstrap_from_workbook sau nhận ra workbook đã bị xóa hoặc thay.
+        """
+        if self.store is not None:
+            self.store.flush()
+            if workbook_path is not None:
+                self.store.set_meta(WORKBOOK_STATE_KEY, _workbook_state(workbook_path))
+        self._committed = len(self.fingerprint_map)
+
+    def discard_pending(self):
+        """
+        Hoàn tác các câu hỏi đã thêm từ lần flush gần nhất (xuất lỗi hoặc bị hủy),
+        cả trong bộ nhớ lẫn các fingerprint chưa ghi xuống store.
+        """
+        if self.store is not None:
+            self.store.discard_pending()
+        
+        added = len(self.fingerprint_map) - self._committed
+        if added <= 0:
+            return
+        if self.compact:
+            self.fingerprint_map.discard_from(self._committed)
+        else:
+            for _ in range(added):
+                self.fingerprint_map.popitem()  # dict giữ thứ tự thêm: bỏ các câu mới nhất
+        if self.near_index is not None:
+            self.near_index.discard_from(self._committed)
+        # Hậu tố nhỏ nhất còn trống có thể đã được giải phóng: tính lại khi cần
+        self._next_suffix.clear()
+
+    def bootstrap_from_workbook(self, workbook_path, start_row=3):
+        """
+        Nạp fingerprint từ workbook có sẵn vào store. Chỉ chạy lại khi workbook
+        đã khác lần flush gần nhất (bị xóa, bị thay hoặc sửa bên ngoài): khi đó
+        fingerprint cũ (trong store và trong phiên này) bị bỏ và nạp lại từ workbook.
+        Workbook được mở ở chế độ read-only, fingerprint được ghi theo lô.
+        """
+        if self.store is None:
+            return 0
+        state = _workbook_state(workbook_path)
+        if self.store.get_meta('bootstrapped_from'):
+            if self.store.get_meta(WORKBOOK_STATE_KEY) == state:
+                return 0
+            self.logger.info(f"{workbook_path} changed since the last export, rebuilding fingerprints")
+            self._forget_all()
+        if not state:
+            # Workbook chưa tồn tại: store và workbook cùng bắt đầu từ rỗng
+            self._mark_bootstrapped(workbook_path, state)
+            return 0
+        
+        from openpyxl import load_workbook
+        
+        wb = load_workbook(workbook_path, read_only=True)
+        try:
+            if "Questions" not in wb.sheetnames:
+                return 0
+            ws = wb["Questions"]
+            
+            count = 0
+            batch = []
+            for row in ws.iter_rows(min_row=start_row, max_col=6, values_only=True):
+                if not row or row[0] is None:
+                    continue
+                options = [str(opt) if opt is not None else "" for opt in row[2:6]]
+                batch.append(self.get_fingerprint(str(row[0]), options))
+                if len(batch) >= 5000:
+                    self.store.add_many(batch)
+                    self.store.flush()
+                    count += len(batch)
+                    batch = []
+            self.store.add_many(batch)
+            self.store.flush()
+            count += len(batch)
+        finally:
+            wb.close()
+        
+        self._mark_bootstrapped(workbook_path, state)
+        self.logger.info(f"Bootstrapped {count} fingerprints from {workbook_path}")
+        return count
+
+    def _mark_bootstrapped(self, workbook_path, state):
+        self.store.set_meta('bootstrapped_from', os.path.abspath(workbook_path))
+        self.store.set_meta(WORKBOOK_STATE_KEY, state)
+
+    def _forget_all(self):
+        """Bỏ mọi fingerprint đã biết: cả store lẫn các câu đã thêm trong phiên này"""
+        self.store.clear()
+        self._known.clear()
+        self._next_suffix.clear()
+        self._committed = 0
+        self.discard_pending()
 
     def merge_options(self, existing_options, new_options):
         """
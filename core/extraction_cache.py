@@ -0,0 +1,239 @@
+# core/extraction_cache.py
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+
+from .question import QuestionBatch
+
+CACHE_ENV = "QE_EXTRACTION_CACHE"  # Thư mục cache; đặt QE_EXTRACTION_CACHE=0 để tắt
+DEFAULT_CACHE_DIR = ".extraction_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+ENTRY_SUFFIX = ".qec"
+
+_MAGIC = b"QEC2"
+_HEADER = struct.Struct("<III")  # số câu hỏi, số chuỗi, số ký tự của blob
+_READ_BLOCK = 1 << 20
+
+def _little_endian(values):
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+def encode_questions(questions):
+    """
+    Định dạng nhị phân gọn (theo cột như QuestionBatch): header + số lựa chọn mỗi câu
+    + số thứ tự câu + độ dài (theo ký tự) từng chuỗi + toàn bộ nội dung câu hỏi rồi
+    toàn bộ lựa chọn nối liền dạng UTF-8 (surrogatepass như key_for_text), nén zlib.
+    """
+    batch = QuestionBatch.from_questions(questions)
+    previous = 0
+    option_counts = array("B")
+    for end in batch.option_ends:
+        option_counts.append(end - previous)
+        previous = end
+    lengths = array("I", map(len, batch.texts))
+    lengths.extend(map(len, batch.option_values))
+    blob = "".join(batch.texts) + "".join(batch.option_values)
+
+    body = b"".join((
+        _HEADER.pack(len(batch), len(lengths), len(blob)),
+        option_counts.tobytes(),
+        _little_endian(array("q", batch.numbers)).tobytes(),
+        _little_endian(lengths).tobytes(),
+        blob.encode("utf-8", "surrogatepass"),
+    ))
+    return _MAGIC + zlib.compress(body, 1)
+
+def decode_questions(data):
+    """Ngược lại của encode_questions, trả về QuestionBatch; ValueError nếu dữ liệu hỏng"""
+    if data[:len(_MAGIC)] != _MAGIC:
+        raise ValueError("not an extraction cache entry")
+    try:
+        body = zlib.decompress(data[len(_MAGIC):])
+    except zlib.error as e:
+        raise ValueError(str(e)) from e
+
+    count, string_count, blob_chars = _HEADER.unpack_from(body)
+    offset = _HEADER.size
+    option_counts = array("B", body[offset:offset + count])
+    offset += count
+    numbers = array("q")
+    numbers.frombytes(body[offset:offset + 8 * count])
+    offset += 8 * count
+    lengths = array("I")
+    lengths.frombytes(body[offset:offset + 4 * string_count])
+    offset += 4 * string_count
+    blob = body[offset:].decode("utf-8", "surrogatepass")
+    _little_endian(numbers)
+    _little_endian(lengths)
+    if (len(option_counts) != count or len(lengths) != string_count
+            or len(blob) != blob_chars or sum(option_counts) + count != string_count):
+        raise ValueError("truncated extraction cache entry")
+
+    batch = QuestionBatch()
+    position = 0
+    for length in lengths[:count]:
+        batch.texts.append(blob[position:position + length])
+        position += length
+    for length in lengths[count:]:
+        batch.option_values.append(blob[position:position + length])
+        position += length
+    end = 0
+    for option_count in option_counts:
+        end += option_count
+        batch.option_ends.append(end)
+    batch.numbers = numbers
+    return batch
+
+
+class ExtractionCache:
+    """
+    Cache kết quả trích xuất trên đĩa, đánh địa chỉ theo nội dung:
+    khóa là blake2b của đầu vào cộng phiên bản bộ trích xuất, nên đổi cách
+    trích xuất (tăng version) sẽ tự bỏ qua các mục cũ. Mỗi mục là một file;
+    lần đọc trúng cập nhật mtime, khi vượt max_bytes thì xóa các mục lâu
+    không dùng nhất (LRU).
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, version="1", max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.version = str(version)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls, version, max_bytes=DEFAULT_MAX_BYTES):
+        """Cache ở thư mục QE_EXTRACTION_CACHE (mặc định .extraction_cache), None nếu bị tắt"""
+        directory = os.environ.get(CACHE_ENV, DEFAULT_CACHE_DIR)
+        if directory in ("", "0"):
+            return None
+        try:
+            return cls(directory, version=version, max_bytes=max_bytes)
+        except OSError:
+            return None
+
+    def _new_hash(self, kind):
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{self.version}\0{kind}\0".encode("utf-8"))
+        return digest
+
+    def key_for_text(self, text):
+        digest = self._new_hash("text")
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def key_for_file(self, path):
+        """Khóa theo nội dung file (không theo tên/đường dẫn); loại file nằm trong khóa"""
+        digest = self._new_hash(os.path.splitext(path)[1].lower())
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_READ_BLOCK), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        """QuestionBatch đã lưu, None nếu chưa có (mục hỏng bị xóa)"""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            questions = decode_questions(data)
+        except (ValueError, struct.error):
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # Đánh dấu vừa dùng cho LRU
+        except OSError:
+            pass
+        self.hits += 1
+        return questions
+
+    def put(self, key, questions):
+        """Ghi mục mới (ghi file tạm rồi đổi tên); trả về False nếu không ghi được"""
+        try:
+            data = encode_questions(questions)
+        except (OverflowError, struct.error):
+            return False
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self._entry_path(key))
+        except OSError:
+            self._remove(temp_path)
+            return False
+        self.evict()
+        return True
+
+    def iter_through(self, key, questions):
+        """
+        Chuyển tiếp câu hỏi từ iterator trích xuất và lưu vào cache khi đã đọc hết.
+        Toàn bộ kết quả được giữ (theo cột) trong bộ nhớ cho đến lúc đó.
+        Nếu bị dừng giữa chừng (hủy, lỗi) thì không lưu gì.
+        """
+        collected = QuestionBatch()
+        for question in questions:
+            collected.append_question(question)
+            yield question
+        self.put(key, collected)
+
+    def _entries(self):
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(ENTRY_SUFFIX):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Xóa các mục ít dùng gần đây nhất cho đến khi tổng dung lượng <= max_bytes"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                total -= size
+                removed += 1
+        return removed
+
+    def clear(self):
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        if not path:
+            return False
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
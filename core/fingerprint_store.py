@@ -0,0 +1,105 @@
+# core/fingerprint_store.py
+import os
+import sqlite3
+import threading
+
+STORE_SUFFIX = ".fingerprints.sqlite"
+_BATCH_SIZE = 500  # Giới hạn số tham số của một câu lệnh SQLite
+
+class FingerprintStore:
+    """
+    Lưu fingerprint câu hỏi xuống SQLite để phát hiện trùng lặp giữa các lần chạy.
+    Fingerprint mới được gom lại trong bộ nhớ và ghi theo lô khi gọi flush().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = set()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints (fp TEXT PRIMARY KEY) WITHOUT ROWID"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self.conn.commit()
+
+    @classmethod
+    def for_workbook(cls, workbook_path):
+        """Store nằm cạnh workbook: TrachNG_CN.xlsx -> TrachNG_CN.fingerprints.sqlite"""
+        return cls(os.path.splitext(workbook_path)[0] + STORE_SUFFIX)
+
+    def __contains__(self, fp):
+        if fp in self._pending:
+            return True
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM fingerprints WHERE fp = ?", (fp,)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self._lock:
+            count = self.conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+        return count + len(self._pending)
+
+    def contains_many(self, fps):
+        """Trả về tập các fingerprint đã có trong store (tra cứu theo lô)"""
+        fps = list(dict.fromkeys(fps))
+        found = {fp for fp in fps if fp in self._pending}
+        with self._lock:
+            for i in range(0, len(fps), _BATCH_SIZE):
+                batch = fps[i:i + _BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT fp FROM fingerprints WHERE fp IN ({placeholders})", batch
+                )
+                found.update(row[0] for row in rows)
+        return found
+
+    def add(self, fp):
+        self._pending.add(fp)
+
+    def add_many(self, fps):
+        self._pending.update(fps)
+
+    def flush(self):
+        """Ghi các fingerprint đang chờ xuống đĩa trong một transaction"""
+        if not self._pending:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, set()
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO fingerprints (fp) VALUES (?)",
+                    ((fp,) for fp in pending)
+                )
+
+    def clear(self):
+        """Xóa mọi fingerprint (kể cả đang chờ) và meta, chỉ giữ loại fingerprint"""
+        with self._lock, self.conn:
+            self._pending.clear()
+            self.conn.execute("DELETE FROM fingerprints")
+            self.conn.execute("DELETE FROM meta WHERE key != 'fingerprint_kind'")
+
+    def discard_pending(self):
+        """Bỏ các fingerprint chưa ghi (ví dụ khi xuất Excel thất bại)"""
+        self._pending.clear()
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+            )
+
+    def close(self):
+        self.flush()
+        self.conn.close()
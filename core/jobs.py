@@ -0,0 +1,99 @@
+# core/jobs.py
+import threading
+import time
+
+class JobCancelled(Exception):
+    """Công việc bị người dùng hủy"""
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Gọi định kỳ trong vòng lặp của công việc; ném JobCancelled nếu đã bị hủy"""
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class ProgressThrottle:
+    """
+    Giới hạn số thông báo tiến độ gửi về giao diện: vòng lặp gọi due() cho mỗi
+    phần tử (rất rẻ) và chỉ tính toán + report() khi đã qua ít nhất interval giây.
+    """
+
+    def __init__(self, post, interval=0.1, clock=time.monotonic):
+        self.post = post
+        self.interval = interval
+        self.clock = clock
+        self._last = float('-inf')
+
+    def due(self):
+        return self.clock() - self._last >= self.interval
+
+    def report(self, percent=None, status=None):
+        """Gửi ngay (không kiểm tra interval), dùng cho các mốc quan trọng"""
+        self._last = self.clock()
+        if percent is not None:
+            self.post('progress', percent)
+        if status is not None:
+            self.post('status', status)
+
+
+class JobRunner:
+    """
+    Chạy tối đa một công việc nền tại một thời điểm.
+    target(token, *args) chạy trong thread riêng; post('job_started', None) và
+    post('job_finished', 'ok' | 'cancelled' | 'error') được gửi qua hàng đợi giao diện.
+    """
+
+    def __init__(self, post):
+        self.post = post
+        self._lock = threading.Lock()
+        self._active = False
+        self._token = None
+
+    @property
+    def busy(self):
+        return self._active
+
+    def start(self, target, *args):
+        """Trả về False nếu đang có công việc khác chạy"""
+        with self._lock:
+            if self._active:
+                return False
+            self._active = True
+            self._token = CancelToken()
+            token = self._token
+
+        self.post('job_started', None)
+        thread = threading.Thread(target=self._run, args=(target, token, args), daemon=True)
+        thread.start()
+        return True
+
+    def cancel(self):
+        """Yêu cầu hủy công việc đang chạy (công việc tự dừng ở lần check() kế tiếp)"""
+        with self._lock:
+            if not self._active:
+                return False
+            self._token.cancel()
+            return True
+
+    def _run(self, target, token, args):
+        status = 'error'
+        try:
+            target(token, *args)
+            status = 'ok'
+        except JobCancelled:
+            status = 'cancelled'
+        finally:
+            with self._lock:
+                self._active = False
+            self.post('job_finished', status)
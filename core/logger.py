@@ -1,34 +1,123 @@
 # core/logger.py
+import atexit
+import json
 import logging
-import os
+import queue
+import sys
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '[%(asctime)s] [%(levelname)s] %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+MAX_LOG_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+DEFAULT_LOG_FILE = "export_log.txt"
+
+# Listener ghi log dùng chung cho cả process: cấu hình của Logger đầu tiên được giữ nguyên
+_listener = None
+_listener_lock = threading.Lock()
+
+class _DeferredQueueHandler(QueueHandler):
+    """Đưa bản ghi vào hàng đợi nguyên trạng; việc định dạng do thread listener làm"""
+
+    def prepare(self, record):
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Mỗi bản ghi là một dòng JSON, kèm các trường thêm truyền qua Logger.info(..., **fields)"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _build_handlers(log_file, json_log_file, max_bytes, backup_count):
+    handlers = []
+    if log_file:
+        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count,
+                                           encoding='utf-8', delay=True)
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+        handlers.append(file_handler)
+    if json_log_file:
+        json_handler = RotatingFileHandler(json_log_file, maxBytes=max_bytes, backupCount=backup_count,
+                                           encoding='utf-8', delay=True)
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
+    if sys.stderr is not None:  # pythonw không có console
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+        handlers.append(console)
+    return handlers
+
+def _stop_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()  # Ghi nốt các bản ghi còn trong hàng đợi
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
 
 class Logger:
-    def __init__(self, log_file="export_log.txt"):
+    """
+    Ghi log không chặn: bản ghi chỉ được đưa vào hàng đợi, một thread nền
+    (QueueListener) ghi ra file xoay vòng, console và file JSON-lines (nếu có).
+    Mọi Logger trong process dùng chung một listener.
+    """
+
+    _shared = None
+
+    def __init__(self, log_file=DEFAULT_LOG_FILE, json_log_file=None,
+                 max_bytes=MAX_LOG_BYTES, backup_count=LOG_BACKUP_COUNT):
         self.log_file = log_file
+        self.json_log_file = json_log_file
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
         self.setup_logger()
-    
+
+    @classmethod
+    def shared(cls):
+        """Logger mặc định dùng chung cho cả process"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
     def setup_logger(self):
-        logging.basicConfig(
-            level=logging.INFO,
-            format='[%(asctime)s] [%(levelname)s] %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S',
-            handlers=[
-                logging.FileHandler(self.log_file, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        global _listener
         self.logger = logging.getLogger(__name__)
-    
-    def info(self, message):
-        self.logger.info(message)
-    
-    def warning(self, message):
-        self.logger.warning(message)
-    
-    def error(self, message):
-        self.logger.error(message)
-    
+        with _listener_lock:
+            if _listener is not None:
+                return
+            log_queue = queue.SimpleQueue()
+            handlers = _build_handlers(self.log_file, self.json_log_file,
+                                       self.max_bytes, self.backup_count)
+            _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            _listener.start()
+
+            self.logger.handlers = [_DeferredQueueHandler(log_queue)]
+            self.logger.setLevel(logging.INFO)
+            self.logger.propagate = False
+        atexit.register(_stop_listener)
+
+    def info(self, message, **fields):
+        self.logger.info(message, extra={'fields': fields})
+
+    def warning(self, message, **fields):
+        self.logger.warning(message, extra={'fields': fields})
+
+    def error(self, message, **fields):
+        self.logger.error(message, extra={'fields': fields})
+
     def log_export_stats(self, stats):
         self.info(f"Export completed: {stats['written']} written, "
-                  f"{stats['skipped']} skipped, {stats['merged']} merged")
\ No newline at end of file
+                  f"{stats['skipped']} skipped, {stats['merged']} merged",
+                  event='export_stats', **stats)
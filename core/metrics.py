@@ -0,0 +1,108 @@
+# core/metrics.py
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+METRICS_ENV = "QE_METRICS"  # Đặt QE_METRICS=1 để bật đo đạc
+METRICS_FILE_PREFIX = "export_metrics"
+
+_NULL_STAGE = nullcontext()
+
+def peak_rss_mb():
+    """Peak RSS của process hiện tại (MB), None nếu không đo được"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux trả về KB, macOS trả về byte
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class _Stage:
+    __slots__ = ('metrics', 'name', 'started')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.add_time(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class Metrics:
+    """
+    Bộ đếm và đồng hồ cho từng giai đoạn của một lần xuất.
+    Khi tắt, stage() trả về context rỗng dùng chung và count() thoát ngay nên gần như không tốn chi phí.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.stages = {}    # tên -> [tổng giây, số lần]
+        self.counters = {}
+
+    @classmethod
+    def from_env(cls):
+        return cls(enabled=os.environ.get(METRICS_ENV, "") not in ("", "0"))
+
+    def stage(self, name):
+        """Context manager cộng dồn thời gian của giai đoạn name"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def add_time(self, name, seconds):
+        """Cộng thời gian đo ở nơi khác (vd. trong worker) vào giai đoạn name"""
+        if self.enabled:
+            totals = self.stages.setdefault(name, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self):
+        wall = time.perf_counter() - self._started
+        questions = self.counters.get('questions_extracted', 0)
+        input_bytes = self.counters.get('input_bytes', 0)
+        return {
+            'started': self.started_at.isoformat(timespec='seconds'),
+            'wall_ms': round(wall * 1000, 1),
+            'questions_per_sec': round(questions / wall, 1) if wall else None,
+            'bytes_per_sec': round(input_bytes / wall, 1) if wall else None,
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': {
+                name: {'ms': round(seconds * 1000, 1), 'calls': calls}
+                for name, (seconds, calls) in self.stages.items()
+            },
+            'counters': dict(self.counters),
+        }
+
+    def write_report(self, directory="."):
+        """Ghi báo cáo JSON của lần chạy; trả về đường dẫn hoặc None nếu đang tắt"""
+        if not self.enabled:
+            return None
+        stamp = self.started_at.strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(directory or ".", f"{METRICS_FILE_PREFIX}_{stamp}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+NULL_METRICS = Metrics(enabled=False)
@@ -1,5 +1,32 @@
 #core/normalizer.py
 import re
+from functools import lru_cache
+
+_TRIPLE_DOT_PATTERN = re.compile(r'\.\s*\.\s*\.')
+_DOUBLE_DOT_PATTERN = re.compile(r'\.\s*\.')
+_ELLIPSIS_PATTERN = re.compile(r'\.\.\.')
+_PUNCTUATION_PATTERN = re.compile(r'[^\w\s]+')
+# Dùng cho TextNormalizer.normalize_column (các chuỗi nối với nhau bằng "\n"):
+# dấu câu ASCII bị xóa, khoảng trắng ASCII (trừ "\n") đổi thành " "
+_ASCII_BYTES = bytes(range(128))
+_ASCII_PUNCTUATION = bytes(c for c in range(128) if _PUNCTUATION_PATTERN.match(chr(c)))
+_ASCII_SPACE_TABLE = bytes(32 if c < 128 and chr(c).isspace() and c != 10 else c for c in range(256))
+_QUESTION_PREFIX_PATTERN = re.compile(r'^Câu\s*\d+[\.:\)]\s*', re.IGNORECASE)
+
+def factorize_strings(values):
+    """
+    (codes, uniques) như pandas.factorize nhưng so sánh đúng như str của Python
+    (pandas gộp nhầm các chuỗi chứa surrogate lẻ). codes là numpy array, uniques theo
+    thứ tự xuất hiện đầu tiên nên code của một nhóm luôn lớn hơn các nhóm xuất hiện trước.
+    """
+    import numpy as np
+    
+    if not isinstance(values, list):
+        values = list(values)
+    uniques = list(dict.fromkeys(values))
+    index = {value: code for code, value in enumerate(uniques)}
+    codes = np.fromiter(map(index.__getitem__, values), dtype=np.intp, count=len(values))
+    return codes, uniques
 
 class TextNormalizer:
     @staticmethod
@@ -7,39 +34,85 @@ class TextNormalizer:
         """Chuẩn hóa dấu ba chấm"""
         if not text:
             return ""
-        
-        text = re.sub(r'\.\s*\.\s*\.', '.', text)  
-        text = re.sub(r'\.\s*\.', '.', text)      
-        text = re.sub(r'\.\.\.', '.', text)     
-        text = re.sub(r'\s+', ' ', text)        
-        
-        return text.strip()
-    
+
+        if '.' in text:
+            text = _TRIPLE_DOT_PATTERN.sub('.', text)
+            text = _DOUBLE_DOT_PATTERN.sub('.', text)
+            # Vẫn có thể còn "..." (vd. chuỗi 11 dấu chấm), giữ đúng lần thay thứ ba như cũ
+            text = _ELLIPSIS_PATTERN.sub('.', text)
+
+        # str.split() dùng cùng định nghĩa khoảng trắng với \s
+        return ' '.join(text.split())
+
     @staticmethod
+    @lru_cache(maxsize=8192)
     def normalize_text(text):
-        """Chuẩn hóa văn bản để tạo fingerprint"""
+        """Chuẩn hóa văn bản để tạo fingerprint (có cache cho chuỗi lặp lại)"""
         if not text:
             return ""
+
+        text = _PUNCTUATION_PATTERN.sub('', text.lower())
+
+        return ' '.join(text.split())
+
+    @staticmethod
+    def normalize_many(texts):
+        """Chuẩn hóa một danh sách văn bản, mỗi chuỗi khác nhau chỉ xử lý một lần"""
+        seen = {}
+        result = []
+        for text in texts:
+            normalized = seen.get(text)
+            if normalized is None:
+                normalized = seen[text] = TextNormalizer.normalize_text(text)
+            result.append(normalized)
+        return result
+
+    @staticmethod
+    def normalize_column(values):
+        """
+        normalize_text cho cả một cột (list chuỗi, None coi như rỗng), vector hóa:
+        các chuỗi khác nhau (factorize_strings) được nối bằng "\n" thành một chuỗi lớn,
+        lower / bỏ dấu câu / gộp khoảng trắng chạy trên cả chuỗi đó (bytes.translate,
+        str.replace) rồi tách lại. Kết quả giống hệt normalize_text từng chuỗi.
+        Trả về numpy array kiểu object cùng độ dài.
+        """
+        import numpy as np
         
-        text = text.lower()
+        codes, uniques = factorize_strings(values)
+        if not uniques:
+            return np.empty(0, dtype=object)
+        # "\n" là dấu phân cách: trong từng chuỗi nó chỉ là khoảng trắng nên đổi thành " "
+        uniques = [(text.replace('\n', ' ') if '\n' in text else text) if text else ""
+                   for text in uniques]
+        blob = '\n'.join(uniques).lower()
         
-        text = re.sub(r'[^\w\s]', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        # Ký tự ngoài ASCII: chỉ vài loại dấu câu/khoảng trắng khác nhau, thay từng loại trên cả chuỗi
+        non_ascii = blob.encode('utf-8', 'surrogatepass').translate(None, _ASCII_BYTES)
+        for char in set(non_ascii.decode('utf-8', 'surrogatepass')):
+            if _PUNCTUATION_PATTERN.match(char):
+                blob = blob.replace(char, '')
+            elif char.isspace():
+                blob = blob.replace(char, ' ')
         
-        return text
-    
+        # Ký tự ASCII: bảng 256 byte (byte của ký tự nhiều byte trong UTF-8 luôn >= 0x80)
+        data = blob.encode('utf-8', 'surrogatepass').translate(_ASCII_SPACE_TABLE, _ASCII_PUNCTUATION)
+        while b'  ' in data:
+            data = data.replace(b'  ', b' ')
+        data = data.replace(b' \n', b'\n').replace(b'\n ', b'\n').strip(b' ')
+        
+        pieces = np.empty(len(uniques), dtype=object)
+        pieces[:] = data.decode('utf-8', 'surrogatepass').split('\n')
+        return pieces.take(codes)
+
     @staticmethod
     def clean_question_text(text):
         """Làm sạch nội dung câu hỏi"""
-        text = re.sub(r'^Câu\s*\d+[\.:\)]\s*', '', text, flags=re.IGNORECASE)
-        
-        text = TextNormalizer.normalize_dots(text)
-        
-        return text.strip()
-    
+        text = _QUESTION_PREFIX_PATTERN.sub('', text)
+
+        return TextNormalizer.normalize_dots(text)
+
     @staticmethod
     def clean_option_text(text):
         """Làm sạch nội dung lựa chọn"""
 
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        return ' '.join(text.split())
@@ -0,0 +1,158 @@
+# core/pipeline.py
+import queue
+import threading
+import time
+
+from .metrics import NULL_METRICS
+
+_END = object()  # Đánh dấu hết dữ liệu trong hàng đợi
+_POLL_SECONDS = 0.1
+
+class PipelineStopped(Exception):
+    """Một giai đoạn khác đã lỗi hoặc bị hủy, giai đoạn hiện tại dừng theo"""
+
+
+class ExportPipeline:
+    """
+    Trích xuất → khử trùng lặp → ghi Excel chạy chồng lên nhau.
+    Giai đoạn trích xuất và khử trùng lặp mỗi cái một thread, giai đoạn ghi chạy
+    ở thread gọi run(); giữa các giai đoạn là hàng đợi có giới hạn (theo lô câu hỏi)
+    nên giai đoạn nhanh phải chờ giai đoạn chậm. Giới hạn maxsize * batch_size câu
+    mỗi hàng đợi chỉ áp dụng cho dữ liệu đang chuyển giữa các giai đoạn: những gì
+    nguồn, on_batch hay write tự giữ lại (vd. danh sách câu hỏi cho bảng xem trước,
+    ExtractionCache.iter_through) vẫn tăng theo số câu hỏi.
+    """
+
+    def __init__(self, deduplicator, maxsize=8, batch_size=256, token=None,
+                 metrics=None, progress=None):
+        self.deduplicator = deduplicator
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.token = token  # core.jobs.CancelToken (tùy chọn)
+        self.metrics = metrics or NULL_METRICS
+        self.progress = progress  # progress(số câu đã trích xuất, số câu đã khử trùng lặp)
+        self.stats = {'extracted': 0, 'written': 0, 'skipped': 0}
+        self._stop = threading.Event()
+        self._error = None
+
+    def _fail(self, error):
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _check(self):
+        if self._stop.is_set():
+            raise PipelineStopped()
+        if self.token is not None:
+            self.token.check()
+
+    def _put(self, q, item):
+        """put có giới hạn nhưng vẫn thoát được khi giai đoạn sau đã dừng"""
+        while True:
+            self._check()
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q):
+        while True:
+            self._check()
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+    def _extract_stage(self, source, out):
+        try:
+            busy = 0.0
+            batch = []
+            iterator = iter(source)
+            while True:
+                started = time.perf_counter()
+                question = next(iterator, _END)
+                busy += time.perf_counter() - started
+                if question is _END:
+                    break
+                if not question:
+                    continue
+                batch.append(question)
+                if len(batch) >= self.batch_size:
+                    self._put(out, batch)
+                    batch = []
+            if batch:
+                self._put(out, batch)
+            self._put(out, _END)
+            self.metrics.add_time('extract', busy)
+        except BaseException as e:
+            self._fail(e)
+
+    def _dedup_stage(self, inp, out):
+        try:
+            busy = 0.0
+            add_batch = self.deduplicator.add_batch
+            while True:
+                batch = self._get(inp)
+                if batch is _END:
+                    break
+                started = time.perf_counter()
+                kept = add_batch(batch)  # QuestionBatch các câu được giữ lại
+                busy += time.perf_counter() - started
+
+                self.stats['extracted'] += len(batch)
+                self.stats['written'] += len(kept)
+                self.stats['skipped'] += len(batch) - len(kept)
+                if kept:
+                    self._put(out, kept)
+                if self.progress:
+                    self.progress(self.stats['extracted'], self.stats['written'])
+            self._put(out, _END)
+            self.metrics.add_time('dedup', busy)
+        except BaseException as e:
+            self._fail(e)
+
+    def _iter_output(self, inp, on_batch):
+        while True:
+            batch = self._get(inp)
+            if batch is _END:
+                return
+            if on_batch:
+                on_batch(batch)
+            yield from batch
+
+    def run(self, source, write, on_batch=None):
+        """
+        source: iterable các câu hỏi thô (vd. TextProcessor.iter_questions), được đọc ở thread trích xuất.
+        write(iterable): ghi các câu hỏi đã khử trùng lặp theo dạng luồng, chạy ở thread hiện tại.
+        on_batch(batch): gọi cho mỗi QuestionBatch (các câu đã khử trùng lặp) được đưa sang giai đoạn ghi;
+        nếu on_batch gom lại các lô thì toàn bộ kết quả nằm trong bộ nhớ.
+        Trả về kết quả của write. Lỗi (hoặc JobCancelled) ở bất kỳ giai đoạn nào
+        dừng cả pipeline và được ném lại tại đây, trước khi write hoàn tất.
+        """
+        extracted = queue.Queue(self.maxsize)
+        deduped = queue.Queue(self.maxsize)
+        threads = [
+            threading.Thread(target=self._extract_stage, args=(source, extracted), daemon=True),
+            threading.Thread(target=self._dedup_stage, args=(extracted, deduped), daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        result = None
+        try:
+            with self.metrics.stage('write'):
+                result = write(self._iter_output(deduped, on_batch))
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            # Các giai đoạn đã kết thúc nếu write đọc hết dữ liệu; nếu chưa thì cho chúng dừng
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+        if self._error is not None:
+            if isinstance(self._error, PipelineStopped):
+                raise RuntimeError("write() returned before consuming all questions")
+            raise self._error
+        return result
@@ -0,0 +1,161 @@
+# core/question.py
+from array import array
+
+QUESTION_FIELDS = ('question_text', 'options', 'question_number')
+_NO_NUMBER = -1  # question_number = None trong QuestionBatch.numbers
+
+class Question:
+    """
+    Một câu hỏi đã trích xuất, gọn hơn dict (__slots__, options là tuple).
+    Vẫn đọc được như dict cũ: q['question_text'], q.get('question_number'), dict(q).
+    Bản ghi có thể được dùng chung (BlockCache, pipeline), không sửa tại chỗ.
+    """
+
+    __slots__ = QUESTION_FIELDS
+
+    def __init__(self, question_text, options, question_number=None):
+        self.question_text = question_text
+        self.options = tuple(options)
+        self.question_number = question_number
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        return cls(data['question_text'], data['options'], data.get('question_number'))
+
+    def __getitem__(self, key):
+        if key not in QUESTION_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in QUESTION_FIELDS else default
+
+    def keys(self):
+        return QUESTION_FIELDS
+
+    def __contains__(self, key):
+        return key in QUESTION_FIELDS
+
+    def to_dict(self):
+        return {'question_text': self.question_text, 'options': list(self.options),
+                'question_number': self.question_number}
+
+    def __eq__(self, other):
+        if not isinstance(other, Question):
+            return NotImplemented
+        return (self.question_text == other.question_text and self.options == other.options
+                and self.question_number == other.question_number)
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (Question, (self.question_text, self.options, self.question_number))
+
+    def __repr__(self):
+        return (f"Question(question_text={self.question_text!r}, options={self.options!r}, "
+                f"question_number={self.question_number!r})")
+
+
+class QuestionBatch:
+    """
+    Danh sách câu hỏi lưu theo cột: texts (list chuỗi), option_values (mọi lựa chọn
+    nối liền), option_ends (vị trí kết thúc lựa chọn của từng câu) và numbers.
+    Không có đối tượng riêng cho từng câu; batch[i] hoặc vòng lặp mới tạo Question,
+    còn rows() đọc thẳng các cột cho các bước chỉ cần (nội dung, lựa chọn).
+    """
+
+    __slots__ = ('texts', 'option_values', 'option_ends', 'numbers')
+
+    def __init__(self):
+        self.texts = []
+        self.option_values = []
+        self.option_ends = array('I')
+        self.numbers = array('q')
+
+    @classmethod
+    def from_questions(cls, questions):
+        """Từ QuestionBatch (trả lại nguyên), list/iterator các Question hoặc dict"""
+        if isinstance(questions, cls):
+            return questions
+        batch = cls()
+        batch.extend(questions)
+        return batch
+
+    @classmethod
+    def from_columns(cls, texts, option_values, option_ends, numbers=None):
+        """Dựng trực tiếp từ các cột; numbers mặc định là không có số thứ tự"""
+        batch = cls()
+        batch.texts = list(texts)
+        batch.option_values = list(option_values)
+        batch.option_ends.extend(option_ends)
+        batch.numbers.extend(numbers if numbers is not None else [_NO_NUMBER] * len(batch.texts))
+        return batch
+
+    def append(self, question_text, options, question_number=None):
+        self.texts.append(question_text)
+        self.option_values.extend(options)
+        self.option_ends.append(len(self.option_values))
+        self.numbers.append(_NO_NUMBER if question_number is None else question_number)
+
+    def append_question(self, question):
+        """Thêm một Question hoặc dict câu hỏi"""
+        self.append(question['question_text'], question['options'], question.get('question_number'))
+
+    def extend(self, questions):
+        if isinstance(questions, QuestionBatch):
+            offset = len(self.option_values)
+            self.texts.extend(questions.texts)
+            self.option_values.extend(questions.option_values)
+            self.option_ends.extend(end + offset for end in questions.option_ends)
+            self.numbers.extend(questions.numbers)
+            return
+        for question in questions:
+            self.append_question(question)
+
+    def clear(self):
+        self.texts.clear()
+        self.option_values.clear()
+        del self.option_ends[:]
+        del self.numbers[:]
+
+    def __len__(self):
+        return len(self.texts)
+
+    def options_at(self, index):
+        start = self.option_ends[index - 1] if index > 0 else 0
+        return tuple(self.option_values[start:self.option_ends[index]])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("QuestionBatch index out of range")
+        number = self.numbers[index]
+        return Question(self.texts[index], self.options_at(index),
+                        None if number == _NO_NUMBER else number)
+
+    def __iter__(self):
+        values = self.option_values
+        start = 0
+        for text, end, number in zip(self.texts, self.option_ends, self.numbers):
+            yield Question(text, values[start:end], None if number == _NO_NUMBER else number)
+            start = end
+
+    def rows(self):
+        """(question_text, options) cho từng câu, không tạo Question"""
+        values = self.option_values
+        start = 0
+        for text, end in zip(self.texts, self.option_ends):
+            yield text, values[start:end]
+            start = end
+
+
+def iter_rows(questions):
+    """(question_text, options) từ QuestionBatch, list/iterator các Question hoặc dict câu hỏi"""
+    if isinstance(questions, QuestionBatch):
+        return questions.rows()
+    return ((question['question_text'], question['options']) for question in questions)
@@ -0,0 +1,71 @@
+# core/search_index.py
+from bisect import bisect_right
+
+from .normalizer import TextNormalizer
+from .question import iter_rows
+
+class QuestionSearchIndex:
+    """
+    Chỉ mục tìm kiếm trên nội dung câu hỏi đã chuẩn hóa (TextNormalizer.normalize_text).
+    Toàn bộ văn bản chuẩn hóa được nối thành một chuỗi, mỗi lần tìm chỉ là các lần
+    str.find trên chuỗi đó rồi đổi vị trí sang số thứ tự câu bằng bisect.
+    Từ khóa nối tiếp từ khóa trước (gõ thêm ký tự) chỉ lọc lại trên kết quả cũ.
+    """
+
+    SEPARATOR = "\n"  # normalize_text không bao giờ giữ lại ký tự xuống dòng
+
+    def __init__(self, questions):
+        texts = TextNormalizer.normalize_many(text for text, _ in iter_rows(questions))
+        self.texts = texts
+        self._starts = []
+        position = 0
+        for text in texts:
+            self._starts.append(position)
+            position += len(text) + 1
+        self._blob = self.SEPARATOR.join(texts)
+        self._last_query = None
+        self._last_rows = None
+
+    def __len__(self):
+        return len(self.texts)
+
+    def _scan(self, word):
+        """Số thứ tự (tăng dần) các câu chứa word"""
+        rows = []
+        blob = self._blob
+        starts = self._starts
+        find = blob.find
+        pos = find(word)
+        while pos != -1:
+            row = bisect_right(starts, pos) - 1
+            rows.append(row)
+            # Bỏ qua phần còn lại của câu này
+            next_start = starts[row + 1] if row + 1 < len(starts) else len(blob)
+            pos = find(word, next_start)
+        return rows
+
+    def search(self, query):
+        """
+        Các câu chứa mọi từ trong query (không phân biệt hoa thường, dấu câu).
+        Trả về range khi query rỗng, ngược lại là list số thứ tự tăng dần.
+        """
+        words = TextNormalizer.normalize_text(query or "").split()
+        if not words:
+            self._last_query, self._last_rows = None, None
+            return range(len(self.texts))
+
+        normalized = " ".join(words)
+        if self._last_query is not None and normalized.startswith(self._last_query):
+            # Kết quả mới là tập con của kết quả trước
+            texts = self.texts
+            rows = [row for row in self._last_rows if all(word in texts[row] for word in words)]
+        else:
+            longest = max(words, key=len)
+            others = [word for word in words if word is not longest]
+            rows = self._scan(longest)
+            if others:
+                texts = self.texts
+                rows = [row for row in rows if all(word in texts[row] for word in others)]
+
+        self._last_query, self._last_rows = normalized, rows
+        return rows
@@ -0,0 +1,135 @@
+# document_reader.py
+import os
+import re
+from collections import Counter
+
+LARGE_FILE_THRESHOLD = 2 * 1024 * 1024  # File lớn hơn ngưỡng này không nạp vào ô nhập liệu
+
+# Dòng chỉ chứa số trang: "3", "- 3 -", "Trang 3", "3/20", "Page 3 of 20"
+_PAGE_NUMBER_PATTERN = re.compile(
+    r'^\s*(?:-\s*)?(?:(?:trang|page)\s*)?\d+(?:\s*(?:/|of)\s*\d+)?(?:\s*-)?\s*$', re.IGNORECASE
+)
+_DIGITS_PATTERN = re.compile(r'\d+')
+# Dòng mở đầu câu hỏi/đáp án không bao giờ bị coi là header/footer
+_CONTENT_LINE_PATTERN = re.compile(r'^(?:Câu\s*\d+|\d+\s*[.:)]|[a-dA-D][.:)])', re.IGNORECASE)
+
+# PdfReader của file đang đọc trong mỗi worker của pool (đặt bởi _init_pdf_worker).
+# Pool chỉ sống trong một lần gọi iter_pdf_pages nên reader không bị giữ lại sau đó.
+_worker_reader = None
+
+def _iter_block_text(parent_element, parent):
+    """Duyệt đoạn văn và ô bảng theo đúng thứ tự trong tài liệu (kể cả bảng lồng nhau)"""
+    from docx.oxml.ns import qn
+    from docx.text.paragraph import Paragraph
+
+    for child in parent_element.iterchildren():
+        if child.tag == qn('w:p'):
+            yield Paragraph(child, parent).text
+        elif child.tag == qn('w:tbl'):
+            for row in child.iterchildren(qn('w:tr')):
+                # Duyệt trực tiếp w:tc để ô gộp (merged) không bị lặp lại
+                for cell in row.iterchildren(qn('w:tc')):
+                    yield from _iter_block_text(cell, parent)
+
+def iter_docx_text(path):
+    """
+    Sinh lần lượt nội dung từng đoạn văn/ô bảng của file .docx (mỗi đoạn kèm xuống dòng).
+    Có thể đưa thẳng vào TextProcessor.iter_questions để trích xuất dạng luồng.
+    """
+    import docx
+
+    document = docx.Document(path)
+    for text in _iter_block_text(document.element.body, document):
+        yield text + "\n"
+
+def read_docx_text(path):
+    """Toàn bộ nội dung văn bản của file .docx"""
+    return "".join(iter_docx_text(path))
+
+def is_large_file(path, threshold=LARGE_FILE_THRESHOLD):
+    return os.path.getsize(path) > threshold
+
+def _init_pdf_worker(path):
+    global _worker_reader
+    from PyPDF2 import PdfReader
+
+    _worker_reader = PdfReader(path)
+
+def _extract_pdf_page(page_index):
+    """Worker: trích văn bản của một trang PDF"""
+    return _worker_reader.pages[page_index].extract_text() or ""
+
+def iter_pdf_pages(path, workers=None, progress=None):
+    """
+    Sinh văn bản từng trang PDF theo đúng thứ tự, các trang được trích song song
+    trong process pool. progress(done, total) được gọi sau mỗi trang.
+    """
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(path)
+    total = len(reader.pages)
+    workers = min(workers or os.cpu_count() or 1, total)
+    
+    if workers <= 1:
+        # Số trang và nội dung trang lấy từ cùng một reader
+        pages = (page.extract_text() or "" for page in reader.pages)
+        executor = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        reader = None
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_pdf_worker, initargs=(path,))
+        chunksize = max(1, total // (workers * 8))
+        pages = executor.map(_extract_pdf_page, range(total), chunksize=chunksize)
+    
+    try:
+        for done, text in enumerate(pages, start=1):
+            if progress:
+                progress(done, total)
+            yield text
+    finally:
+        reader = pages = None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+def _edge_lines(lines):
+    """Chỉ số dòng khác rỗng đầu tiên và cuối cùng của trang"""
+    indices = [i for i, line in enumerate(lines) if line.strip()]
+    if not indices:
+        return []
+    return sorted({indices[0], indices[-1]})
+
+def join_pdf_pages(pages):
+    """
+    Ghép các trang thành một văn bản, sửa lỗi câu hỏi bị cắt qua trang:
+    bỏ dòng số trang và header/footer lặp lại ở đầu/cuối trang để chúng không
+    bị dính vào nội dung câu hỏi hoặc đáp án nằm vắt qua hai trang.
+    """
+    page_lines = [page.splitlines() for page in pages]
+    
+    # Header/footer: dòng ở mép trang (bỏ qua chữ số) xuất hiện trên ít nhất một nửa số trang
+    edge_counts = Counter()
+    for lines in page_lines:
+        keys = {_DIGITS_PATTERN.sub('#', lines[i].strip()) for i in _edge_lines(lines)}
+        edge_counts.update(keys)
+    repeated = set()
+    if len(page_lines) >= 3:
+        repeated = {key for key, count in edge_counts.items() if count * 2 >= len(page_lines)}
+    
+    parts = []
+    for lines in page_lines:
+        drop = set()
+        for i in _edge_lines(lines):
+            line = lines[i].strip()
+            if _CONTENT_LINE_PATTERN.match(line):
+                continue
+            if _PAGE_NUMBER_PATTERN.match(line) or _DIGITS_PATTERN.sub('#', line) in repeated:
+                drop.add(i)
+        kept = [line for i, line in enumerate(lines) if i not in drop]
+        if kept:
+            parts.append("\n".join(kept))
+    return "\n".join(parts)
+
+def read_pdf_text(path, workers=None, progress=None):
+    """Toàn bộ văn bản PDF (đã ghép trang), sẵn sàng cho TextProcessor.extract_questions_from_text"""
+    return join_pdf_pages(iter_pdf_pages(path, workers=workers, progress=progress))
@@ -1,14 +1,120 @@
 # excel_handler.py
-import openpyxl
-from openpyxl import load_workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
+# openpyxl được import trong từng hàm để không làm chậm lúc khởi động giao diện
 import os
+import re
+import json
+import marshal
+from contextlib import contextmanager
 from datetime import datetime
+from core.metrics import NULL_METRICS
+from core.question import QuestionBatch, iter_rows
+
+COLUMN_WIDTHS = [60, 15, 40, 40, 40, 40, 15, 15, 30, 50]
+DATA_START_ROW = 3  # Dòng 1-2 là header
+
+HEADER_STYLE = "qe_header"
+ROW_STYLES = {0: "qe_row_even", 1: "qe_row_odd"}  # Theo row % 2
+
+ROW_CACHE_SUFFIX = ".rows.json"  # File cache số dòng đặt cạnh workbook
+SUMMARY_FILE = "export_summary.xlsx"
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_DIMENSION_RE = re.compile(rb'<dimension ref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"')
+_ROW_RE = re.compile(rb'<row\b[^>]*?\sr="(\d+)"')
+_COLUMN_A_VALUE_RE = re.compile(rb'<c r="A\d+"[^>]*>\s*<(?:v|is|f)\b')
+_LAST_COLUMN = b"J"  # Cột cuối của các dòng câu hỏi (10 cột header)
+_SHEET_DATA_END = b"</sheetData>"
+_EMPTY_SHEET_DATA = b"<sheetData/>"
+_STREAM_CHUNK = 1 << 20
+_TAG_OVERLAP = 256  # Byte giữ lại giữa hai khối để không cắt đôi thẻ <row> hay </sheetData>
+
+def _last_row_number(data):
+    """Số dòng của thẻ <row r="..."> đầy đủ cuối cùng trong data, 0 nếu không có"""
+    end = len(data)
+    while True:
+        start = data.rfind(b"<row", 0, end)
+        if start < 0:
+            return 0
+        match = _ROW_RE.match(data, start)
+        if match:
+            return int(match.group(1))
+        end = start
+
+def _grow_dimension(match, last_row):
+    """Thẻ <dimension> mới phủ cả vùng cũ và các dòng đến last_row (không bao giờ thu nhỏ)"""
+    first_col, first_row, end_col, end_row = match.groups()
+    end_col = end_col or first_col
+    end_row = int(end_row or first_row)
+    if (len(end_col), end_col) < (len(_LAST_COLUMN), _LAST_COLUMN):
+        end_col = _LAST_COLUMN
+    return b'<dimension ref="%s%s:%s%d"' % (first_col, first_row, end_col, max(end_row, last_row))
+
+def _spool_rows(rows_file, questions):
+    """Ghi (nội dung, lựa chọn) của từng câu ra file tạm (marshal), trả về số câu"""
+    count = 0
+    for count, (question_text, options) in enumerate(iter_rows(questions), start=1):
+        marshal.dump((question_text, tuple(options)), rows_file)
+    return count
+
+def _read_spooled_rows(rows_file):
+    rows_file.seek(0)
+    while True:
+        try:
+            yield marshal.load(rows_file)
+        except EOFError:
+            return
+
+def _xml_escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+@contextmanager
+def _closing_on_error(ws):
+    """Đóng sheet write-only nếu nguồn câu hỏi lỗi giữa chừng (file đích không bị tạo)"""
+    try:
+        yield
+    except BaseException:
+        ws.close()
+        raise
+
+def build_named_styles():
+    """Tạo bộ style dùng chung (header + 2 màu dòng xen kẽ) cho một workbook"""
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+    
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    
+    header = NamedStyle(name=HEADER_STYLE)
+    header.font = Font(color="FFFFFF", bold=True)
+    header.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header.alignment = Alignment(horizontal="center")
+    
+    styles = [header]
+    for parity, fill_color in ((0, "FFFFFF"), (1, "F2F2F2")):
+        row_style = NamedStyle(name=ROW_STYLES[parity])
+        row_style.fill = PatternFill(start_color=fill_color, end_color=fill_color, fill_type="solid")
+        row_style.border = border
+        styles.append(row_style)
+    return styles
+
+def register_named_styles(wb):
+    """
+    Đăng ký style dùng chung vào workbook nếu chưa có.
+    Hai style dòng luôn được đưa vào cellXfs (kể cả khi chưa ô nào dùng) để
+    append_questions tìm được style id ngay từ lần ghi đầu tiên.
+    """
+    existing = set(wb.named_styles)
+    for style in build_named_styles():
+        if style.name not in existing:
+            wb.add_named_style(style)
+    for name in ROW_STYLES.values():
+        wb._cell_styles.add(wb._named_styles[name].as_tuple())
 
 class ExcelHandler:
-    def __init__(self, template_path=None):
+    def __init__(self, template_path=None, metrics=None):
         self.template_path = template_path or "TrachNG_CN.xlsx"
+        self.metrics = metrics or NULL_METRICS  # core.metrics.Metrics của lần chạy hiện tại
         self.default_headers = [
             "Question Text",
             "Question Type",
@@ -25,70 +131,191 @@ class ExcelHandler:
     def create_template_if_not_exists(self):
         """Tạo template nếu không tồn tại"""
         if not os.path.exists(self.template_path):
+            import openpyxl
+            from openpyxl.utils import get_column_letter
+            
             wb = openpyxl.Workbook()
             ws = wb.active
             ws.title = "Questions"
             
+            register_named_styles(wb)
+            
             for col, header in enumerate(self.default_headers, start=1):
                 cell = ws.cell(row=1, column=col, value=header)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                cell.font = Font(color="FFFFFF", bold=True)
-                cell.alignment = Alignment(horizontal="center")
+                cell.style = HEADER_STYLE
             
-            column_widths = [60, 15, 40, 40, 40, 40, 15, 15, 30, 50]
-            for i, width in enumerate(column_widths, start=1):
+            for i, width in enumerate(COLUMN_WIDTHS, start=1):
                 ws.column_dimensions[get_column_letter(i)].width = width
             
             wb.save(self.template_path)
     
-    def get_next_empty_row(self, ws):
+    def get_next_empty_row(self, ws, row=DATA_START_ROW):
         """Tìm dòng trống tiếp theo để ghi dữ liệu"""
-        row = 3  # Bắt đầu từ dòng 3 (dòng 1-2 là header)
         while ws.cell(row=row, column=1).value is not None:
             row += 1
         return row
     
     def write_questions(self, questions, output_path=None):
         """Ghi câu hỏi vào file Excel"""
+        from openpyxl import load_workbook
+        
         output_path = output_path or self.template_path
         
         self.create_template_if_not_exists()
         
-        wb = load_workbook(output_path)
+        with self.metrics.stage('excel.load_workbook'):
+            wb = load_workbook(output_path)
         if "Questions" not in wb.sheetnames:
             ws = wb.create_sheet("Questions")
         else:
             ws = wb["Questions"]
         
         start_row = self.get_next_empty_row(ws)
+        register_named_styles(wb)
         
-        for i, question_data in enumerate(questions):
-            row = start_row + i
-            
-            ws.cell(row=row, column=1, value=question_data['question_text'])
-            
-            ws.cell(row=row, column=2, value="Multiple Choice")
-            
-            options = question_data['options']
-            for j in range(4):
-                option_value = options[j] if j < len(options) else ""
-                ws.cell(row=row, column=3 + j, value=option_value)
-            
-            fill_color = "FFFFFF" if row % 2 == 0 else "F2F2F2"
-            for col in range(1, 11):
-                cell = ws.cell(row=row, column=col)
-                cell.fill = PatternFill(start_color=fill_color, end_color=fill_color, fill_type="solid")
+        with self.metrics.stage('excel.write_cells'):
+            for i, (question_text, options) in enumerate(iter_rows(questions)):
+                row = start_row + i
+                
+                ws.cell(row=row, column=1, value=question_text)
+                
+                ws.cell(row=row, column=2, value="Multiple Choice")
                 
-                thin_border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
-                cell.border = thin_border
+                for j in range(4):
+                    option_value = options[j] if j < len(options) else ""
+                    ws.cell(row=row, column=3 + j, value=option_value)
+                
+                row_style = ROW_STYLES[row % 2]
+                for col in range(1, 11):
+                    ws.cell(row=row, column=col).style = row_style
+        self.metrics.count('rows_written', len(questions))
+        
+        with self.metrics.stage('excel.save'):
+            wb.save(output_path)
+        # Dòng cuối có dữ liệu ở cột A (không dùng max_row: nó tính cả các dòng trống đã kẻ viền)
+        self._write_row_cache(output_path, self.get_next_empty_row(ws, start_row + len(questions)) - 1)
+        
+        return {
+            'total_questions': len(questions),
+            'start_row': start_row,
+            'output_path': output_path
+        }
+    
+    def write_questions_streaming(self, questions, output_path=None):
+        """
+        Ghi câu hỏi ra file Excel MỚI bằng workbook write-only.
+        questions có thể là iterator: các dòng được ghi lần lượt nên bộ nhớ
+        không tăng theo số câu hỏi. File đích (nếu có) sẽ bị ghi đè.
+        """
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.utils import get_column_letter
+        
+        output_path = output_path or self.template_path
+        
+        wb = openpyxl.Workbook(write_only=True)
+        register_named_styles(wb)
+        ws = wb.create_sheet("Questions")
+        
+        for i, width in enumerate(COLUMN_WIDTHS, start=1):
+            ws.column_dimensions[get_column_letter(i)].width = width
+        
+        header_cells = []
+        for header in self.default_headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.style = HEADER_STYLE
+            header_cells.append(cell)
+        ws.append(header_cells)
+        
+        for _ in range(DATA_START_ROW - 2):
+            ws.append([])
+        
+        count = 0
+        with self.metrics.stage('excel.write_cells'), _closing_on_error(ws):
+            for count, (question_text, options) in enumerate(iter_rows(questions), start=1):
+                row = DATA_START_ROW + count - 1
+                row_style = ROW_STYLES[row % 2]
+                
+                values = [question_text, "Multiple Choice"]
+                values.extend(options[j] if j < len(options) else "" for j in range(4))
+                values.extend([None] * (len(self.default_headers) - len(values)))
+                
+                row_cells = []
+                for value in values:
+                    cell = WriteOnlyCell(ws, value=value)
+                    cell.style = row_style
+                    row_cells.append(cell)
+                ws.append(row_cells)
+        self.metrics.count('rows_written', count)
+        
+        with self.metrics.stage('excel.save'):
+            wb.save(output_path)
+        self._write_row_cache(output_path, max(DATA_START_ROW + count - 1, 1))
+        
+        return {
+            'total_questions': count,
+            'start_row': DATA_START_ROW,
+            'output_path': output_path
+        }
+    
+    def get_last_row(self, path):
+        """
+        Dòng cuối có dữ liệu ở cột A của sheet Questions mà không đọc toàn bộ file:
+        ưu tiên file cache cạnh workbook, sau đó là thẻ <dimension> ở đầu sheet
+        (chỉ là dự đoán: vùng này tính cả các dòng trống đã định dạng, _splice_sheet
+        sẽ kiểm tra lại). Trả về None nếu không xác định được.
+        """
+        import zipfile
+        
+        cached = self._read_row_cache(path)
+        if cached is not None:
+            return cached
+        
+        with zipfile.ZipFile(path) as zf:
+            sheet_part, _ = self._locate_parts(zf)
+            if sheet_part is None:
+                return None
+            with zf.open(sheet_part) as f:
+                head = f.read(_STREAM_CHUNK)
         
-        wb.save(output_path)
+        match = _DIMENSION_RE.search(head)
+        if not match:
+            return None
+        return int(match.group(4) or match.group(2))
+    
+    def append_questions(self, questions, output_path=None):
+        """
+        Nối câu hỏi vào cuối ngân hàng câu hỏi có sẵn mà không load_workbook.
+        Các dòng mới được chèn thẳng vào XML của sheet trong lúc sao chép file,
+        các phần khác của workbook giữ nguyên. Chi phí xử lý Python chỉ phụ
+        thuộc số câu hỏi thêm vào. Workbook không rõ cấu trúc (không có style
+        dùng chung, không xác định được dòng cuối, sheet có dòng (kể cả dòng
+        trống đã kẻ viền) sau dòng dữ liệu cuối...) sẽ dùng write_questions.
+        """
+        import zipfile
+        
+        output_path = output_path or self.template_path
+        if not isinstance(questions, QuestionBatch):
+            questions = list(questions)
+        
+        if not os.path.exists(output_path):
+            return self.write_questions_streaming(questions, output_path)
+        
+        plan = self._append_plan(output_path)
+        if plan is None:
+            return self.write_questions(questions, output_path)
+        
+        sheet_part, start_row, style_ids = plan
+        if not questions:
+            return {'total_questions': 0, 'start_row': start_row, 'output_path': output_path}
+        
+        end_row = start_row + len(questions) - 1
+        with self.metrics.stage('excel.write_cells'):
+            rows_xml = "".join(self._iter_rows_xml(iter_rows(questions), start_row, style_ids)).encode('utf-8')
+        
+        if not self._write_spliced(output_path, sheet_part, rows_xml, start_row, end_row):
+            return self.write_questions(questions, output_path)
+        self.metrics.count('rows_written', len(questions))
         
         return {
             'total_questions': len(questions),
@@ -96,8 +323,259 @@ class ExcelHandler:
             'output_path': output_path
         }
     
+    def append_questions_streaming(self, questions, output_path=None):
+        """
+        Như append_questions nhưng không giữ danh sách câu hỏi: questions được đọc
+        lần lượt (vd. từ hàng đợi của pipeline) và ghi tạm ra file đệm, khi đã đọc
+        hết thì XML của các dòng mới được sinh từ file đệm và chèn vào sheet.
+        """
+        import tempfile
+        
+        output_path = output_path or self.template_path
+        
+        if not os.path.exists(output_path):
+            return self.write_questions_streaming(questions, output_path)
+        
+        plan = self._append_plan(output_path)
+        if plan is None:
+            return self.write_questions(list(questions), output_path)
+        
+        sheet_part, start_row, style_ids = plan
+        with tempfile.SpooledTemporaryFile(max_size=_STREAM_CHUNK * 8) as rows_file:
+            count = _spool_rows(rows_file, questions)
+            if not count:
+                return {'total_questions': 0, 'start_row': start_row, 'output_path': output_path}
+            
+            end_row = start_row + count - 1
+            rows_xml = (row.encode('utf-8') for row in
+                        self._iter_rows_xml(_read_spooled_rows(rows_file), start_row, style_ids))
+            if not self._write_spliced(output_path, sheet_part, rows_xml, start_row, end_row):
+                questions = QuestionBatch()
+                for question_text, options in _read_spooled_rows(rows_file):
+                    questions.append(question_text, options)
+                return self.write_questions(questions, output_path)
+        self.metrics.count('rows_written', count)
+        
+        return {
+            'total_questions': count,
+            'start_row': start_row,
+            'output_path': output_path
+        }
+    
+    def _append_plan(self, path):
+        """(sheet part, dòng bắt đầu, style id) nếu có thể nối thẳng vào XML, ngược lại None"""
+        import zipfile
+        
+        last_row = self.get_last_row(path)
+        
+        with zipfile.ZipFile(path) as zf:
+            sheet_part, styles_part = self._locate_parts(zf)
+            style_ids = self._row_style_ids(zf, styles_part) if styles_part else None
+        
+        if last_row is None or sheet_part is None or style_ids is None:
+            return None
+        return sheet_part, max(last_row + 1, DATA_START_ROW), style_ids
+    
+    def _write_spliced(self, path, sheet_part, rows_xml, start_row, end_row):
+        """Ghi bản sao của workbook với các dòng mới rồi thay thế file gốc; False nếu không chèn được"""
+        import zipfile
+        
+        tmp_path = path + ".tmp"
+        spliced = False
+        try:
+            with self.metrics.stage('excel.save'), zipfile.ZipFile(path) as zin, \
+                    zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as zout:
+                for info in zin.infolist():
+                    if info.filename == sheet_part:
+                        spliced = self._splice_sheet(zin, zout, info, rows_xml, start_row, end_row)
+                        if not spliced:
+                            break
+                    else:
+                        zout.writestr(info, zin.read(info.filename))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        if not spliced:
+            os.remove(tmp_path)
+            return False
+        
+        os.replace(tmp_path, path)
+        self._write_row_cache(path, end_row)
+        return True
+    
+    def _read_row_cache(self, path):
+        """Số dòng cuối trong file cache, None nếu cache không khớp với workbook"""
+        try:
+            with open(path + ROW_CACHE_SUFFIX, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            return None
+        
+        if cache.get('size') != stat.st_size or cache.get('mtime_ns') != stat.st_mtime_ns:
+            return None
+        return cache.get('last_row')
+    
+    def _write_row_cache(self, path, last_row):
+        stat = os.stat(path)
+        cache = {'last_row': last_row, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        try:
+            with open(path + ROW_CACHE_SUFFIX, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+        except OSError:
+            pass
+    
+    def _locate_parts(self, zf):
+        """Tìm đường dẫn XML của sheet Questions và styles trong gói xlsx"""
+        import xml.etree.ElementTree as ET
+        
+        workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+        rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+        
+        targets = {}
+        styles_part = None
+        for rel in rels.iter(f"{_NS_PKG_REL}Relationship"):
+            target = rel.get("Target")
+            target = target.lstrip("/") if target.startswith("/") else "xl/" + target
+            targets[rel.get("Id")] = target
+            if rel.get("Type", "").endswith("/styles"):
+                styles_part = target
+        
+        for sheet in workbook.iter(f"{_NS_MAIN}sheet"):
+            if sheet.get("name") == "Questions":
+                return targets.get(sheet.get(f"{_NS_REL}id")), styles_part
+        return None, styles_part
+    
+    def _row_style_ids(self, zf, styles_part):
+        """Chỉ số cellXfs của 2 style dòng xen kẽ, None nếu workbook chưa có"""
+        import xml.etree.ElementTree as ET
+        
+        styles = ET.fromstring(zf.read(styles_part))
+        
+        named = {}
+        for cell_style in styles.iter(f"{_NS_MAIN}cellStyle"):
+            named[cell_style.get("name")] = cell_style.get("xfId")
+        
+        cell_xfs = styles.find(f"{_NS_MAIN}cellXfs")
+        if cell_xfs is None:
+            return None
+        
+        style_ids = {}
+        for parity, name in ROW_STYLES.items():
+            xf_id = named.get(name)
+            for index, xf in enumerate(cell_xfs):
+                if xf_id is not None and xf.get("xfId") == xf_id:
+                    style_ids[parity] = index
+                    break
+            else:
+                return None
+        return style_ids
+    
+    def _iter_rows_xml(self, rows, start_row, style_ids):
+        """Sinh XML <row> (inline string) cho từng cặp (nội dung, lựa chọn)"""
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+        from openpyxl.utils import get_column_letter
+        from openpyxl.utils.exceptions import IllegalCharacterError
+        
+        for i, (question_text, options) in enumerate(rows):
+            row = start_row + i
+            style_id = style_ids[row % 2]
+            
+            values = [question_text, "Multiple Choice"]
+            values.extend(options[j] if j < len(options) else "" for j in range(4))
+            
+            cells = []
+            for col in range(1, len(self.default_headers) + 1):
+                ref = f"{get_column_letter(col)}{row}"
+                value = values[col - 1] if col <= len(values) else None
+                if value:
+                    text = str(value)
+                    if ILLEGAL_CHARACTERS_RE.search(text):
+                        raise IllegalCharacterError(f"{text} cannot be used in worksheets.")
+                    text = _xml_escape(text)
+                    space = ' xml:space="preserve"' if text != text.strip() else ''
+                    cells.append(f'<c r="{ref}" s="{style_id}" t="inlineStr"><is><t{space}>{text}</t></is></c>')
+                else:
+                    cells.append(f'<c r="{ref}" s="{style_id}"/>')
+            
+            yield f'<row r="{row}">{"".join(cells)}</row>'
+    
+    def _splice_sheet(self, zin, zout, info, rows_xml, start_row, last_row):
+        """
+        Sao chép XML của sheet theo từng khối, chèn các dòng mới trước </sheetData>
+        và nới thẻ <dimension>. rows_xml là bytes hoặc iterable các bytes.
+        Trả về False nếu không tìm thấy </sheetData> hoặc dòng cuối của sheet không
+        phải dòng start_row - 1 có dữ liệu ở cột A: sheet đã có dòng >= start_row
+        (chèn vào sẽ tạo dòng trùng/sai thứ tự, Excel báo file hỏng) hoặc các dòng
+        cuối chỉ có định dạng (chèn sau chúng sẽ để lại khoảng trống trong ngân hàng).
+        """
+        import zipfile
+        
+        new_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+        new_info.compress_type = zipfile.ZIP_DEFLATED
+        
+        with zin.open(info) as src, zout.open(new_info, 'w', force_zip64=True) as dst:
+            pending = _DIMENSION_RE.sub(
+                lambda match: _grow_dimension(match, last_row),
+                src.read(_STREAM_CHUNK), count=1
+            )
+            
+            existing_rows = 0
+            while True:
+                end_at = pending.find(_SHEET_DATA_END)
+                if end_at >= 0:
+                    existing_rows = max(existing_rows, _last_row_number(pending[:end_at]))
+                    break
+                existing_rows = max(existing_rows, _last_row_number(pending))
+                # Sheet chưa có dòng nào: <sheetData/>
+                empty_at = pending.find(_EMPTY_SHEET_DATA)
+                if empty_at >= 0:
+                    pending = (pending[:empty_at] + b"<sheetData>" + _SHEET_DATA_END
+                               + pending[empty_at + len(_EMPTY_SHEET_DATA):])
+                    continue
+                chunk = src.read(_STREAM_CHUNK)
+                if not chunk:
+                    return False
+                # Giữ lại thẻ <row> cuối (nếu không quá dài) để kiểm tra cột A ở cuối sheet
+                keep = len(pending) - _TAG_OVERLAP
+                row_at = pending.rfind(b"<row")
+                if max(len(pending) - _STREAM_CHUNK, 0) <= row_at < keep:
+                    keep = row_at
+                dst.write(pending[:keep])
+                pending = pending[keep:] + chunk
+            
+            if existing_rows >= DATA_START_ROW:
+                last_at = pending.rfind(b"<row", 0, end_at)
+                match = _ROW_RE.match(pending, last_at) if last_at >= 0 else None
+                if (existing_rows != start_row - 1 or not match or int(match.group(1)) != existing_rows
+                        or not _COLUMN_A_VALUE_RE.search(pending, last_at, end_at)):
+                    return False
+            elif start_row != DATA_START_ROW:
+                return False
+            dst.write(pending[:end_at])
+            if isinstance(rows_xml, bytes):
+                dst.write(rows_xml)
+            else:
+                buffered, size = [], 0
+                for row_xml in rows_xml:
+                    buffered.append(row_xml)
+                    size += len(row_xml)
+                    if size >= _STREAM_CHUNK:
+                        dst.write(b"".join(buffered))
+                        buffered, size = [], 0
+                dst.write(b"".join(buffered))
+            dst.write(pending[end_at:])
+            for chunk in iter(lambda: src.read(_STREAM_CHUNK), b''):
+                dst.write(chunk)
+        return True
+    
     def export_summary(self, questions, stats):
         """Xuất file summary"""
+        import openpyxl
+        from openpyxl.styles import Font
+        
         summary_wb = openpyxl.Workbook()
         ws = summary_wb.active
         ws.title = "Summary"
@@ -114,18 +592,18 @@ class ExcelHandler:
         headers = ["No.", "Question Text", "Options Count"]
         ws.append(headers)
         
-        for i, q in enumerate(questions, 1):
+        for i, (question_text, options) in enumerate(iter_rows(questions), 1):
             ws.append([
                 i,
-                q['question_text'][:100] + "..." if len(q['question_text']) > 100 else q['question_text'],
-                len(q['options'])
+                question_text[:100] + "..." if len(question_text) > 100 else question_text,
+                len(options)
             ])
         
         for row in ws.iter_rows(min_row=1, max_row=7, max_col=2):
             for cell in row:
                 cell.font = Font(bold=True)
         
-        summary_path = "export_summary.xlsx"
+        summary_path = SUMMARY_FILE
         summary_wb.save(summary_path)
         
         return summary_path
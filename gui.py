@@ -1,14 +1,63 @@
 # gui.py
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
-import threading
+import itertools
 import queue
+import threading
 import os
 import re
-from text_processor import TextProcessor
+from text_processor import EXTRACTOR_VERSION, BlockCache, TextProcessor
 from excel_handler import ExcelHandler
+from document_reader import iter_docx_text, read_docx_text, read_pdf_text, is_large_file
 from core.deduplicator import Deduplicator
+from core.extraction_cache import ExtractionCache
+from core.fingerprint_store import FingerprintStore
 from core.logger import Logger
+from core.jobs import CancelToken, JobCancelled, JobRunner, ProgressThrottle
+from core.metrics import Metrics
+from core.pipeline import ExportPipeline
+from core.question import QuestionBatch
+from core.search_index import QuestionSearchIndex
+from question_table import VirtualQuestionTable
+
+PROGRESS_INTERVAL = 0.1  # Số giây tối thiểu giữa hai thông báo tiến độ
+
+DEBUG_PAGE_SIZE = 200  # Số câu hiển thị mỗi trang trong cửa sổ debug
+DEBUG_BATCH_SIZE = 50  # Số câu gửi về giao diện mỗi lần chèn
+DEBUG_POLL_MS = 50
+DEBUG_QUESTION_PATTERN = re.compile(r'Câu\s*\d+[\.:\)]', re.IGNORECASE)
+
+class TextSource:
+    """
+    Chia văn bản thành các đoạn cho TextProcessor.iter_questions (không sao chép
+    toàn bộ như io.StringIO) và cho biết đã đọc được bao nhiêu phần.
+    """
+    
+    def __init__(self, text, chunk_size=1 << 16):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.offset = 0
+    
+    def __iter__(self):
+        while self.offset < len(self.text):
+            start = self.offset
+            self.offset += self.chunk_size
+            yield self.text[start:self.offset]
+    
+    def position(self):
+        return min(self.offset / max(len(self.text), 1), 1.0)
+
+def format_debug_question(index, question):
+    """Khối văn bản hiển thị một câu hỏi trong cửa sổ debug"""
+    parts = [
+        f"\n--- Câu {index} ---\n",
+        f"Question Text: {question['question_text'][:150]}...\n",
+        f"Options count: {len([opt for opt in question['options'] if opt])}\n",
+    ]
+    for j, opt in enumerate(question['options']):
+        if opt and opt.strip():
+            parts.append(f"  {chr(65+j)}. {opt[:80]}...\n")
+    return "".join(parts)
 
 class QuestionExtractorApp:
     def __init__(self, root):
@@ -16,15 +65,20 @@ class QuestionExtractorApp:
         self.root.title("Công cụ Trích xuất Câu hỏi từ Văn bản sang Excel")
         self.root.geometry("1000x700")
         
-        self.text_processor = TextProcessor()
+        self.text_processor = TextProcessor(block_cache=BlockCache())  # Sửa vài câu rồi xuất lại chỉ xử lý các khối đã đổi
+        self.extraction_cache = ExtractionCache.from_env(EXTRACTOR_VERSION)  # None nếu bị tắt
         self.excel_handler = ExcelHandler()
-        self.logger = Logger()
-        self.deduplicator = Deduplicator(policy='allow', logger=self.logger)  # Mặc định là allow để test
+        self.logger = Logger.shared()
+        self.fingerprint_store = FingerprintStore.for_workbook(self.excel_handler.template_path)
+        self.deduplicator = Deduplicator(policy='allow', logger=self.logger,
+                                         store=self.fingerprint_store)  # Mặc định là allow để test
         
         self.queue = queue.Queue()
+        self.jobs = JobRunner(self._post)  # Chỉ một lần xuất chạy tại một thời điểm
         
         self.questions = []
         self.stats = {'written': 0, 'skipped': 0, 'merged': 0}
+        self.metrics = Metrics()
         
         self.setup_ui()
         
@@ -70,17 +124,26 @@ class QuestionExtractorApp:
         
         buttons = [
             ("📋 Dán từ Clipboard", self.paste_from_clipboard),
+            ("📂 Mở File", self.open_file),
             ("📝 Tải Ví dụ Mẫu", self.load_example),
             ("🐛 Debug", self.debug_extraction),
             ("🗑️ Xóa Tất Cả", self.clear_all),
             ("ℹ️ Thông tin Template", self.show_template_info),
             ("⚙️ Cài đặt", self.open_settings),
-            ("🔄 Xử lý & Xuất Excel", self.process_and_export)
+            ("🔄 Xử lý & Xuất Excel", self.process_and_export),
+            ("⛔ Hủy", self.cancel_job)
         ]
         
+        # Các nút bắt đầu một lần xuất bị khóa khi đang có công việc chạy
+        self.job_buttons = []
         for i, (text, command) in enumerate(buttons):
             btn = ttk.Button(button_frame, text=text, command=command)
             btn.grid(row=0, column=i, padx=2)
+            if command in (self.open_file, self.process_and_export):
+                self.job_buttons.append(btn)
+            elif command == self.cancel_job:
+                self.cancel_button = btn
+        self.cancel_button.state(['disabled'])
         
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(
@@ -137,6 +200,9 @@ class QuestionExtractorApp:
         self.preview_text.pack(fill=tk.BOTH, expand=True)
         self.notebook.add(preview_text_frame, text="Xem trước")
         
+        self.question_table = VirtualQuestionTable(self.notebook)
+        self.notebook.add(self.question_table, text="Bảng câu hỏi")
+        
         # Footer
         footer_label = ttk.Label(
             main_frame,
@@ -154,6 +220,43 @@ class QuestionExtractorApp:
         except:
             messagebox.showerror("Lỗi", "Không thể lấy dữ liệu từ clipboard")
     
+    def open_file(self):
+        path = filedialog.askopenfilename(
+            title="Chọn file câu hỏi",
+            filetypes=[("Word", "*.docx"), ("PDF", "*.pdf"), ("Text", "*.txt"), ("Tất cả", "*.*")]
+        )
+        if not path:
+            return
+        
+        if is_large_file(path) or path.lower().endswith('.pdf'):
+            # File lớn hoặc PDF: xử lý thẳng từ file, không đưa qua ô nhập liệu
+            if self.jobs.busy:
+                messagebox.showinfo("Đang xử lý", "Đang có một lần xuất chưa hoàn tất. Hãy chờ hoặc bấm Hủy.")
+                return
+            if not messagebox.askyesno(
+                "Xử lý file",
+                f"File {os.path.basename(path)} sẽ được xử lý trực tiếp "
+                f"mà không hiển thị trong ô nhập liệu.\n\nXử lý & xuất Excel ngay?"
+            ):
+                return
+            self.stats = {'written': 0, 'skipped': 0, 'merged': 0}
+            self.jobs.start(self._process_file_thread, path)
+            return
+        
+        try:
+            if path.lower().endswith('.docx'):
+                text = read_docx_text(path)
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    text = f.read()
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể đọc file: {str(e)}")
+            return
+        
+        self.text_input.delete('1.0', tk.END)
+        self.text_input.insert('1.0', text)
+        self.update_status(f"Đã mở file {os.path.basename(path)}")
+    
     def load_example(self):
         example = """Câu 23. Điểm khác biệt ... về việc thực hiện chủ trương phát triển đất nước của Xiêm so với Việt Nam cuối thể kỉ XIX là gì?
 A. Các sĩ phu tân học là người đề xướng cải cách.
@@ -180,6 +283,7 @@ D. Đóng cửa với các nước châu Âu."""
     def clear_all(self):
         self.text_input.delete('1.0', tk.END)
         self.questions.clear()
+        self.question_table.set_questions([])
         self.update_overview()
         self.update_status("Đã xóa tất cả nội dung")
     
@@ -231,6 +335,9 @@ LƯU Ý:
             rb.pack(anchor=tk.W, padx=20)
         
         def save_settings():
+            if self.jobs.busy:
+                messagebox.showwarning("Cảnh báo", "Không thể đổi chính sách khi đang xuất Excel!")
+                return
             self.deduplicator.policy = policy_var.get()
             settings_window.destroy()
             self.update_status("Đã lưu cài đặt")
@@ -238,7 +345,11 @@ LƯU Ý:
         ttk.Button(settings_window, text="Lưu", command=save_settings).pack(pady=20)
     
     def debug_extraction(self):
-        """Phương thức debug để kiểm tra trích xuất"""
+        """
+        Phương thức debug để kiểm tra trích xuất.
+        Việc phân tích chạy ở thread nền, kết quả được gửi về theo lô và chèn một lần mỗi lô;
+        chỉ DEBUG_PAGE_SIZE câu đầu được hiển thị, phần còn lại xem thêm theo yêu cầu.
+        """
         text = self.text_input.get('1.0', tk.END)
         
         if not text.strip():
@@ -249,135 +360,326 @@ LƯU Ý:
         debug_window.title("Debug - Kiểm tra trích xuất")
         debug_window.geometry("800x600")
         
+        controls = ttk.Frame(debug_window)
+        controls.pack(fill=tk.X, padx=10, pady=(10, 0))
+        status_label = ttk.Label(controls, text="Đang phân tích...")
+        status_label.pack(side=tk.LEFT)
+        more_button = ttk.Button(controls, text=f"Xem thêm {DEBUG_PAGE_SIZE} câu")
+        more_button.pack(side=tk.RIGHT)
+        more_button.state(['disabled'])
+        
         debug_text = scrolledtext.ScrolledText(debug_window, wrap=tk.WORD, width=90, height=30)
         debug_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        debug_text.insert('1.0', "=== PHÂN TÍCH VĂN BẢN ===\n\n")
-        debug_text.insert('end', f"Độ dài văn bản: {len(text)} ký tự\n")
+        token = CancelToken()
+        results = queue.Queue()
+        state = {'questions': [], 'shown': 0}
         
-        matches = re.findall(r'Câu\s*\d+[\.:\)]', text, re.IGNORECASE)
-        debug_text.insert('end', f"\nTìm thấy {len(matches)} pattern 'Câu X.' trong văn bản\n")
-        for i, match in enumerate(matches[:10], 1):
-            debug_text.insert('end', f"  {i}. {match}\n")
+        def show_more():
+            questions = state['questions']
+            end = min(state['shown'] + DEBUG_PAGE_SIZE, len(questions))
+            debug_text.insert('end', "".join(
+                format_debug_question(i, questions[i - 1]) for i in range(state['shown'] + 1, end + 1)
+            ))
+            state['shown'] = end
+            update_controls()
         
-        debug_text.insert('end', "\n=== KẾT QUẢ TRÍCH XUẤT ===\n")
+        def update_controls():
+            total = len(state['questions'])
+            status_label.config(text=f"Đang hiển thị {state['shown']}/{total} câu")
+            more_button.state(['!disabled'] if state['shown'] < total else ['disabled'])
         
+        def poll():
+            if token.cancelled:
+                return
+            try:
+                while True:
+                    kind, data = results.get_nowait()
+                    if kind == 'text':
+                        debug_text.insert('end', data)
+                    elif kind == 'shown':
+                        state['shown'] = data
+                        status_label.config(text=f"Đang phân tích... ({data} câu)")
+                    elif kind == 'done':
+                        state['questions'] = data
+                        update_controls()
+                        return
+            except queue.Empty:
+                pass
+            debug_window.after(DEBUG_POLL_MS, poll)
+        
+        def on_close():
+            token.cancel()
+            debug_window.destroy()
+        
+        more_button.config(command=show_more)
+        debug_window.protocol("WM_DELETE_WINDOW", on_close)
+        
+        thread = threading.Thread(target=self._debug_worker, args=(token, text, results), daemon=True)
+        thread.start()
+        debug_window.after(DEBUG_POLL_MS, poll)
+    
+    def _debug_worker(self, token, text, results):
+        """Thread nền của debug_extraction: gửi ('text', chuỗi), ('shown', n) và cuối cùng ('done', câu hỏi)"""
+        lines = ["=== PHÂN TÍCH VĂN BẢN ===\n\n", f"Độ dài văn bản: {len(text)} ký tự\n"]
+        
+        match_count = 0
+        first_matches = []
+        for match in DEBUG_QUESTION_PATTERN.finditer(text):
+            match_count += 1
+            if len(first_matches) < 10:
+                first_matches.append(match.group())
+        lines.append(f"\nTìm thấy {match_count} pattern 'Câu X.' trong văn bản\n")
+        for i, match in enumerate(first_matches, 1):
+            lines.append(f"  {i}. {match}\n")
+        
+        lines.append("\n=== KẾT QUẢ TRÍCH XUẤT ===\n")
+        results.put(('text', "".join(lines)))
+        
+        questions = []
         try:
-            if hasattr(self.text_processor, 'smart_extract'):
-                questions = self.text_processor.smart_extract(text)
-                debug_text.insert('end', f"\nSố câu hỏi trích xuất được: {len(questions)}\n")
+            batch = []
+            for question in self.text_processor.iter_questions(TextSource(text)):
+                token.check()
+                questions.append(question)
+                if len(questions) <= DEBUG_PAGE_SIZE:
+                    batch.append(format_debug_question(len(questions), question))
+                    if len(batch) >= DEBUG_BATCH_SIZE:
+                        results.put(('text', "".join(batch)))
+                        batch = []
+                        results.put(('shown', len(questions)))
+            if batch:
+                results.put(('text', "".join(batch)))
+            results.put(('shown', min(len(questions), DEBUG_PAGE_SIZE)))
+            
+            lines = [f"\nSố câu hỏi trích xuất được: {len(questions)}\n"]
+            if len(questions) > DEBUG_PAGE_SIZE:
+                lines.append(f"(Bấm 'Xem thêm' để hiển thị các câu sau câu {DEBUG_PAGE_SIZE})\n")
+            if not questions:
+                lines.append("\nKHÔNG TÌM THẤY CÂU HỎI NÀO!\n")
                 
-                if questions:
-                    for i, q in enumerate(questions, 1):
-                        debug_text.insert('end', f"\n--- Câu {i} ---\n")
-                        debug_text.insert('end', f"Question Text: {q['question_text'][:150]}...\n")
-                        debug_text.insert('end', f"Options count: {len([opt for opt in q['options'] if opt])}\n")
-                        for j, opt in enumerate(q['options']):
-                            if opt and opt.strip():
-                                debug_text.insert('end', f"  {chr(65+j)}. {opt[:80]}...\n")
-                else:
-                    debug_text.insert('end', "\nKHÔNG TÌM THẤY CÂU HỎI NÀO!\n")
-                    
-                    debug_text.insert('end', "\n=== PHÂN TÍCH LỖI ===\n")
-                    
-                    if "Câu" in text:
-                        debug_text.insert('end', "Tìm thấy từ 'Câu' trong văn bản nhưng không trích xuất được.\n")
-                        debug_text.insert('end', "Có thể do định dạng không đúng.\n")
-                    
-                    debug_text.insert('end', "\n=== MẪU VĂN BẢN (100 ký tự đầu) ===\n")
-                    debug_text.insert('end', text[:100] + "...\n")
-            else:
-                debug_text.insert('end', "Phương thức smart_extract không tồn tại!\n")
+                lines.append("\n=== PHÂN TÍCH LỖI ===\n")
+                
+                if "Câu" in text:
+                    lines.append("Tìm thấy từ 'Câu' trong văn bản nhưng không trích xuất được.\n")
+                    lines.append("Có thể do định dạng không đúng.\n")
+                
+                lines.append("\n=== MẪU VĂN BẢN (100 ký tự đầu) ===\n")
+                lines.append(text[:100] + "...\n")
+            results.put(('text', "".join(lines)))
+        except JobCancelled:
+            return
         except Exception as e:
-            debug_text.insert('end', f"Lỗi khi trích xuất: {str(e)}\n")
             import traceback
-            debug_text.insert('end', f"\nTraceback:\n{traceback.format_exc()}")
+            results.put(('text', f"Lỗi khi trích xuất: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"))
+        results.put(('done', questions))
     
     def process_and_export(self):
+        if self.jobs.busy:
+            messagebox.showinfo("Đang xử lý", "Đang có một lần xuất chưa hoàn tất. Hãy chờ hoặc bấm Hủy.")
+            return
+        
         text = self.text_input.get('1.0', tk.END)
         if not text.strip():
             messagebox.showwarning("Cảnh báo", "Vui lòng nhập văn bản!")
             return
         
         self.stats = {'written': 0, 'skipped': 0, 'merged': 0}
-        
-        thread = threading.Thread(target=self._process_thread, args=(text,))
-        thread.daemon = True
-        thread.start()
+        self.jobs.start(self._process_thread, text)
+    
+    def cancel_job(self):
+        if self.jobs.cancel():
+            self.update_status("Đang hủy...")
+    
+    def _start_metrics(self):
+        """Bộ đo mới cho mỗi lần xuất (bật bằng biến môi trường QE_METRICS=1)"""
+        self.metrics = Metrics.from_env()
+        self.excel_handler.metrics = self.metrics
+        return self.metrics
     
-    def _process_thread(self, text):
-        self.queue.put(('status', "Đang xử lý văn bản..."))
-        self.queue.put(('progress', 10))
+    def _post(self, msg_type, data):
+        self.queue.put((msg_type, data))
+    
+    def _process_thread(self, token, text):
+        progress = ProgressThrottle(self._post, PROGRESS_INTERVAL)
+        progress.report(10, "Đang xử lý văn bản...")
+        metrics = self._start_metrics()
         
         try:
-            if hasattr(self.text_processor, 'smart_extract'):
-                raw_questions = self.text_processor.smart_extract(text)
-            else:
-                raw_questions = self.text_processor.extract_questions_from_text(text)
+            if metrics.enabled:
+                metrics.count('input_bytes', len(text.encode('utf-8')))
+            with metrics.stage('bootstrap'):
+                self.deduplicator.bootstrap_from_workbook(self.excel_handler.template_path)
             
-            if not raw_questions:
-                self.queue.put(('error', "Không tìm thấy câu hỏi nào trong văn bản!"))
-                self.queue.put(('progress', 100))
-                return
-            
-            self.queue.put(('status', f"Đã trích xuất {len(raw_questions)} câu hỏi"))
-            self.queue.put(('progress', 40))
+            # Trích xuất dạng luồng (kết quả giống extract_questions_from_text) để chạy song song với ghi Excel
+            source = TextSource(text)
+            key = self._cache_key(text=text)
+            cached = self._cached_questions(key)
+            if cached is not None:
+                self._run_export_pipeline(token, progress, cached)
+            else:
+                self._run_export_pipeline(token, progress,
+                                          self._cache_through(key, self.text_processor.iter_questions(source)),
+                                          position=source.position)
             
-            processed_questions = []
+        except JobCancelled:
+            self.deduplicator.discard_pending()
+            progress.report(0, "Đã hủy")
+            raise
+        except Exception as e:
+            self.deduplicator.discard_pending()
+            self.queue.put(('error', f"Lỗi xử lý: {str(e)}"))
+            import traceback
+            traceback.print_exc()
+    
+    def _process_file_thread(self, token, path):
+        """Trích xuất trực tiếp từ file (.pdf, .docx hoặc văn bản thuần)"""
+        progress = ProgressThrottle(self._post, PROGRESS_INTERVAL)
+        progress.report(10, f"Đang đọc {os.path.basename(path)}...")
+        metrics = self._start_metrics()
+        
+        try:
+            size = os.path.getsize(path)
+            metrics.count('input_bytes', size)
+            with metrics.stage('bootstrap'):
+                self.deduplicator.bootstrap_from_workbook(self.excel_handler.template_path)
             
-            for raw_q in raw_questions:
-                if not raw_q:
-                    continue
-                    
-                result = self.deduplicator.add_question(
-                    raw_q['question_text'],
-                    raw_q['options']
-                )
+            key = self._cache_key(path=path)
+            cached = self._cached_questions(key)
+            if cached is not None:
+                progress.report(35, "File không đổi, dùng kết quả trích xuất đã lưu...")
+                self._run_export_pipeline(token, progress, cached, base=35)
+            elif path.lower().endswith('.pdf'):
+                def report_page(done, total):
+                    token.check()
+                    if progress.due() or done == total:
+                        progress.report(10 + 25 * done / total, f"Đang đọc trang {done}/{total}...")
                 
-                if result:
-                    processed_questions.append({
-                        'question_text': result[0],
-                        'options': result[1]
-                    })
-                    self.stats['written'] += 1
-                else:
-                    self.stats['skipped'] += 1
-            
-            if not processed_questions:
-                self.queue.put(('error', "Không có câu hỏi nào được xử lý (có thể do trùng lặp)!"))
-                self.queue.put(('progress', 100))
-                return
-            
-            self.queue.put(('progress', 70))
-            
-            export_result = self.excel_handler.write_questions(processed_questions)
-            
-            self.queue.put(('progress', 90))
-            
-            summary_path = self.excel_handler.export_summary(processed_questions, self.stats)
-            
-            self.queue.put(('progress', 100))
-            self.queue.put(('status', f"Đã xuất {len(processed_questions)} câu hỏi sang Excel"))
-            
-            self.questions = processed_questions
-            self.queue.put(('update_ui', processed_questions))
-            
-            self.logger.log_export_stats(self.stats)
-            
-            self.queue.put(('message', 
-                f"Xuất thành công!\n\n"
-                f"• Câu hỏi đã trích xuất: {len(raw_questions)}\n"
-                f"• Câu hỏi đã ghi: {self.stats['written']}\n"
-                f"• Câu hỏi bị bỏ qua: {self.stats['skipped']}\n"
-                f"• File Excel: {export_result['output_path']}\n"
-                f"• File Summary: {summary_path}"
-            ))
+                with metrics.stage('read_pdf'):
+                    text = read_pdf_text(path, progress=report_page)
+                source = TextSource(text)
+                questions = self._cache_through(key, self.text_processor.iter_questions(source))
+                self._run_export_pipeline(token, progress, questions,
+                                          position=source.position, base=35)
+            elif path.lower().endswith('.docx'):
+                questions = self._cache_through(key, self.text_processor.iter_questions(iter_docx_text(path)))
+                self._run_export_pipeline(token, progress, questions)
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    questions = self._cache_through(key, self.text_processor.iter_questions(f))
+                    self._run_export_pipeline(token, progress, questions,
+                                              position=lambda: f.buffer.tell() / max(size, 1))
             
+        except JobCancelled:
+            self.deduplicator.discard_pending()
+            progress.report(0, "Đã hủy")
+            raise
         except Exception as e:
+            self.deduplicator.discard_pending()
             self.queue.put(('error', f"Lỗi xử lý: {str(e)}"))
             import traceback
             traceback.print_exc()
     
+    def _cache_key(self, text=None, path=None):
+        """Khóa ExtractionCache theo nội dung văn bản hoặc nội dung file, None nếu cache tắt"""
+        if self.extraction_cache is None:
+            return None
+        with self.metrics.stage('cache_key'):
+            if path is not None:
+                return self.extraction_cache.key_for_file(path)
+            return self.extraction_cache.key_for_text(text)
+    
+    def _cached_questions(self, key):
+        """Câu hỏi đã trích xuất từ đúng đầu vào này ở lần trước, None nếu chưa có"""
+        if key is None:
+            return None
+        with self.metrics.stage('cache_lookup'):
+            cached = self.extraction_cache.get(key)
+        self.metrics.count('cache_hits' if cached is not None else 'cache_misses')
+        return cached
+    
+    def _cache_through(self, key, questions):
+        """Lưu kết quả trích xuất vào cache khi đã đọc hết (bị hủy giữa chừng thì không lưu)"""
+        if key is None:
+            return questions
+        return self.extraction_cache.iter_through(key, questions)
+    
+    def _write_stream(self, questions):
+        """Giai đoạn ghi của pipeline: không tạo/sửa workbook nếu không có câu hỏi nào"""
+        first = next(questions, None)
+        if first is None:
+            return None
+        return self.excel_handler.append_questions_streaming(itertools.chain([first], questions))
+    
+    def _run_export_pipeline(self, token, progress, source, position=None, base=10):
+        """
+        Trích xuất, khử trùng lặp và ghi Excel chồng lên nhau (core.pipeline.ExportPipeline).
+        position() trả về tỉ lệ đầu vào đã đọc (0-1), chỉ được gọi khi cần báo tiến độ.
+        Workbook chỉ được thay thế khi toàn bộ câu hỏi đã ghi xong, nên hủy giữa chừng không làm hỏng file.
+        Các câu được giữ lại vẫn được gom vào processed_questions (bảng xem trước, chỉ mục
+        tìm kiếm, file summary cần đủ danh sách) nên bộ nhớ tăng theo số câu đã ghi.
+        """
+        metrics = self.metrics
+        processed_questions = QuestionBatch()
+        
+        def report(extracted, written):
+            if progress.due():
+                percent = base + (90 - base) * position() if position else None
+                progress.report(percent, f"Đã trích xuất {extracted} câu hỏi, đã ghi {written} câu...")
+        
+        pipeline = ExportPipeline(self.deduplicator, token=token, metrics=metrics, progress=report)
+        with metrics.stage('pipeline'):
+            export_result = pipeline.run(source, self._write_stream, on_batch=processed_questions.extend)
+        
+        extracted = pipeline.stats['extracted']
+        self.stats['written'] += pipeline.stats['written']
+        self.stats['skipped'] += pipeline.stats['skipped']
+        metrics.count('questions_extracted', extracted)
+        metrics.count('questions_written', self.stats['written'])
+        metrics.count('questions_skipped', self.stats['skipped'])
+        
+        if not extracted:
+            self.queue.put(('error', "Không tìm thấy câu hỏi nào trong văn bản!"))
+            self.queue.put(('progress', 100))
+            return
+        
+        if not processed_questions:
+            self.queue.put(('error', "Không có câu hỏi nào được xử lý (có thể do trùng lặp)!"))
+            self.queue.put(('progress', 100))
+            return
+        
+        with metrics.stage('store_flush'):
+            self.deduplicator.flush(self.excel_handler.template_path)
+        
+        progress.report(90, f"Đã ghi {len(processed_questions)} câu hỏi, đang tạo file summary...")
+        
+        with metrics.stage('summary'):
+            summary_path = self.excel_handler.export_summary(processed_questions, self.stats)
+        
+        # Chỉ mục tìm kiếm cho bảng xem trước được dựng sẵn ở thread nền
+        with metrics.stage('preview_index'):
+            search_index = QuestionSearchIndex(processed_questions)
+        
+        metrics_path = metrics.write_report(os.path.dirname(os.path.abspath(summary_path)))
+        if metrics_path:
+            self.logger.info(f"Metrics report: {metrics_path}")
+        
+        progress.report(100, f"Đã xuất {len(processed_questions)} câu hỏi sang Excel")
+        
+        self.questions = processed_questions
+        self.queue.put(('update_ui', (processed_questions, search_index)))
+        
+        self.logger.log_export_stats(self.stats)
+        
+        self.queue.put(('message', 
+            f"Xuất thành công!\n\n"
+            f"• Câu hỏi đã trích xuất: {extracted}\n"
+            f"• Câu hỏi đã ghi: {self.stats['written']}\n"
+            f"• Câu hỏi bị bỏ qua: {self.stats['skipped']}\n"
+            f"• File Excel: {export_result['output_path']}\n"
+            f"• File Summary: {summary_path}"
+        ))
+    
     def update_status(self, message):
         self.status_label.config(text=message)
     
@@ -456,13 +758,23 @@ VÍ DỤ CÂU HỎI ĐÃ XỬ LÝ:"""
                     elif msg_type == 'progress':
                         self.progress_var.set(data)
                     elif msg_type == 'update_ui':
-                        self.questions = data
+                        questions, search_index = data
+                        self.questions = questions
                         self.update_overview()
-                        self.update_preview(data)
+                        self.update_preview(questions)
+                        self.question_table.set_questions(questions, search_index)
                     elif msg_type == 'message':
                         messagebox.showinfo("Thành công", data)
                     elif msg_type == 'error':
                         messagebox.showerror("Lỗi", data)
+                    elif msg_type == 'job_started':
+                        for btn in self.job_buttons:
+                            btn.state(['disabled'])
+                        self.cancel_button.state(['!disabled'])
+                    elif msg_type == 'job_finished':
+                        for btn in self.job_buttons:
+                            btn.state(['!disabled'])
+                        self.cancel_button.state(['disabled'])
                     
                     self.queue.task_done()
                 except queue.Empty:
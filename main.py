@@ -2,24 +2,25 @@
 import sys
 import os
 import io 
+import importlib.util
 
 if sys.stdout:
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 if sys.stderr:
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
-from gui import main as gui_main
-
 def check_dependencies():
-    """Kiểm tra và cài đặt dependencies"""
-    required = ['openpyxl', 'pandas']
-    missing = []
+    """
+    Kiểm tra dependencies mà không import chúng (find_spec), để khởi động nhanh.
+    Thư viện tùy chọn chỉ cần khi mở file .docx/.pdf.
+    """
+    required = ['openpyxl']
+    optional = {'docx': 'python-docx (mở file .docx)', 'PyPDF2': 'PyPDF2 (mở file .pdf)'}
+    missing = [package for package in required if importlib.util.find_spec(package) is None]
     
-    for package in required:
-        try:
-            __import__(package)
-        except ImportError:
-            missing.append(package)
+    for module, description in optional.items():
+        if importlib.util.find_spec(module) is None:
+            print(f"Lưu ý: chưa cài {description}")
     
     if missing:
         print("Thiếu các thư viện cần thiết:")
@@ -32,6 +33,11 @@ def check_dependencies():
 
 def main():
     """Hàm chính"""
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        # Chế độ headless: không import gui/tkinter
+        from batch_cli import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+    
     print("=" * 60)
     print("CÔNG CỤ TRÍCH XUẤT CÂU HỎI TỪ VĂN BẢN SANG EXCEL")
     print("Phiên bản: 1.0.0")
@@ -43,6 +49,7 @@ def main():
     os.makedirs('logs', exist_ok=True)
     
     try:
+        from gui import main as gui_main
         gui_main()
     except Exception as e:
         print(f"Lỗi khởi chạy ứng dụng: {e}")
@@ -0,0 +1,139 @@
+# question_table.py
+import tkinter as tk
+from tkinter import ttk
+
+from core.search_index import QuestionSearchIndex
+
+COLUMNS = (
+    ('no', "#", 60),
+    ('question', "Câu hỏi", 420),
+    ('a', "A", 140),
+    ('b', "B", 140),
+    ('c', "C", 140),
+    ('d', "D", 140),
+)
+DEFAULT_ROW_HEIGHT = 20
+HEADING_HEIGHT = 24
+SEARCH_DELAY_MS = 150  # Chờ người dùng gõ xong rồi mới lọc
+
+class VirtualQuestionTable(ttk.Frame):
+    """
+    Bảng xem trước câu hỏi ảo hóa: Treeview chỉ giữ đúng số dòng đang nhìn thấy,
+    khi cuộn chỉ cập nhật giá trị của các dòng đó từ danh sách câu hỏi trong bộ nhớ.
+    Ô tìm kiếm lọc theo QuestionSearchIndex (nội dung câu hỏi đã chuẩn hóa).
+    """
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.questions = []
+        self.index = None
+        self._rows = range(0)  # Số thứ tự các câu đang hiển thị (sau khi lọc)
+        self._offset = 0
+        self._items = []
+        self._search_job = None
+
+        style = ttk.Style()
+        self.row_height = int(style.lookup('Treeview', 'rowheight') or DEFAULT_ROW_HEIGHT)
+
+        search_frame = ttk.Frame(self)
+        search_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(search_frame, text="Tìm kiếm:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', self._schedule_search)
+        ttk.Entry(search_frame, textvariable=self.search_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.count_label = ttk.Label(search_frame, text="0 câu")
+        self.count_label.pack(side=tk.RIGHT)
+
+        table_frame = ttk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(table_frame, columns=[name for name, _, _ in COLUMNS],
+                                 show='headings', selectmode='browse')
+        for name, title, width in COLUMNS:
+            self.tree.heading(name, text=title)
+            self.tree.column(name, width=width, stretch=(name == 'question'))
+        self.scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind('<Configure>', lambda event: self._render())
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_by(3))
+        self.tree.bind('<Prior>', lambda event: self.scroll_by(-self._visible_count()))
+        self.tree.bind('<Next>', lambda event: self.scroll_by(self._visible_count()))
+        self.tree.bind('<Home>', lambda event: self.scroll_to(0))
+        self.tree.bind('<End>', lambda event: self.scroll_to(len(self._rows)))
+
+    def set_questions(self, questions, index=None):
+        """Hiển thị danh sách câu hỏi mới; index có thể dựng sẵn ở thread nền"""
+        self.questions = questions
+        self.index = index or QuestionSearchIndex(questions)
+        self._rows = self.index.search(self.search_var.get())
+        self._offset = 0
+        self._render()
+
+    def _schedule_search(self, *_):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self._apply_search)
+
+    def _apply_search(self):
+        self._search_job = None
+        if self.index is None:
+            return
+        self._rows = self.index.search(self.search_var.get())
+        self._offset = 0
+        self._render()
+
+    def _visible_count(self):
+        height = self.tree.winfo_height() - HEADING_HEIGHT
+        return max(1, height // self.row_height)
+
+    def scroll_to(self, offset):
+        visible = self._visible_count()
+        self._offset = max(0, min(offset, len(self._rows) - visible))
+        self._render()
+
+    def scroll_by(self, delta):
+        self.scroll_to(self._offset + delta)
+        return 'break'
+
+    def _on_mousewheel(self, event):
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        visible = self._visible_count()
+        if action == 'moveto':
+            self.scroll_to(int(float(value) * len(self._rows)))
+        elif action == 'scroll':
+            step = visible if unit == 'pages' else 1
+            self.scroll_by(int(value) * step)
+
+    def _render(self):
+        """Chỉ tạo/cập nhật các dòng đang nhìn thấy"""
+        visible = self._visible_count()
+        total = len(self._rows)
+
+        # Treeview luôn có đúng `visible` item; thừa thì xóa, thiếu thì thêm
+        while len(self._items) > visible:
+            self.tree.delete(self._items.pop())
+        while len(self._items) < visible:
+            self._items.append(self.tree.insert('', 'end', values=()))
+
+        self._offset = max(0, min(self._offset, total - visible))
+        for slot, item in enumerate(self._items):
+            position = self._offset + slot
+            if position < total:
+                row = self._rows[position]
+                question = self.questions[row]
+                options = list(question['options'][:4]) + [""] * (4 - len(question['options'][:4]))
+                self.tree.item(item, values=[row + 1, question['question_text']] + options)
+            else:
+                self.tree.item(item, values=())
+
+        if total:
+            self.scrollbar.set(self._offset / total, min(1.0, (self._offset + visible) / total))
+        else:
+            self.scrollbar.set(0, 1)
+        shown = f"{total:,} / {len(self.questions):,} câu" if total != len(self.questions) else f"{total:,} câu"
+        self.count_label.config(text=shown)
@@ -0,0 +1,20 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# Chạy được bằng "python -m pytest" từ bất kỳ thư mục nào (giống test.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import logger as logger_module
+
+
+@pytest.fixture(autouse=True)
+def isolated_logger(tmp_path, monkeypatch):
+    """Mỗi test chạy trong thư mục tạm: export_log.txt, cache... không rơi vào repo"""
+    monkeypatch.chdir(tmp_path)
+    yield
+    # Listener log dùng chung giữ stderr của pytest (bị đóng sau mỗi test) và thư mục hiện tại
+    logger_module._stop_listener()
+    logger_module.Logger._shared = None
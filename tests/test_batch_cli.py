@@ -0,0 +1,66 @@
+# tests/test_batch_cli.py
+import json
+import os
+
+import pytest
+
+import batch_cli
+
+QUESTIONS_TEXT = """1. Thủ đô của Pháp là gì?
+A. Paris
+B. Rome
+2. 2 + 2 = ?
+A. 3
+B. 4
+"""
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.setenv("QE_EXTRACTION_CACHE", "0")
+    return tmp_path
+
+
+def _summary(capsys):
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith("{")]
+    return [line for line in lines if line['event'] == 'summary'][-1]
+
+
+def test_resolve_inputs_skips_app_outputs(workdir):
+    for name in ("a.txt", "b.docx", "export_log.txt", "export_metrics_20260101.txt", "notes.md"):
+        (workdir / name).write_text("x", encoding="utf-8")
+
+    assert batch_cli.resolve_inputs(["."]) == [os.path.join(".", "a.txt"), os.path.join(".", "b.docx")]
+
+
+def test_second_run_ignores_log_written_by_first(workdir, capsys):
+    pytest.importorskip("openpyxl")
+    (workdir / "bank.txt").write_text(QUESTIONS_TEXT, encoding="utf-8")
+    (workdir / "export_log.txt").write_text("[log] 1. not a question\nA. x\n", encoding="utf-8")
+
+    assert batch_cli.main([".", "-o", "out.xlsx", "--workers", "1"]) == batch_cli.EXIT_OK
+    summary = _summary(capsys)
+    assert summary['files'] == 1 and summary['written'] == 2
+
+
+def test_all_inputs_failing_is_not_partial(workdir, capsys):
+    (workdir / "broken.pdf").write_bytes(b"not a pdf")
+    (workdir / "broken.docx").write_bytes(b"not a docx")
+
+    assert batch_cli.main([".", "-o", "out.xlsx", "--workers", "1"]) == batch_cli.EXIT_ALL_FAILED
+    assert _summary(capsys)['status'] == 'failed'
+    assert not (workdir / "out.xlsx").exists()
+
+
+def test_some_inputs_failing_is_partial(workdir, capsys):
+    pytest.importorskip("openpyxl")
+    (workdir / "bank.txt").write_text(QUESTIONS_TEXT, encoding="utf-8")
+    (workdir / "broken.pdf").write_bytes(b"not a pdf")
+
+    assert batch_cli.main([".", "-o", "out.xlsx", "--workers", "1"]) == batch_cli.EXIT_PARTIAL
+    assert _summary(capsys)['status'] == 'partial'
+    assert (workdir / "out.xlsx").exists()
+
+
+def test_no_inputs_is_usage_error(workdir, capsys):
+    assert batch_cli.main(["missing/*.txt", "-o", "out.xlsx"]) == batch_cli.EXIT_USAGE
@@ -0,0 +1,57 @@
+# tests/test_compact_index.py
+import hashlib
+
+import pytest
+
+from core.compact_index import CompactFingerprintIndex
+
+
+def _digest(i):
+    return hashlib.blake2b(str(i).encode(), digest_size=16).digest()
+
+
+def test_get_across_merges_matches_dict():
+    index = CompactFingerprintIndex(merge_threshold=8)
+    expected = {}
+    for i in range(200):
+        index[_digest(i)] = i
+        expected[_digest(i)] = i
+
+    assert len(index) == len(expected)
+    for digest, ref in expected.items():
+        assert digest in index
+        assert index[digest] == ref
+    assert _digest(-1) not in index
+    assert index.get(_digest(-1), 'x') == 'x'
+    with pytest.raises(KeyError):
+        index[_digest(-1)]
+
+
+def test_overwrite_merged_digest_keeps_single_entry():
+    index = CompactFingerprintIndex(merge_threshold=4)
+    for i in range(10):
+        index[_digest(i)] = i
+    index[_digest(3)] = 99
+
+    assert len(index) == 10
+    assert index[_digest(3)] == 99
+
+
+def test_discard_from_drops_recent_and_merged_refs():
+    index = CompactFingerprintIndex(merge_threshold=8)
+    for i in range(50):
+        index[_digest(i)] = i
+
+    index.discard_from(20)
+
+    assert len(index) == 20
+    assert all(_digest(i) in index for i in range(20))
+    assert not any(_digest(i) in index for i in range(20, 50))
+    index[_digest(30)] = 20
+    assert index[_digest(30)] == 20
+
+
+def test_rejects_wrong_digest_size():
+    index = CompactFingerprintIndex(digest_size=16)
+    with pytest.raises(ValueError):
+        index[b"short"] = 1
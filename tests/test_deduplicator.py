@@ -0,0 +1,134 @@
+# tests/test_deduplicator.py
+import pytest
+
+from core.deduplicator import Deduplicator
+
+OPTIONS = ["Paris", "Rome", "Berlin", "Madrid"]
+QUESTION = "Which of the following cities is the capital city of France in the year 2020?"
+NEAR_QUESTION = "Which of the following cities is the capital city of France in the year 2021?"
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_exact_duplicate_policies(compact):
+    skip = Deduplicator(policy='skip', compact=compact)
+    assert skip.add_question(QUESTION, OPTIONS) == (QUESTION, OPTIONS)
+    assert skip.add_question(QUESTION.upper() + " !", OPTIONS) is None
+
+    allow = Deduplicator(policy='allow', compact=compact)
+    allow.add_question(QUESTION, OPTIONS)
+    assert allow.add_question(QUESTION, OPTIONS) == (QUESTION, OPTIONS)
+
+    append = Deduplicator(policy='append', compact=compact)
+    append.add_question(QUESTION, OPTIONS)
+    assert append.add_question(QUESTION, OPTIONS) == (f"{QUESTION} (1)", OPTIONS)
+    append.add_question(f"{QUESTION} (1)", OPTIONS)
+    assert append.add_question(QUESTION, OPTIONS) == (f"{QUESTION} (2)", OPTIONS)
+
+
+def test_different_options_are_not_duplicates():
+    deduplicator = Deduplicator(policy='skip')
+    deduplicator.add_question(QUESTION, OPTIONS)
+    assert deduplicator.add_question(QUESTION, OPTIONS[::-1]) is not None
+
+
+def test_near_duplicate_is_skipped():
+    deduplicator = Deduplicator(policy='skip', near_threshold=0.7)
+    deduplicator.add_question(QUESTION, OPTIONS)
+    assert deduplicator.add_question(NEAR_QUESTION, OPTIONS) is None
+    assert deduplicator.conflicts[0]['matched_ref'] == 0
+
+
+def test_near_duplicate_keeps_text_under_append():
+    deduplicator = Deduplicator(policy='append', near_threshold=0.7)
+    deduplicator.add_question(QUESTION, OPTIONS)
+
+    assert deduplicator.add_question(NEAR_QUESTION, OPTIONS) == (NEAR_QUESTION, OPTIONS)
+    assert len(deduplicator.conflicts) == 1
+    # Bản sao y hệt câu gần trùng đã giữ mới được thêm hậu tố
+    assert deduplicator.add_question(NEAR_QUESTION, OPTIONS) == (f"{NEAR_QUESTION} (1)", OPTIONS)
+
+
+def test_near_duplicate_is_registered_under_allow():
+    deduplicator = Deduplicator(policy='allow', near_threshold=0.7)
+    deduplicator.add_question(QUESTION, OPTIONS)
+    deduplicator.add_question(NEAR_QUESTION, OPTIONS)
+
+    assert deduplicator._is_known(deduplicator.get_fingerprint(NEAR_QUESTION, OPTIONS))
+    assert len(deduplicator.fingerprint_map) == 2
+
+
+def test_discard_pending_forgets_near_index():
+    deduplicator = Deduplicator(policy='skip', near_threshold=0.7)
+    deduplicator.add_question(QUESTION, OPTIONS)
+    deduplicator.flush()
+    deduplicator.add_question("Một câu hỏi hoàn toàn khác về địa lý Việt Nam?", ["a", "b"])
+    deduplicator.discard_pending()
+
+    assert len(deduplicator.fingerprint_map) == 1
+    assert len(deduplicator.near_index) == 1
+    assert deduplicator.add_question(NEAR_QUESTION, OPTIONS) is None
+
+
+TEXTS = ["a\ud800", "b\ud800", "x\ny", "x y", "Câu hỏi A", "câu hỏi a!", "Câu hỏi A (1)", "Câu hỏi A (2)",
+         "Thủ đô là gì?", "THỦ ĐÔ LÀ GÌ", "x", "", "Đâu   là đúng"]
+OPTION_VALUES = ["Hà Nội", "hà nội.", "", "Huế", "Cả A và B"]
+
+
+def _random_batch(rng, count):
+    from core.question import QuestionBatch
+
+    batch = QuestionBatch()
+    for _ in range(count):
+        options = [rng.choice(OPTION_VALUES) for _ in range(rng.choice([0, 2, 3, 4, 4, 4]))]
+        batch.append(rng.choice(TEXTS), options)
+    return batch
+
+
+def _state(deduplicator):
+    if deduplicator.compact:
+        known = len(deduplicator.fingerprint_map)
+    else:
+        known = [(fp, text, tuple(options)) for fp, (text, options) in deduplicator.fingerprint_map.items()]
+    pending = sorted(deduplicator.store._pending) if deduplicator.store is not None else None
+    return known, dict(deduplicator._next_suffix), pending
+
+
+@pytest.mark.parametrize("policy", ['skip', 'append', 'allow'])
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("use_store", [False, True])
+@pytest.mark.parametrize("chunk_rows", [None, 7])
+def test_dedup_batch_matches_add_batch(tmp_path, monkeypatch, policy, compact, use_store, chunk_rows):
+    import random
+
+    pytest.importorskip("pandas")
+    import core.deduplicator as deduplicator_module
+    from core.fingerprint_store import FingerprintStore
+
+    if chunk_rows:
+        monkeypatch.setattr(deduplicator_module, "DEDUP_CHUNK_ROWS", chunk_rows)
+    for trial in range(5):
+        outcomes = []
+        for method in ('add_batch', 'dedup_batch'):
+            store = None
+            if use_store:
+                store = FingerprintStore(str(tmp_path / f"{method}{trial}.sqlite"))
+                earlier = Deduplicator(policy='allow', store=store, compact=compact)
+                earlier.add_batch(_random_batch(random.Random(trial + 100), 10))
+                earlier.flush()
+            deduplicator = Deduplicator(policy=policy, store=store, compact=compact)
+            rng = random.Random(trial)
+            results = []
+            for step in range(3):
+                kept = getattr(deduplicator, method)(_random_batch(rng, rng.randint(0, 60)))
+                results.append((kept.texts, kept.option_values, list(kept.option_ends)))
+                if step == 1:
+                    deduplicator.flush()
+            outcomes.append((results, _state(deduplicator)))
+        assert outcomes[0] == outcomes[1]
+
+
+def test_dedup_batch_falls_back_with_near_duplicates():
+    deduplicator = Deduplicator(policy='skip', near_threshold=0.7)
+    kept = deduplicator.dedup_batch([{'question_text': QUESTION, 'options': OPTIONS},
+                                     {'question_text': NEAR_QUESTION, 'options': OPTIONS}])
+    assert kept.texts == [QUESTION]
@@ -0,0 +1,80 @@
+# tests/test_document_reader.py
+import pytest
+
+pytest.importorskip("PyPDF2")
+
+from document_reader import iter_pdf_pages, join_pdf_pages, read_pdf_text
+
+
+def _write_pdf(path, page_texts):
+    """PDF tối giản, mỗi trang một dòng chữ (Helvetica)"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pages_in_order(tmp_path, workers):
+    path = str(tmp_path / "bank.pdf")
+    _write_pdf(path, [f"Page {i}" for i in range(5)])
+    progress = []
+
+    pages = list(iter_pdf_pages(path, workers=workers, progress=lambda done, total: progress.append((done, total))))
+
+    assert [page.strip() for page in pages] == [f"Page {i}" for i in range(5)]
+    assert progress[-1] == (5, 5)
+
+
+def test_rewritten_file_is_read_again(tmp_path):
+    path = str(tmp_path / "bank.pdf")
+    _write_pdf(path, ["Old text"])
+    assert [page.strip() for page in iter_pdf_pages(path, workers=1)] == ["Old text"]
+
+    _write_pdf(path, ["New one", "New two", "New three"])
+    assert [page.strip() for page in iter_pdf_pages(path, workers=1)] == ["New one", "New two", "New three"]
+
+    _write_pdf(path, ["Fresh alpha", "Fresh beta", "Fresh gamma"])  # Cùng số trang, nội dung mới
+    assert read_pdf_text(path, workers=1).split("\n") == ["Fresh alpha", "Fresh beta", "Fresh gamma"]
+
+
+def test_join_pdf_pages_drops_page_numbers_and_repeated_headers():
+    pages = [f"Header\n1. Question {i}\nA. yes\n{i + 1}" for i in range(4)]
+    assert join_pdf_pages(pages) == "\n".join(f"1. Question {i}\nA. yes" for i in range(4))
+
+
+def test_docx_text_keeps_paragraph_and_table_order(tmp_path):
+    docx = pytest.importorskip("docx")
+    from document_reader import iter_docx_text, read_docx_text
+
+    document = docx.Document()
+    document.add_paragraph("Câu 1. Trước bảng")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "A. một"
+    table.cell(0, 1).text = "B. hai"
+    table.cell(1, 0).merge(table.cell(1, 1)).text = "C. gộp"
+    document.add_paragraph("Câu 2. Sau bảng")
+    path = str(tmp_path / "bank.docx")
+    document.save(path)
+
+    assert list(iter_docx_text(path)) == ["Câu 1. Trước bảng\n", "A. một\n", "B. hai\n", "C. gộp\n",
+                                          "Câu 2. Sau bảng\n"]
+    assert read_docx_text(path) == "".join(iter_docx_text(path))
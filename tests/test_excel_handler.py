@@ -0,0 +1,197 @@
+# tests/test_excel_handler.py
+import re
+import zipfile
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from core.question import Question
+from excel_handler import DATA_START_ROW, ExcelHandler
+
+
+def _questions(prefix, count):
+    return [Question(f"{prefix} {i} <&>", [f"A{i}", f"B{i}", " C ", ""]) for i in range(count)]
+
+
+def _sheet_xml(path):
+    with zipfile.ZipFile(path) as zf:
+        return zf.read("xl/worksheets/sheet1.xml")
+
+
+def _row_numbers(path):
+    return [int(r) for r in re.findall(rb'<row\b[^>]*?\sr="(\d+)"', _sheet_xml(path))]
+
+
+def _dimension(path):
+    """Vùng của thẻ <dimension>, None nếu sheet không có (vd. workbook write-only)"""
+    match = re.search(rb'<dimension ref="([^"]+)"', _sheet_xml(path))
+    return match.group(1).decode() if match else None
+
+
+def _column_a(path):
+    ws = openpyxl.load_workbook(path)["Questions"]
+    return {row: ws.cell(row=row, column=1).value for row in range(DATA_START_ROW, ws.max_row + 1)
+            if ws.cell(row=row, column=1).value is not None}
+
+
+def _assert_valid_rows(path):
+    rows = _row_numbers(path)
+    assert rows == sorted(set(rows)), "các dòng phải tăng dần và không trùng"
+    dimension = _dimension(path)
+    if dimension is not None:
+        assert int(re.search(r"(\d+)$", dimension).group(1)) >= rows[-1]
+
+
+@pytest.fixture
+def bordered_template(tmp_path):
+    """Template có sẵn các dòng trống đã kẻ viền (dòng 3..20)"""
+    from openpyxl.styles import Border, Side
+
+    path = str(tmp_path / "bank.xlsx")
+    handler = ExcelHandler(path)
+    handler.create_template_if_not_exists()
+    wb = openpyxl.load_workbook(path)
+    ws = wb["Questions"]
+    thin = Side(style="thin")
+    for row in range(DATA_START_ROW, 21):
+        for col in range(1, 11):
+            ws.cell(row=row, column=col).border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    wb.save(path)
+    return path
+
+
+def test_append_after_streaming_write(tmp_path):
+    path = str(tmp_path / "bank.xlsx")
+    handler = ExcelHandler(path)
+    handler.write_questions_streaming(_questions("first", 3))
+    result = handler.append_questions(_questions("second", 2))
+
+    assert result['start_row'] == DATA_START_ROW + 3
+    _assert_valid_rows(path)
+    values = _column_a(path)
+    assert values[DATA_START_ROW] == "first 0 <&>"
+    assert values[DATA_START_ROW + 4] == "second 1 <&>"
+    ws = openpyxl.load_workbook(path)["Questions"]
+    assert [c.value for c in ws[DATA_START_ROW + 3]][:5] == ["second 0 <&>", "Multiple Choice", "A0", "B0", " C "]
+
+
+@pytest.mark.parametrize("method", ["append_questions", "append_questions_streaming"])
+def test_append_after_write_questions_on_bordered_template(bordered_template, method):
+    handler = ExcelHandler(bordered_template)
+    handler.write_questions(_questions("first", 2))
+    result = getattr(handler, method)(iter(_questions("second", 1)))
+
+    _assert_valid_rows(bordered_template)
+    assert result['start_row'] == DATA_START_ROW + 2
+    assert _column_a(bordered_template)[result['start_row']] == "second 0 <&>"
+
+
+@pytest.mark.parametrize("method", ["append_questions", "append_questions_streaming"])
+def test_repeated_appends_fill_bordered_rows_without_gap(bordered_template, method):
+    handler = ExcelHandler(bordered_template)
+    starts = [getattr(handler, method)(iter(_questions(f"batch{i}", 1)))['start_row'] for i in range(3)]
+
+    assert starts == [DATA_START_ROW, DATA_START_ROW + 1, DATA_START_ROW + 2]
+    _assert_valid_rows(bordered_template)
+    assert sorted(_column_a(bordered_template)) == starts
+
+
+def _forbid_openpyxl_fallback(handler, monkeypatch):
+    def fallback(*args, **kwargs):
+        raise AssertionError("không được quay về write_questions")
+    monkeypatch.setattr(handler, "write_questions", fallback)
+
+
+def test_first_append_on_new_template_uses_splice(tmp_path, monkeypatch):
+    path = str(tmp_path / "bank.xlsx")
+    handler = ExcelHandler(path)
+    handler.create_template_if_not_exists()
+    _forbid_openpyxl_fallback(handler, monkeypatch)
+
+    result = handler.append_questions(_questions("q", 1))
+
+    assert result['start_row'] == DATA_START_ROW
+    _assert_valid_rows(path)
+
+
+def test_write_spliced_without_sheet_part_keeps_workbook(tmp_path):
+    path = str(tmp_path / "bank.xlsx")
+    handler = ExcelHandler(path)
+    handler.write_questions_streaming(_questions("q", 1))
+    before = (tmp_path / "bank.xlsx").read_bytes()
+
+    assert not handler._write_spliced(path, "xl/worksheets/missing.xml", b"", 4, 4)
+    assert (tmp_path / "bank.xlsx").read_bytes() == before
+    assert not (tmp_path / "bank.xlsx.tmp").exists()
+
+
+@pytest.mark.parametrize("method", ["append_questions", "append_questions_streaming"])
+def test_stale_last_row_falls_back_to_openpyxl(bordered_template, method):
+    handler = ExcelHandler(bordered_template)
+    handler.write_questions(_questions("first", 2))
+    handler._write_row_cache(bordered_template, DATA_START_ROW + 1)  # Cache sai: bỏ qua các dòng kẻ viền
+
+    result = getattr(handler, method)(iter(_questions("second", 2)))
+
+    _assert_valid_rows(bordered_template)
+    assert result['start_row'] == DATA_START_ROW + 2
+    values = _column_a(bordered_template)
+    assert [values[row] for row in sorted(values)] == ["first 0 <&>", "first 1 <&>", "second 0 <&>", "second 1 <&>"]
+
+
+def test_splice_never_shrinks_dimension(tmp_path, monkeypatch):
+    path = str(tmp_path / "bank.xlsx")
+    handler = ExcelHandler(path)
+    handler.write_questions_streaming(_questions("first", 2))
+    wb = openpyxl.load_workbook(path)
+    wb["Questions"].cell(row=DATA_START_ROW + 1, column=12, value="ghi chú")
+    wb.save(path)
+
+    _forbid_openpyxl_fallback(handler, monkeypatch)
+    result = handler.append_questions(_questions("q", 1))
+
+    assert result['start_row'] == DATA_START_ROW + 2
+    assert _dimension(path) == f"A1:L{DATA_START_ROW + 2}"
+    _assert_valid_rows(path)
+
+
+def test_streaming_write_uses_shared_styles(tmp_path):
+    from excel_handler import HEADER_STYLE, ROW_STYLES
+
+    path = str(tmp_path / "bank.xlsx")
+    result = ExcelHandler(path).write_questions_streaming(iter(_questions("q", 3)))
+
+    assert result == {'total_questions': 3, 'start_row': DATA_START_ROW, 'output_path': path}
+    ws = openpyxl.load_workbook(path)["Questions"]
+    assert ws.cell(row=1, column=1).style == HEADER_STYLE
+    for row in range(DATA_START_ROW, DATA_START_ROW + 3):
+        assert {ws.cell(row=row, column=col).style for col in range(1, 11)} == {ROW_STYLES[row % 2]}
+
+
+def test_streaming_write_leaves_no_file_when_source_fails(tmp_path):
+    path = str(tmp_path / "bank.xlsx")
+
+    def source():
+        yield from _questions("q", 2)
+        raise ValueError("nguồn lỗi")
+
+    with pytest.raises(ValueError):
+        ExcelHandler(path).write_questions_streaming(source())
+    assert not (tmp_path / "bank.xlsx").exists()
+
+
+def test_splice_checks_last_row_across_chunks(tmp_path, monkeypatch):
+    import excel_handler
+
+    monkeypatch.setattr(excel_handler, "_STREAM_CHUNK", 1024)
+    path = str(tmp_path / "bank.xlsx")
+    handler = ExcelHandler(path)
+    handler.write_questions_streaming(_questions("dài " * 100, 30))
+    _forbid_openpyxl_fallback(handler, monkeypatch)
+
+    result = handler.append_questions(_questions("q", 2))
+
+    assert result['start_row'] == DATA_START_ROW + 30
+    _assert_valid_rows(path)
+    assert _column_a(path)[DATA_START_ROW + 31] == "q 1 <&>"
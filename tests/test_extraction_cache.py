@@ -0,0 +1,97 @@
+# tests/test_extraction_cache.py
+import os
+import time
+
+import pytest
+
+from core.extraction_cache import ExtractionCache, decode_questions, encode_questions
+from core.question import Question, QuestionBatch
+
+QUESTIONS = [
+    Question("Thủ đô của Pháp?", ["Paris", "Rome", "", "Berlin"], 1),
+    Question("Không có lựa chọn", [], None),
+    Question("Ký tự lạ \ud800 😀 \n\t", ["\x00", "ß" * 300], 2 ** 40),
+]
+
+
+def _as_tuples(questions):
+    return [(q.question_text, q.options, q.question_number) for q in questions]
+
+
+def test_encode_decode_round_trip():
+    decoded = decode_questions(encode_questions(QUESTIONS))
+    assert isinstance(decoded, QuestionBatch)
+    assert _as_tuples(decoded) == _as_tuples(QUESTIONS)
+    assert list(decode_questions(encode_questions([]))) == []
+
+
+@pytest.mark.parametrize("data", [b"", b"QEC1abc", b"QEC2not zlib", b"QEC2"])
+def test_decode_rejects_foreign_data(data):
+    with pytest.raises(ValueError):
+        decode_questions(data)
+
+
+def test_decode_rejects_truncated_entry():
+    import zlib
+
+    data = encode_questions(QUESTIONS)
+    body = zlib.decompress(data[4:])
+    with pytest.raises(ValueError):
+        decode_questions(data[:4] + zlib.compress(body[:-5]))
+
+
+def test_get_put_and_corrupt_entry(tmp_path):
+    cache = ExtractionCache(str(tmp_path), version="1")
+    key = cache.key_for_text("văn bản")
+    assert cache.get(key) is None
+    assert cache.put(key, QUESTIONS)
+    assert _as_tuples(cache.get(key)) == _as_tuples(QUESTIONS)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    with open(os.path.join(str(tmp_path), key + ".qec"), "wb") as f:
+        f.write(b"QEC2broken")
+    assert cache.get(key) is None
+    assert not os.path.exists(os.path.join(str(tmp_path), key + ".qec"))
+
+
+def test_keys_depend_on_content_and_version(tmp_path):
+    cache = ExtractionCache(str(tmp_path), version="1")
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    first.write_text("Câu 1. x", encoding="utf-8")
+    second.write_text("Câu 1. x", encoding="utf-8")
+
+    assert cache.key_for_file(str(first)) == cache.key_for_file(str(second))
+    assert cache.key_for_text("a") != cache.key_for_text("b")
+    assert cache.key_for_text("a") != ExtractionCache(str(tmp_path), version="2").key_for_text("a")
+
+
+def test_iter_through_stores_only_complete_runs(tmp_path):
+    cache = ExtractionCache(str(tmp_path), version="1")
+    partial = cache.iter_through("partial", iter(QUESTIONS))
+    next(partial)
+    partial.close()
+    assert cache.get("partial") is None
+
+    assert _as_tuples(cache.iter_through("full", iter(QUESTIONS))) == _as_tuples(QUESTIONS)
+    assert _as_tuples(cache.get("full")) == _as_tuples(QUESTIONS)
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = ExtractionCache(str(tmp_path), version="1", max_bytes=10 ** 9)
+    for index, key in enumerate(("old", "used", "new")):
+        cache.put(key, QUESTIONS)
+        stamp = time.time() - 100 + index
+        os.utime(os.path.join(str(tmp_path), key + ".qec"), (stamp, stamp))
+    cache.get("old")  # Vừa dùng: thành mới nhất
+
+    cache.max_bytes = cache.size() - 1
+    assert cache.evict() == 1
+    assert cache.get("used") is None
+    assert cache.get("old") is not None and cache.get("new") is not None
+
+
+def test_from_env_can_disable(monkeypatch, tmp_path):
+    monkeypatch.setenv("QE_EXTRACTION_CACHE", "0")
+    assert ExtractionCache.from_env("1") is None
+    monkeypatch.setenv("QE_EXTRACTION_CACHE", str(tmp_path / "cache"))
+    assert ExtractionCache.from_env("1").directory == str(tmp_path / "cache")
@@ -0,0 +1,99 @@
+# tests/test_fingerprint_store.py
+import os
+
+import pytest
+
+from core.deduplicator import Deduplicator
+from core.fingerprint_store import FingerprintStore
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    return str(tmp_path / "bank.xlsx")
+
+
+def _export(deduplicator, workbook, questions):
+    """Như một lần xuất: bootstrap, khử trùng lặp, ghi workbook rồi flush"""
+    from excel_handler import ExcelHandler
+
+    deduplicator.bootstrap_from_workbook(workbook)
+    kept = deduplicator.add_batch(questions)
+    if kept:
+        ExcelHandler(workbook).append_questions(kept, workbook)
+    deduplicator.flush(workbook)
+    return [question['question_text'] for question in kept]
+
+
+def _new_session(workbook, policy='skip'):
+    return Deduplicator(policy=policy, store=FingerprintStore.for_workbook(workbook))
+
+
+QUESTIONS = [{'question_text': "Thủ đô của Pháp?", 'options': ["Paris", "Rome"]},
+             {'question_text': "2 + 2 = ?", 'options': ["3", "4"]}]
+
+
+def test_store_contains_many_and_flush(tmp_path):
+    store = FingerprintStore(str(tmp_path / "s.sqlite"))
+    store.add_many(["a", "b"])
+    assert store.contains_many(["a", "c"]) == {"a"}
+    store.flush()
+    store.add("c")
+    store.discard_pending()
+    assert "a" in store and "c" not in store
+    assert len(store) == 2
+    store.close()
+
+
+def test_fingerprints_persist_across_sessions(workbook):
+    pytest.importorskip("openpyxl")
+    assert _export(_new_session(workbook), workbook, QUESTIONS) == ["Thủ đô của Pháp?", "2 + 2 = ?"]
+    assert _export(_new_session(workbook), workbook, QUESTIONS) == []
+
+
+def test_failed_export_is_rolled_back(workbook):
+    pytest.importorskip("openpyxl")
+    deduplicator = _new_session(workbook)
+    deduplicator.bootstrap_from_workbook(workbook)
+    deduplicator.add_batch(QUESTIONS)
+    deduplicator.discard_pending()  # Ghi Excel lỗi
+
+    assert len(deduplicator.fingerprint_map) == 0
+    assert len(deduplicator.store) == 0
+    assert _export(_new_session(workbook), workbook, QUESTIONS[:1]) == ["Thủ đô của Pháp?"]
+
+
+def test_deleted_workbook_resets_store(workbook):
+    pytest.importorskip("openpyxl")
+    _export(_new_session(workbook), workbook, QUESTIONS)
+    os.remove(workbook)
+
+    assert _export(_new_session(workbook), workbook, QUESTIONS) == ["Thủ đô của Pháp?", "2 + 2 = ?"]
+    assert os.path.exists(workbook)
+
+
+def test_deleted_workbook_resets_running_session(workbook):
+    pytest.importorskip("openpyxl")
+    deduplicator = _new_session(workbook)
+    _export(deduplicator, workbook, QUESTIONS)
+    os.remove(workbook)
+
+    assert _export(deduplicator, workbook, QUESTIONS) == ["Thủ đô của Pháp?", "2 + 2 = ?"]
+
+
+def test_replaced_workbook_is_bootstrapped_again(workbook, tmp_path):
+    pytest.importorskip("openpyxl")
+    from excel_handler import ExcelHandler
+
+    _export(_new_session(workbook), workbook, QUESTIONS)
+    other = str(tmp_path / "other.xlsx")
+    ExcelHandler(other).write_questions_streaming(QUESTIONS[1:], other)
+    os.replace(other, workbook)
+
+    # Chỉ câu có trong workbook mới là trùng lặp
+    assert _export(_new_session(workbook), workbook, QUESTIONS) == ["Thủ đô của Pháp?"]
+
+
+def test_unchanged_workbook_is_not_reloaded(workbook):
+    pytest.importorskip("openpyxl")
+    _export(_new_session(workbook), workbook, QUESTIONS)
+    assert _new_session(workbook).bootstrap_from_workbook(workbook) == 0
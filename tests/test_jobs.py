@@ -0,0 +1,67 @@
+# tests/test_jobs.py
+import queue
+import threading
+
+import pytest
+
+from core.jobs import CancelToken, JobCancelled, JobRunner, ProgressThrottle
+
+
+def _wait_finished(messages):
+    while True:
+        kind, data = messages.get(timeout=5)
+        if kind == 'job_finished':
+            return data
+
+
+def test_runner_allows_one_job_and_reports_cancel():
+    messages = queue.Queue()
+    runner = JobRunner(lambda kind, data: messages.put((kind, data)))
+    started = threading.Event()
+
+    def job(token):
+        started.set()
+        while True:
+            token.check()
+
+    assert runner.start(job)
+    assert started.wait(5)
+    assert not runner.start(job)
+    assert runner.cancel()
+    assert _wait_finished(messages) == 'cancelled'
+    assert not runner.busy and not runner.cancel()
+
+
+@pytest.mark.parametrize("job, status", [
+    (lambda token: None, 'ok'),
+    # Lỗi khác JobCancelled vẫn được ném tiếp trong thread nền sau khi báo 'error'
+    pytest.param(lambda token: 1 / 0, 'error',
+                 marks=pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")),
+])
+def test_runner_reports_status(job, status):
+    messages = queue.Queue()
+    runner = JobRunner(lambda kind, data: messages.put((kind, data)))
+    runner.start(job)
+    assert _wait_finished(messages) == status
+
+
+def test_cancel_token():
+    token = CancelToken()
+    token.check()
+    token.cancel()
+    assert token.cancelled
+    with pytest.raises(JobCancelled):
+        token.check()
+
+
+def test_progress_throttle_uses_interval():
+    now = [0.0]
+    posted = []
+    throttle = ProgressThrottle(lambda kind, data: posted.append((kind, data)), interval=0.1,
+                                clock=lambda: now[0])
+    assert throttle.due()
+    throttle.report(10, "bắt đầu")
+    assert not throttle.due()
+    now[0] = 0.1
+    assert throttle.due()
+    assert posted == [('progress', 10), ('status', "bắt đầu")]
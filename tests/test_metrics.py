@@ -0,0 +1,36 @@
+# tests/test_metrics.py
+import json
+
+from core.metrics import Metrics
+
+
+def test_disabled_metrics_record_nothing(tmp_path):
+    metrics = Metrics()
+    with metrics.stage('extract'):
+        metrics.count('questions_extracted', 5)
+    assert metrics.stages == {} and metrics.counters == {}
+    assert metrics.write_report(str(tmp_path)) is None
+
+
+def test_report_collects_stages_and_counters(tmp_path):
+    metrics = Metrics(enabled=True)
+    for _ in range(2):
+        with metrics.stage('extract'):
+            pass
+    metrics.add_time('dedup', 0.25)
+    metrics.count('questions_extracted', 4)
+    metrics.count('questions_extracted')
+
+    path = metrics.write_report(str(tmp_path))
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    assert report['stages']['extract']['calls'] == 2
+    assert report['stages']['dedup'] == {'ms': 250.0, 'calls': 1}
+    assert report['counters'] == {'questions_extracted': 5}
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("QE_METRICS", "1")
+    assert Metrics.from_env().enabled
+    monkeypatch.setenv("QE_METRICS", "0")
+    assert not Metrics.from_env().enabled
@@ -0,0 +1,78 @@
+# tests/test_normalizer.py
+import random
+import re
+
+import pytest
+
+from core.normalizer import TextNormalizer
+
+
+def _baseline_normalize_dots(text):
+    """Bản gốc (chưa tối ưu) của normalize_dots, dùng làm chuẩn so sánh"""
+    if not text:
+        return ""
+    text = re.sub(r'\.\s*\.\s*\.', '.', text)
+    text = re.sub(r'\.\s*\.', '.', text)
+    text = re.sub(r'\.\.\.', '.', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def _baseline_normalize_text(text):
+    if not text:
+        return ""
+    text = re.sub(r'[^\w\s]', '', text.lower())
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+@pytest.mark.parametrize("count", [11, 13, 14, 15, 16, 18])
+def test_long_dot_runs_collapse_to_single_dot(count):
+    text = "Câu 1. She " + "." * count + " to school"
+    assert TextNormalizer.clean_question_text(text) == "She . to school"
+
+
+@pytest.mark.parametrize("count", range(1, 40))
+def test_dot_runs_match_baseline(count):
+    for text in ("She " + "." * count + " to school", ". " * count, "a" + "." * count):
+        assert TextNormalizer.normalize_dots(text) == _baseline_normalize_dots(text)
+
+
+def test_normalize_dots_matches_baseline_on_random_text():
+    rng = random.Random(1)
+    alphabet = list(". . \t\nab1Câu\x1c　")
+    for _ in range(20000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert TextNormalizer.normalize_dots(text) == _baseline_normalize_dots(text)
+
+
+def test_clean_question_text_strips_prefix():
+    assert TextNormalizer.clean_question_text("câu 12:  Đi......\t học  ") == "Đi. học"
+
+
+def test_normalize_text_matches_baseline():
+    rng = random.Random(2)
+    alphabet = list("aAΣİĐờ .,!?-_()\t\n\x85\xa0　…“”'́ß1😀")
+    for _ in range(20000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+        assert TextNormalizer.normalize_text(text) == _baseline_normalize_text(text)
+
+
+def test_normalize_column_matches_normalize_text():
+    pytest.importorskip("numpy")
+    rng = random.Random(3)
+    alphabet = list("aAbΣσİiĐđ ờỜ.,!?-_()\t\n\r\x0b\x0c\x1c\x1d\x1e\x1f\x85 　\xa0 123…“”'́ß\ud800😀")
+    values = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))) for _ in range(5000)]
+    values += [None, "", "\n", "a\nb"]
+
+    column = TextNormalizer.normalize_column(values)
+    assert list(column) == [TextNormalizer.normalize_text(value) for value in values]
+    assert list(TextNormalizer.normalize_column([])) == []
+
+
+def test_factorize_strings_keeps_surrogates_apart():
+    pytest.importorskip("numpy")
+    from core.normalizer import factorize_strings
+
+    codes, uniques = factorize_strings(["a\ud800", "a\ud801", "a\ud800", "b"])
+    assert codes.tolist() == [0, 1, 0, 2]
+    assert uniques == ["a\ud800", "a\ud801", "b"]
@@ -0,0 +1,53 @@
+# tests/test_pipeline.py
+import pytest
+
+from core.deduplicator import Deduplicator
+from core.jobs import CancelToken, JobCancelled
+from core.pipeline import ExportPipeline
+from core.question import Question
+
+
+def _source(count, repeat_every=3):
+    for i in range(count):
+        number = i - 1 if i % repeat_every == 2 else i  # Mỗi câu thứ ba lặp lại câu trước
+        yield Question(f"Câu hỏi {number}", [f"A{number}", f"B{number}"], i + 1)
+
+
+def test_pipeline_keeps_order_and_counts():
+    pipeline = ExportPipeline(Deduplicator(policy='skip'), maxsize=2, batch_size=4)
+    batches = []
+
+    written = pipeline.run(_source(30), lambda questions: [q.question_text for q in questions],
+                           on_batch=batches.append)
+
+    expected = [f"Câu hỏi {i}" for i in range(30) if i % 3 != 2]
+    assert written == expected
+    assert pipeline.stats == {'extracted': 30, 'written': 20, 'skipped': 10}
+    assert sum(len(batch) for batch in batches) == 20
+
+
+def test_error_in_source_stops_pipeline():
+    def source():
+        yield from _source(10)
+        raise ValueError("hỏng file")
+
+    with pytest.raises(ValueError, match="hỏng file"):
+        ExportPipeline(Deduplicator(), batch_size=4).run(source(), list)
+
+
+def test_cancel_stops_pipeline():
+    token = CancelToken()
+
+    def write(questions):
+        for i, _ in enumerate(questions):
+            if i == 5:
+                token.cancel()
+        return i
+
+    with pytest.raises(JobCancelled):
+        ExportPipeline(Deduplicator(), batch_size=2, token=token).run(_source(10_000), write)
+
+
+def test_write_returning_early_is_an_error():
+    with pytest.raises(RuntimeError):
+        ExportPipeline(Deduplicator(), maxsize=1, batch_size=2).run(_source(1000), lambda questions: next(questions))
@@ -0,0 +1,67 @@
+# tests/test_question.py
+import pickle
+
+import pytest
+
+from core.question import Question, QuestionBatch, iter_rows
+
+ROWS = [("Câu một", ("A", "B")), ("Câu hai", ()), ("Câu ba", ("x", "y", "z", "w"))]
+
+
+def _batch():
+    batch = QuestionBatch()
+    for number, (text, options) in enumerate(ROWS):
+        batch.append(text, options, number if number != 1 else None)
+    return batch
+
+
+def test_question_reads_like_the_old_dict():
+    question = Question("Nội dung", ["A", "B"], 3)
+    assert question['question_text'] == "Nội dung"
+    assert question.get('options') == ("A", "B")
+    assert question.get('missing', 1) == 1
+    assert dict(question) == {'question_text': "Nội dung", 'options': ("A", "B"), 'question_number': 3}
+    assert question.to_dict()['options'] == ["A", "B"]
+    assert Question.from_dict(question.to_dict()) == question
+    assert pickle.loads(pickle.dumps(question)) == question
+    with pytest.raises(KeyError):
+        question['other']
+
+
+def test_batch_columns_and_access():
+    batch = _batch()
+    assert len(batch) == 3
+    assert list(batch.option_ends) == [2, 2, 6]
+    assert batch[1] == Question("Câu hai", (), None)
+    assert batch[-1].options == ("x", "y", "z", "w")
+    assert [q.question_text for q in batch[0:3:2]] == ["Câu một", "Câu ba"]
+    assert [(text, tuple(options)) for text, options in batch.rows()] == ROWS
+    with pytest.raises(IndexError):
+        batch[3]
+
+
+def test_batch_extend_offsets_options():
+    batch = _batch()
+    batch.extend(_batch())
+    assert len(batch) == 6
+    assert [q.options for q in batch][3:] == [q.options for q in _batch()]
+    assert QuestionBatch.from_questions(batch) is batch
+    assert list(QuestionBatch.from_questions([q.to_dict() for q in _batch()])) == list(_batch())
+
+
+def test_clear():
+    batch = _batch()
+    batch.clear()
+    assert len(batch) == 0 and list(batch) == []
+
+
+def test_iter_rows_accepts_every_shape():
+    expected = [(text, list(options)) for text, options in ROWS]
+    for questions in (_batch(), list(_batch()), [q.to_dict() for q in _batch()]):
+        assert [(text, list(options)) for text, options in iter_rows(questions)] == expected
+
+
+def test_from_columns():
+    batch = QuestionBatch.from_columns(["a", "b"], ["1", "2", "3"], [1, 3])
+    assert list(batch) == [Question("a", ["1"]), Question("b", ["2", "3"])]
+    assert QuestionBatch.from_columns(["c"], [], [0], [7])[0] == Question("c", [], 7)
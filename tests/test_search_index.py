@@ -0,0 +1,38 @@
+# tests/test_search_index.py
+from core.question import Question
+from core.search_index import QuestionSearchIndex
+
+QUESTIONS = [Question(text, []) for text in (
+    "Thủ đô của Việt Nam là gì?", "Sông dài nhất Việt Nam?", "Thủ đô của Pháp?", "Núi cao nhất",
+)]
+
+
+def _brute_force(query):
+    from core.normalizer import TextNormalizer
+
+    words = TextNormalizer.normalize_text(query).split()
+    return [row for row, q in enumerate(QUESTIONS)
+            if all(word in TextNormalizer.normalize_text(q.question_text) for word in words)]
+
+
+def test_empty_query_returns_every_row():
+    index = QuestionSearchIndex(QUESTIONS)
+    assert list(index.search("")) == [0, 1, 2, 3]
+    assert list(index.search("  ?! ")) == [0, 1, 2, 3]
+
+
+def test_search_matches_every_word_ignoring_case_and_punctuation():
+    index = QuestionSearchIndex(QUESTIONS)
+    assert index.search("THỦ ĐÔ") == [0, 2]
+    assert index.search("việt, nam!") == [0, 1]
+    assert index.search("nam thủ") == [0]
+    assert index.search("không có") == []
+
+
+def test_incremental_typing_matches_fresh_search():
+    index = QuestionSearchIndex(QUESTIONS)
+    query = ""
+    for char in "thủ đô của pháp":
+        query += char
+        assert list(index.search(query)) == _brute_force(query)
+    assert list(index.search("núi")) == _brute_force("núi")
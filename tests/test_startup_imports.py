@@ -0,0 +1,35 @@
+# tests/test_startup_imports.py
+from benchmarks.startup_imports import (
+    DEFAULT_MAX_MS, HEAVY_MODULES, MAX_MS_ENV, app_modules, import_statement, max_ms, measure, measure_median
+)
+
+
+def test_app_modules_follow_gui_imports():
+    modules = app_modules()
+    for name in ('core.pipeline', 'core.extraction_cache', 'core.search_index', 'core.jobs',
+                 'core.metrics', 'core.question', 'text_processor', 'excel_handler'):
+        assert name in modules
+    # question_table cần tkinter: thay bằng các module mà nó import
+    assert 'question_table' not in modules
+
+
+def test_app_modules_do_not_import_heavy_libraries():
+    _, imported = measure('import ' + ', '.join(app_modules()))
+    assert not sorted(m for m in imported if m.split('.')[0] in HEAVY_MODULES)
+
+
+def test_startup_import_time_within_budget():
+    """Trung vị python -X importtime của main + gui; nới ngưỡng trên máy chậm bằng QE_STARTUP_MAX_MS"""
+    statement = import_statement()
+    median, imported = measure_median(statement, runs=5)
+
+    assert median < max_ms(), (
+        f"{statement}: {median:.1f} ms > {max_ms():.0f} ms (đặt {MAX_MS_ENV} để đổi ngưỡng)")
+    assert 'main' in imported
+
+
+def test_max_ms_reads_env(monkeypatch):
+    monkeypatch.setenv(MAX_MS_ENV, "750")
+    assert max_ms() == 750.0
+    monkeypatch.delenv(MAX_MS_ENV)
+    assert max_ms() == DEFAULT_MAX_MS
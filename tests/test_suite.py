@@ -0,0 +1,34 @@
+# tests/test_suite.py
+from benchmarks import suite
+
+
+def test_default_worker_counts_reach_cpu_count(monkeypatch):
+    monkeypatch.setattr(suite.os, "cpu_count", lambda: 6)
+    assert suite.default_worker_counts() == [1, 2, 4, 6]
+    monkeypatch.setattr(suite.os, "cpu_count", lambda: 1)
+    assert suite.default_worker_counts() == [1]
+
+
+def test_worker_sweep_only_for_parallel_stage():
+    runs = list(suite._stage_runs(['extract', 'extract_parallel', 'dedup'], [1, 2, 4]))
+    assert runs == [('extract', None), ('extract_parallel', 1), ('extract_parallel', 2),
+                    ('extract_parallel', 4), ('dedup', None)]
+
+
+def test_compare_matches_records_by_worker_count():
+    def record(workers, throughput):
+        return {'stage': 'extract_parallel', 'size': 1000, 'workers': workers,
+                'throughput': throughput, 'peak_rss_mb': None}
+
+    baseline = {'results': [record(1, 100.0), record(4, 300.0)]}
+    current = {'results': [record(1, 100.0), record(4, 150.0)]}
+
+    lines = suite.compare(baseline, current)
+    assert [regressed for _, regressed in lines] == [False, True]
+    assert "extract_parallel[4]" in lines[1][0]
+
+
+def test_run_stage_extract_parallel_matches_extract():
+    items, _, _ = suite.run_stage('extract_parallel', 200, seed=1, policy='skip', workers=2)
+    expected, _, _ = suite.run_stage('extract', 200, seed=1, policy='skip')
+    assert items == expected
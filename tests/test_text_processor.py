@@ -0,0 +1,97 @@
+# tests/test_text_processor.py
+import pytest
+
+from text_processor import TextProcessor
+
+# Kết quả mong đợi lấy từ bản trích xuất gốc (trước khi tối ưu), kể cả các điểm kỳ quặc của nó
+GOLDEN_CASES = [
+    ("Câu 1. Thủ đô của Pháp là A. Paris B. Rome C. Berlin D. Madrid\n"
+     "Câu 2: 2 + 2 = ?\na) 3\nb) 4\nc) 5\nd) 6\n",
+     [(1, 'Thủ đô của Pháp là', ['Paris', 'Rome', 'Berlin', 'Madrid']),
+      (2, '+ 2 = ?', ['3', '4', '5', '6'])]),
+    ("1. Chọn đáp án đúng: vitamin A. có trong cà rốt B. có trong muối\nC. không có D) cả ba\n"
+     "2) Câu tiếp theo\nA: một\nB: hai\n",
+     [(1, 'Chọn đáp án đúng: vitamin', ['có trong cà rốt', 'có trong muối', 'không có', 'cả ba']),
+      (2, 'Câu tiếp theo', ['một', 'hai', '', ''])]),
+    ("Câu 3. Câu hỏi có ba chấm ........ ở giữa?\nA. x\nB. y\nCâu 4. Không có đáp án\n"
+     "Câu 5. Câu cuối\nA. p\nB. q\nC. r\nD. s",
+     [(3, 'Câu hỏi có ba chấm .. ở giữa?', ['x', 'y', '', '']),
+      (5, 'Câu cuối', ['p', 'q', 'r', 's'])]),
+    ("15.17__________ anything like this before?\n3\nA. Have you seen\nB. Did you see\nC. Did you seen\n"
+     "17. 9I __________ him behave like this before.\nA. see\nB. never saw\nC. ‘ve never seen\n",
+     [(15, '__________ anything like this before? 3', ['Have you seen', 'Did you see', 'Did you seen', '']),
+      (17, 'I __________ him behave like this before.', ['see', 'never saw', '‘ve never seen', ''])]),
+]
+
+
+def _rows(questions):
+    return [(q['question_number'], q['question_text'], list(q['options'])) for q in questions]
+
+
+@pytest.mark.parametrize("text, expected", GOLDEN_CASES)
+def test_extract_matches_original_output(text, expected):
+    assert _rows(TextProcessor().extract_questions_from_text(text)) == expected
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    from benchmarks.corpus import generate_corpus
+
+    return generate_corpus(300, seed=5)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 13])
+@pytest.mark.parametrize("text, expected", GOLDEN_CASES)
+def test_iter_questions_carries_blocks_across_small_chunks(text, expected, chunk_size):
+    chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    assert _rows(TextProcessor().iter_questions(chunks)) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 61, 4096])
+def test_iter_questions_matches_whole_text(corpus, chunk_size):
+    import io
+
+    expected = _rows(TextProcessor().extract_questions_from_text(corpus))
+    assert _rows(TextProcessor().iter_questions(io.StringIO(corpus), chunk_size=chunk_size)) == expected
+
+
+def test_iter_questions_reads_files(corpus, tmp_path):
+    path = tmp_path / "bank.txt"
+    path.write_text(corpus, encoding="utf-8")
+    expected = _rows(TextProcessor().extract_questions_from_text(corpus))
+    assert _rows(TextProcessor().iter_questions(str(path), chunk_size=100)) == expected
+
+
+def test_extract_parallel_matches_sequential(corpus):
+    processor = TextProcessor()
+    expected = _rows(processor.extract_questions_from_text(corpus))
+    assert _rows(processor.extract_parallel(corpus, workers=2, chunks_per_worker=3, min_chunk_chars=1000)) == expected
+
+
+def test_block_cache_reuses_unchanged_blocks(corpus):
+    from text_processor import BlockCache
+
+    cache = BlockCache()
+    processor = TextProcessor(block_cache=cache)
+    first = _rows(processor.extract_questions_from_text(corpus))
+    blocks = cache.misses
+
+    edited = corpus.replace("Cách mạng tháng Tám", "Cách mạng tháng Mười", 1)
+    assert _rows(processor.iter_questions((edited,))) == _rows(TextProcessor().extract_questions_from_text(edited))
+    assert cache.misses - blocks == 1
+    assert cache.hits == blocks - 1
+    assert first == _rows(TextProcessor().extract_questions_from_text(corpus))
+
+
+def test_block_cache_keeps_previous_run_when_interrupted(corpus):
+    from text_processor import BlockCache
+
+    cache = BlockCache()
+    processor = TextProcessor(block_cache=cache)
+    processor.extract_questions_from_text(corpus)
+    size = len(cache)
+
+    partial = processor.iter_questions((corpus[:len(corpus) // 2], corpus[len(corpus) // 2:]))
+    next(partial)
+    partial.close()
+    assert len(cache) == size
@@ -1,28 +1,110 @@
 # text_processor.py
+import os
 import re
 from core.normalizer import TextNormalizer
+from core.question import Question, QuestionBatch
+
+# Biên bắt đầu câu hỏi: "Câu N" hoặc "N." ở đầu dòng
+QUESTION_START_PATTERN = re.compile(
+    r'(?:^|[\n\r])\s*\d+[.:)]|Câu\s*\d+(?:[.:,)|-]|\s)', re.IGNORECASE
+)
+
+_NUMBER_PATTERN = re.compile(r'(?:Câu\s*)?(\d+)', re.IGNORECASE)
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+# Ký hiệu đáp án "a." / "B)" / "c:" đứng sau khoảng trắng (dùng để chọn mốc A)
+_ANCHOR_MARKER_PATTERN = re.compile(r'(?<=\s)([a-dA-D])[.:)]')
+# Ký hiệu đáp án dùng để tách nội dung từng lựa chọn
+_OPTION_MARKER_PATTERN = re.compile(r'(?:^|\s)([a-dA-D][.:)])')
+_QUESTION_PREFIX_PATTERN = re.compile(r'^[\.\s]*(?:Câu\s*)?\d+[.:,)|\]\s-]*', re.IGNORECASE)
+_LEADING_NUMBER_PATTERN = re.compile(r'^\d+\s*')
+
+# Tăng mỗi khi kết quả trích xuất thay đổi để các mục cũ trong ExtractionCache không còn được dùng
+EXTRACTOR_VERSION = 1
+
+DEFAULT_MAX_CACHED_BLOCKS = 200_000
+_MISSING = object()
+
+# Mỗi worker chỉ tạo một TextProcessor duy nhất
+_worker_processor = None
+
+def _extract_chunk(chunk_text, bounds):
+    """Worker: xử lý các khối [start, end) nằm trong một đoạn văn bản"""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = TextProcessor()
+    
+    questions = []
+    for start_pos, end_pos in bounds:
+        question_data = _worker_processor._build_question(chunk_text[start_pos:end_pos])
+        if question_data:
+            questions.append(question_data)
+    return questions
+
+def _finish_nothing():
+    pass
+
+class BlockCache:
+    """
+    Kết quả dựng câu hỏi của lần trích xuất gần nhất, theo nội dung từng khối
+    (khối được tách bằng QUESTION_START_PATTERN). Sửa vài câu rồi trích xuất lại
+    thì chỉ các khối đã đổi phải qua _process_question_block_smart.
+    """
+    
+    def __init__(self, max_blocks=DEFAULT_MAX_CACHED_BLOCKS):
+        self.max_blocks = max_blocks
+        self._results = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self):
+        return len(self._results)
+    
+    def wrap(self, build):
+        """
+        Trả về (build_cached, finish) cho một lần trích xuất. build_cached(raw_block)
+        dùng lại kết quả cũ nếu khối không đổi; finish() thay cache bằng các khối của
+        lần này và chỉ được gọi khi đã trích xuất hết (bị dừng giữa chừng thì giữ cache cũ).
+        """
+        previous = self._results
+        current = {}
+        max_blocks = self.max_blocks
+        
+        def build_cached(raw_block):
+            question_data = previous.get(raw_block, _MISSING)
+            if question_data is _MISSING:
+                self.misses += 1
+                question_data = build(raw_block)
+            else:
+                self.hits += 1
+            if len(current) < max_blocks:
+                current[raw_block] = question_data
+            return question_data
+        
+        def finish():
+            self._results = current
+        
+        return build_cached, finish
+    
+    def clear(self):
+        self._results = {}
+
 
 class TextProcessor:
-    def __init__(self):
+    def __init__(self, block_cache=None):
         self.normalizer = TextNormalizer()
+        self.block_cache = block_cache  # BlockCache (tùy chọn) để trích xuất lại nhanh sau khi sửa văn bản
+    
+    def _block_builder(self):
+        """(hàm dựng câu hỏi từ một khối, hàm gọi khi trích xuất xong)"""
+        if self.block_cache is None:
+            return self._build_question, _finish_nothing
+        return self.block_cache.wrap(self._build_question)
     
     def extract_questions_from_text(self, text):
         questions = []
+        build_question, finish = self._block_builder()
         
-        pattern = r'(?:^|[\n\r])\s*\d+[.:)]|Câu\s*\d+(?:[.:,)|-]|\s)'
-        
-        question_matches = list(re.finditer(pattern, text, re.IGNORECASE))
-        
-        if not question_matches:
-            return questions
-            
-        start_indices = []
-        for match in question_matches:
-            start = match.start()
-            if text[start] in ['\n', '\r']:
-                start_indices.append(start + 1)
-            else:
-                start_indices.append(start)
+        start_indices = self._find_block_starts(text)
         
         for i, start_pos in enumerate(start_indices):
             if i < len(start_indices) - 1:
@@ -30,95 +112,225 @@ class TextProcessor:
             else:
                 end_pos = len(text)
             
-            question_block = text[start_pos:end_pos].strip()
-            if len(question_block) < 5: continue
-                
-            question_data = self._process_question_block_smart(question_block)
+            question_data = build_question(text[start_pos:end_pos])
+            if question_data:
+                questions.append(question_data)
+        
+        finish()
+        return questions
+
+    def extract_batch(self, text):
+        """Như extract_questions_from_text nhưng trả về QuestionBatch (lưu theo cột, ít tốn bộ nhớ)"""
+        return QuestionBatch.from_questions(self.iter_questions((text,)))
+
+    def iter_questions(self, source, chunk_size=1 << 16, encoding='utf-8'):
+        """
+        Trích xuất câu hỏi dạng generator từ file hoặc luồng văn bản.
+        source: đường dẫn file, đối tượng có .read(), hoặc iterator các chuỗi.
+        Khối cuối chưa hoàn chỉnh được giữ lại và nối với chunk tiếp theo,
+        nên bộ nhớ chỉ phụ thuộc vào khối câu hỏi lớn nhất.
+        Kết quả giống hệt extract_questions_from_text trên toàn bộ văn bản.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'r', encoding=encoding) as f:
+                yield from self.iter_questions(f, chunk_size=chunk_size)
+            return
+        
+        if hasattr(source, 'read'):
+            chunks = iter(lambda: source.read(chunk_size), '')
+        else:
+            chunks = source
+        
+        build_question, finish = self._block_builder()
+        buffer = ""
+        start_indices = []
+        scan_pos = 0
+        
+        for chunk in chunks:
+            if not chunk:
+                continue
+            buffer += chunk
+            
+            last_end = scan_pos
+            for match in QUESTION_START_PATTERN.finditer(buffer, scan_pos):
+                start_indices.append(self._block_start(buffer, match))
+                last_end = match.end()
+            
+            # Một mẫu "Câu N"/"N." có thể đang bị cắt ở cuối chunk:
+            # lần quét sau bắt đầu lại từ đoạn đuôi chỉ gồm khoảng trắng/chữ số
+            tail = len(buffer)
+            while tail > last_end and (buffer[tail - 1].isspace() or buffer[tail - 1].isdecimal()):
+                tail -= 1
+            scan_pos = max(last_end, tail - len('Câu'))
             
+            if len(start_indices) < 2:
+                continue
+            
+            for start_pos, end_pos in zip(start_indices, start_indices[1:]):
+                question_data = build_question(buffer[start_pos:end_pos])
+                if question_data:
+                    yield question_data
+            
+            carry_from = start_indices[-1]
+            buffer = buffer[carry_from:]
+            scan_pos -= carry_from
+            start_indices = [0]
+        
+        for i, start_pos in enumerate(start_indices):
+            end_pos = start_indices[i + 1] if i < len(start_indices) - 1 else len(buffer)
+            question_data = build_question(buffer[start_pos:end_pos])
             if question_data:
-                valid_opts = [opt for opt in question_data['options'] if opt]
-                if len(valid_opts) >= 2:
-                    questions.append(question_data)
+                yield question_data
+        finish()
+
+    def extract_parallel(self, text, workers=1, chunks_per_worker=4, min_chunk_chars=1 << 16):
+        """
+        Trích xuất song song bằng process pool.
+        Văn bản chỉ được cắt tại biên câu hỏi (cùng mẫu với extract_questions_from_text),
+        các đoạn được xử lý đồng thời và ghép lại theo đúng thứ tự ban đầu.
+        Văn bản nhỏ hoặc workers <= 1 (mặc định) sẽ chạy tuần tự: chọn workers và
+        chunks_per_worker theo kết quả của
+        python -m benchmarks.suite run --stages extract_parallel --workers 1 2 4 8
+        """
+        workers = workers or 1
+        if workers <= 1:
+            return self.extract_questions_from_text(text)
+        
+        start_indices = self._find_block_starts(text)
+        if not start_indices:
+            return []
+        
+        n_chunks = min(workers * chunks_per_worker, len(start_indices),
+                       max(1, len(text) // min_chunk_chars))
+        if n_chunks <= 1:
+            return self.extract_questions_from_text(text)
+        
+        end_indices = start_indices[1:] + [len(text)]
+        per_chunk = -(-len(start_indices) // n_chunks)
         
+        chunk_texts = []
+        chunk_bounds = []
+        for i in range(0, len(start_indices), per_chunk):
+            chunk_start = start_indices[i]
+            chunk_end = end_indices[min(i + per_chunk, len(start_indices)) - 1]
+            chunk_texts.append(text[chunk_start:chunk_end])
+            chunk_bounds.append([
+                (start_pos - chunk_start, end_pos - chunk_start)
+                for start_pos, end_pos in zip(start_indices[i:i + per_chunk],
+                                              end_indices[i:i + per_chunk])
+            ])
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        questions = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunk_texts))) as executor:
+            for chunk_questions in executor.map(_extract_chunk, chunk_texts, chunk_bounds):
+                questions.extend(chunk_questions)
         return questions
 
+    def _find_block_starts(self, text):
+        """Vị trí bắt đầu của từng khối câu hỏi trong văn bản"""
+        return [self._block_start(text, match) for match in QUESTION_START_PATTERN.finditer(text)]
+
+    @staticmethod
+    def _block_start(text, match):
+        start = match.start()
+        if text[start] in ['\n', '\r']:
+            return start + 1
+        return start
+
+    def _build_question(self, raw_block):
+        """Xử lý một khối thô; trả về None nếu khối quá ngắn hoặc thiếu đáp án"""
+        question_block = raw_block.strip()
+        if len(question_block) < 5:
+            return None
+        
+        question_data = self._process_question_block_smart(question_block)
+        
+        if question_data:
+            valid_opts = [opt for opt in question_data.options if opt]
+            if len(valid_opts) >= 2:
+                return question_data
+        return None
+
+    def _find_options_anchor(self, clean_block):
+        """
+        Chọn vị trí mốc "A" tốt nhất trong một lượt quét.
+        Điểm của mỗi ứng viên là số ký hiệu B/C/D xuất hiện phía sau nó;
+        khi bằng điểm thì lấy ứng viên nằm sau cùng.
+        """
+        candidates = []
+        last_seen = {'b': -1, 'c': -1, 'd': -1}
+        
+        for m in _ANCHOR_MARKER_PATTERN.finditer(clean_block):
+            char = m.group(1).lower()
+            if char == 'a':
+                candidates.append(m.start())
+            else:
+                last_seen[char] = m.start()
+        
+        if not candidates:
+            return None
+        
+        # Điểm giảm dần theo vị trí nên điểm cao nhất là điểm của ứng viên đầu tiên
+        def score(pos):
+            return sum(1 for last in last_seen.values() if last > pos)
+        
+        max_score = score(candidates[0])
+        best = candidates[0]
+        for pos in candidates[1:]:
+            if score(pos) < max_score:
+                break
+            best = pos
+        return best
+
     def _process_question_block_smart(self, block):
         try:
 
-            num_match = re.search(r'(?:Câu\s*)?(\d+)', block[:15], re.IGNORECASE)
+            num_match = _NUMBER_PATTERN.search(block[:15])
             question_number = int(num_match.group(1)) if num_match else None
             
-            clean_block = re.sub(r'\n', ' ', block)
-            clean_block = re.sub(r'\s+', ' ', clean_block)
+            clean_block = _WHITESPACE_PATTERN.sub(' ', block)
             
-            candidates = list(re.finditer(r'(?<=[\s])[aA][.:)]', clean_block))
-            best_candidate = None
-            max_score = -1
-            
-            for cand in candidates:
-                start_index = cand.start()
-                search_area = clean_block[start_index:]
-                score = 0
-                if re.search(r'(?<=[\s])[bB][.:)]', search_area): score += 1
-                if re.search(r'(?<=[\s])[cC][.:)]', search_area): score += 1
-                if re.search(r'(?<=[\s])[dD][.:)]', search_area): score += 1
-                
-                if score >= max_score:
-                    max_score = score
-                    best_candidate = cand
+            split_idx = self._find_options_anchor(clean_block)
 
-            if best_candidate:
-                split_idx = best_candidate.start()
+            if split_idx is not None:
                 raw_question = clean_block[:split_idx]
                 raw_options = clean_block[split_idx:]
             else:
                 raw_question = clean_block
                 raw_options = ""
 
-            temp_q = re.sub(r'^[\.\s]*(?:Câu\s*)?\d+[.:,)|\]\s-]*', '', raw_question, flags=re.IGNORECASE).strip()
+            temp_q = _QUESTION_PREFIX_PATTERN.sub('', raw_question).strip()
             
             if raw_question.strip().startswith('"') or raw_question.strip().startswith('“'):
                  pass 
             else:
 
-                 temp_q = re.sub(r'^\d+\s*', '', temp_q).strip()
+                 temp_q = _LEADING_NUMBER_PATTERN.sub('', temp_q).strip()
             
             question_text = self.normalizer.clean_question_text(temp_q)
 
             options_dict = {}
             targets = ['A', 'B', 'C', 'D']
             
-            found_markers = []
-            for char in targets:
-                pattern = rf'(?:^|\s)([{char.lower()}{char.upper()}][.:)])'
-                for m in re.finditer(pattern, raw_options):
-                    found_markers.append({
-                        'char': char,
-                        'start': m.start(1),
-                        'end': m.end(1)
-                    })
+            found_markers = [
+                (m.group(1)[0].upper(), m.start(1), m.end(1))
+                for m in _OPTION_MARKER_PATTERN.finditer(raw_options)
+            ]
             
-            found_markers.sort(key=lambda x: x['start'])
-            
-            for i, marker in enumerate(found_markers):
-                char = marker['char']
-                start_content = marker['end']
-                
+            for i, (char, _, start_content) in enumerate(found_markers):
                 if i < len(found_markers) - 1:
-                    end_content = found_markers[i+1]['start']
+                    end_content = found_markers[i + 1][1]
                 else:
                     end_content = len(raw_options)
                 
                 content = raw_options[start_content:end_content].strip()
                 options_dict[char] = self.normalizer.clean_option_text(content)
             
-            ordered_options = [options_dict.get(k, "") for k in targets]
+            ordered_options = tuple(options_dict.get(k, "") for k in targets)
 
-            return {
-                'question_text': question_text,
-                'options': ordered_options,
-                'question_number': question_number
-            }
+            return Question(question_text, ordered_options, question_number)
         except Exception as e:
             return None
 